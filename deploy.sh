@@ -2,5 +2,6 @@
 
 echo "Building distribution"
 python setup.py sdist bdist_wheel
+(cd post_process && python setup.py sdist bdist_wheel --dist-dir ../dist)
 echo "Pushing new version to PyPi"
 twine upload dist/* -u $PYPI_USERNAME -p $PYPI_PASSWORD
@@ -1,6 +1,13 @@
-from .entry import LeedDaylightOptionTwoEntryPoint
+from ._compiled import recipe_dict, load_recipe
 
 
-__pollination__ = {
-    'entry_point': LeedDaylightOptionTwoEntryPoint
-}
+def __getattr__(name):
+    # the DSL and the task templates are only imported when the recipe is built
+    if name not in ('LeedDaylightOptionTwoEntryPoint', '__pollination__'):
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    from .entry import LeedDaylightOptionTwoEntryPoint
+    globals().update({
+        'LeedDaylightOptionTwoEntryPoint': LeedDaylightOptionTwoEntryPoint,
+        '__pollination__': {'entry_point': LeedDaylightOptionTwoEntryPoint}
+    })
+    return globals()[name]
@@ -0,0 +1,85 @@
+"""Load the compiled queenbee recipe without building it from the DSL.
+
+Building the recipe imports pollination-dsl and all the plugins and translates each
+DAG to queenbee. The compiled recipe is written to a JSON file the first time that it
+is built and loaded from this file afterwards. The file name is a hash of the
+versions of this package and its dependencies and of the source of the DAGs, so a
+change to any of them builds the recipe again.
+"""
+import hashlib
+import json
+import os
+import uuid
+
+try:
+    from importlib.metadata import version, PackageNotFoundError
+except ImportError:  # python < 3.8
+    from importlib_metadata import version, PackageNotFoundError
+
+PACKAGES = (
+    'pollination-leed-daylight-option-two', 'pollination-dsl', 'queenbee',
+    'pollination-honeybee-radiance', 'pollination-honeybee-display',
+    'pollination-path', 'pollination-alias'
+)
+DEFAULT_FOLDER = os.path.join(
+    os.path.expanduser('~'), '.cache', 'leed-daylight-option-two', 'recipe'
+)
+
+
+def recipe_key():
+    """Get the key of the compiled recipe for the installed packages and the DAGs."""
+    sha = hashlib.sha256()
+    for package in PACKAGES:
+        try:
+            package_version = version(package)
+        except PackageNotFoundError:
+            package_version = None
+        sha.update(('%s==%s\n' % (package, package_version)).encode())
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for f in sorted(files):
+            if not f.endswith('.py'):
+                continue
+            fp = os.path.join(root, f)
+            sha.update(os.path.relpath(fp, folder).replace(os.sep, '/').encode())
+            with open(fp, 'rb') as inf:
+                sha.update(inf.read())
+    return sha.hexdigest()
+
+
+def recipe_dict(folder=None):
+    """Get the compiled recipe as a dictionary.
+
+    Args:
+        folder: Optional path to the folder for the compiled recipes. By default
+            ~/.cache/leed-daylight-option-two/recipe is used.
+    """
+    folder = folder or DEFAULT_FOLDER
+    recipe_file = os.path.join(folder, '%s.json' % recipe_key())
+    if os.path.isfile(recipe_file):
+        with open(recipe_file) as inf:
+            return json.load(inf)
+
+    from pollination_dsl.package import load
+    recipe = load(__package__).to_dict()
+    if not os.path.isdir(folder):
+        os.makedirs(folder, exist_ok=True)
+    # write to a temporary file first so a partial file is never loaded
+    temp = '%s.%s.tmp' % (recipe_file, uuid.uuid4().hex)
+    with open(temp, 'w') as outf:
+        json.dump(recipe, outf)
+    os.replace(temp, recipe_file)
+    return recipe
+
+
+def load_recipe(folder=None):
+    """Get the compiled recipe as a queenbee Recipe.
+
+    Args:
+        folder: Optional path to the folder for the compiled recipes.
+    """
+    from queenbee.recipe import Recipe
+    # parse_obj is deprecated in pydantic 2 and model_validate is new in pydantic 2
+    validate = getattr(Recipe, 'model_validate', None) or Recipe.parse_obj
+    return validate(recipe_dict(folder))
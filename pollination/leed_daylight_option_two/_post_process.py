@@ -0,0 +1,145 @@
+from pollination_dsl.dag import Inputs, DAG, task, Outputs
+from dataclasses import dataclass
+from pollination.honeybee_radiance.post_process import LeedIlluminanceCredits
+
+from ._visualization import LeedDaylightOptionTwoVisualization
+
+
+@dataclass
+class LeedDaylightOptionTwoPostProcessEntryPoint(DAG):
+    """LEED Daylight Illuminance post-process entry point.
+
+    Evaluate the LEED credits from the illuminance results of a previous run without
+    running the simulation again. The credits are evaluated with and without
+    glare-control devices and the results of each option are written to the
+    glare-control and no-glare-control folders.
+    """
+
+    # inputs
+    simulation = Inputs.folder(
+        description='The simulation folder of a previous run of the LEED Daylight '
+        'Illuminance recipe. It should contain the HBJSON model and the illuminance '
+        'results for the 9AM and 3PM skies in 9AM/results and 3PM/results.'
+    )
+
+    compact_visualization_format = Inputs.str(
+        description='Text for the format of the compact visualization, which only has '
+        'the combined pass/fail results. Choose from: vsf, json, pkl, vtkjs, html. '
+        'Note that vsf refers to the JSON version of the VisualizationSet File.',
+        default='pkl',
+        spec={'type': 'string', 'enum': ['vsf', 'json', 'pkl', 'vtkjs', 'html']}
+    )
+
+    @task(template=LeedIlluminanceCredits)
+    def evaluate_credits_glare_control(
+        self, folder=simulation, glare_control_devices='glare-control'
+    ):
+        return [
+            {
+                'from': LeedIlluminanceCredits()._outputs.pass_fail_results,
+                'to': 'glare-control/results'
+            },
+            {
+                'from': LeedIlluminanceCredits()._outputs.credit_summary,
+                'to': 'glare-control/credit_summary.json'
+            }
+        ]
+
+    @task(template=LeedIlluminanceCredits)
+    def evaluate_credits_no_glare_control(
+        self, folder=simulation, glare_control_devices='no-glare-control'
+    ):
+        return [
+            {
+                'from': LeedIlluminanceCredits()._outputs.pass_fail_results,
+                'to': 'no-glare-control/results'
+            },
+            {
+                'from': LeedIlluminanceCredits()._outputs.credit_summary,
+                'to': 'no-glare-control/credit_summary.json'
+            }
+        ]
+
+    @task(
+        template=LeedDaylightOptionTwoVisualization,
+        needs=[evaluate_credits_glare_control],
+        sub_paths={
+            'model': 'model.hbjson',
+            'illuminance_9am': '9AM/results',
+            'illuminance_3pm': '3PM/results'
+        }
+    )
+    def create_visualization_glare_control(
+        self, model=simulation, illuminance_9am=simulation,
+        illuminance_3pm=simulation, pass_fail_9am='glare-control/results/9AM',
+        pass_fail_3pm='glare-control/results/3PM',
+        pass_fail_combined='glare-control/results/combined',
+        output_format=compact_visualization_format
+    ):
+        return [
+            {
+                'from': LeedDaylightOptionTwoVisualization()._outputs.visualization,
+                'to': 'glare-control/visualization.vsf'
+            },
+            {
+                'from':
+                    LeedDaylightOptionTwoVisualization()._outputs.compact_visualization,
+                'to': 'glare-control/compact'
+            }
+        ]
+
+    @task(
+        template=LeedDaylightOptionTwoVisualization,
+        needs=[evaluate_credits_no_glare_control],
+        sub_paths={
+            'model': 'model.hbjson',
+            'illuminance_9am': '9AM/results',
+            'illuminance_3pm': '3PM/results'
+        }
+    )
+    def create_visualization_no_glare_control(
+        self, model=simulation, illuminance_9am=simulation,
+        illuminance_3pm=simulation, pass_fail_9am='no-glare-control/results/9AM',
+        pass_fail_3pm='no-glare-control/results/3PM',
+        pass_fail_combined='no-glare-control/results/combined',
+        output_format=compact_visualization_format
+    ):
+        return [
+            {
+                'from': LeedDaylightOptionTwoVisualization()._outputs.visualization,
+                'to': 'no-glare-control/visualization.vsf'
+            },
+            {
+                'from':
+                    LeedDaylightOptionTwoVisualization()._outputs.compact_visualization,
+                'to': 'no-glare-control/compact'
+            }
+        ]
+
+    glare_control = Outputs.folder(
+        description='Results with glare-control devices. The folder has the pass/fail '
+        'results in results/9AM, results/3PM and results/combined, the '
+        'space_summary.csv in results, the credit_summary.json, the visualization.vsf '
+        'and the compact visualization in compact.',
+        source='glare-control'
+    )
+
+    no_glare_control = Outputs.folder(
+        description='Results without glare-control devices. The folder has the same '
+        'files as the glare_control output.',
+        source='no-glare-control'
+    )
+
+    credit_summary_glare_control = Outputs.file(
+        description='JSON file containing the number of LEED credits achieved with '
+        'glare-control devices and a summary of the percentage of the sensor grid '
+        'area that meets the criteria.',
+        source='glare-control/credit_summary.json'
+    )
+
+    credit_summary_no_glare_control = Outputs.file(
+        description='JSON file containing the number of LEED credits achieved without '
+        'glare-control devices and a summary of the percentage of the sensor grid '
+        'area that meets the criteria.',
+        source='no-glare-control/credit_summary.json'
+    )
@@ -7,7 +7,16 @@ from pollination.honeybee_radiance.post_process import LeedDaylightOptionTwoVisM
 
 @dataclass
 class LeedDaylightOptionTwoVisualization(GroupedDAG):
-    """Create visualization."""
+    """Create visualization.
+
+    ModelToVis reads the grid data from the direct sub-folders of a single folder, so
+    the result folders are copied into the visualization folder first. Local runs read
+    the results in place with tools.visualization instead.
+
+    The full visualization has all the data sets in the VisualizationSet format. The
+    compact visualization only has the combined pass/fail results without the model
+    wireframe in the output_format, which is the binary pkl format by default.
+    """
 
     # inputs
     model = Inputs.file(
@@ -40,6 +49,13 @@ class LeedDaylightOptionTwoVisualization(GroupedDAG):
         path='results/combined'
     )
 
+    output_format = Inputs.str(
+        description='Text for the output format of the compact visualization. Choose '
+        'from: vsf, json, pkl, vtkjs, html. Note that vsf refers to the JSON version '
+        'of the VisualizationSet File.', default='pkl',
+        spec={'type': 'string', 'enum': ['vsf', 'json', 'pkl', 'vtkjs', 'html']}
+    )
+
     @task(template=CopyFolder)
     def copy_illuminance_9am(self, src=illuminance_9am):
         return [
@@ -111,8 +127,28 @@ class LeedDaylightOptionTwoVisualization(GroupedDAG):
                 'to': 'visualization.vsf'
             }
         ]
-    
+
+    @task(
+        template=ModelToVis,
+        needs=[copy_pass_fail_combined, create_vis_metadata]
+    )
+    def create_compact_vis(
+        self, model=model, color_by='none', wireframe='exclude-wireframe',
+        grid_data='visualization/pass-fail-combined', output_format=output_format
+    ):
+        return [
+            {
+                'from': ModelToVis()._outputs.output_file,
+                'to': 'compact/visualization.{{self.output_format}}'
+            }
+        ]
+
     visualization = Outputs.file(
         source='visualization.vsf',
         description='Visualization in VisualizationSet format.'
     )
+
+    compact_visualization = Outputs.folder(
+        source='compact',
+        description='A folder with the compact visualization in the output format.'
+    )
@@ -85,6 +85,14 @@ class LeedDaylightOptionTwoEntryPoint(DAG):
         alias=rad_par_leed_illuminance_input
     )
 
+    compact_visualization_format = Inputs.str(
+        description='Text for the format of the compact visualization, which only has '
+        'the combined pass/fail results. Choose from: vsf, json, pkl, vtkjs, html. '
+        'Note that vsf refers to the JSON version of the VisualizationSet File.',
+        default='pkl',
+        spec={'type': 'string', 'enum': ['vsf', 'json', 'pkl', 'vtkjs', 'html']}
+    )
+
     @task(template=LeedDaylightOptionTwoPrepareFolder)
     def prepare_folder(
         self, model=model, wea=wea, grid_filter=grid_filter, north=north
@@ -158,12 +166,18 @@ class LeedDaylightOptionTwoEntryPoint(DAG):
     def create_visualization(
         self, model=model, illuminance_9am='simulation/9AM/results',
         illuminance_3pm='simulation/3PM/results', pass_fail_9am='results/9AM',
-        pass_fail_3pm='results/3PM', pass_fail_combined='results/combined'
+        pass_fail_3pm='results/3PM', pass_fail_combined='results/combined',
+        output_format=compact_visualization_format
     ):
         return [
             {
                 'from': LeedDaylightOptionTwoVisualization()._outputs.visualization,
                 'to': 'visualization.vsf'
+            },
+            {
+                'from':
+                    LeedDaylightOptionTwoVisualization()._outputs.compact_visualization,
+                'to': 'compact'
             }
         ]
 
@@ -172,6 +186,13 @@ class LeedDaylightOptionTwoEntryPoint(DAG):
         description='Visualization in VisualizationSet format.'
     )
 
+    compact_visualization = Outputs.folder(
+        source='compact',
+        description='A folder with the visualization of the combined pass/fail '
+        'results in the compact_visualization_format. The file is named '
+        'visualization.pkl by default.'
+    )
+
     illuminance_9am = Outputs.folder(
         source='simulation/9AM/results',
         description='Illuminance results for the 9AM simulation in lux.',
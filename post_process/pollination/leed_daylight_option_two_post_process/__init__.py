@@ -0,0 +1,6 @@
+from pollination.leed_daylight_option_two._post_process import \
+    LeedDaylightOptionTwoPostProcessEntryPoint
+
+__pollination__ = {
+    'entry_point': LeedDaylightOptionTwoPostProcessEntryPoint
+}
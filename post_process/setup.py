@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+import os
+
+import setuptools
+
+# the post-process recipe is a separate package because pollination-dsl reads the
+# metadata of a recipe from the package with the same name as its module
+here = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(here, 'README.md'), 'r') as fh:
+    long_description = fh.read()
+
+with open(os.path.join(here, 'requirements.txt')) as f:
+    requirements = ['pollination-leed-daylight-option-two'] + f.read().splitlines()
+
+# normal setuptool inputs
+setuptools.setup(
+    name='pollination-leed-daylight-option-two-post-process',
+    author='pollination',
+    author_email='info@pollination.solutions',
+    packages=setuptools.find_namespace_packages(include=['pollination.*']),
+    install_requires=requirements,
+    use_scm_version={'root': '..', 'relative_to': __file__},
+    setup_requires=['setuptools_scm'],
+    url='https://github.com/pollination/leed-daylight-option-two',
+    project_urls={
+        'icon': 'https://raw.githubusercontent.com/ladybug-tools/artwork/master/icons_components/honeybee/png/leeddaylight.png',
+        'docker': 'https://hub.docker.com/r/ladybugtools/honeybee-radiance'
+    },
+    description='Evaluate LEED daylight credits with and without glare-control '
+    'devices from the results of a previous LEED Daylight Option Two run.',
+    long_description=long_description,
+    long_description_content_type="text/markdown",
+    maintainer='chris, pollination',
+    maintainer_email='chris@ladybug.tools, info@pollination.solutions',
+    keywords='honeybee, radiance, leed, daylight, illuminance',
+    license='PolyForm Shield License 1.0.0, https://polyformproject.org/wp-content/uploads/2020/06/PolyForm-Shield-1.0.0.txt',
+    zip_safe=False
+)
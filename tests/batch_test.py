@@ -0,0 +1,50 @@
+import json
+
+from tools import batch
+from tools.batch import main, variant_names, write_comparison
+
+
+def test_variant_names():
+    models = ['base/model.hbjson', 'glazing_40.hbjson', 'other/model.hbjson']
+    assert variant_names(models) == ['model', 'glazing_40', 'model_2']
+    # a generated name can not be the same as the file name of another model
+    models = ['x/a.hbjson', 'y/a.hbjson', 'z/a_2.hbjson']
+    assert variant_names(models) == ['a', 'a_2', 'a_2_2']
+
+
+def test_write_comparison(tmp_path):
+    summaries = [
+        ('base', {'credits': 2, 'percentage_passing': 62.5, 'total_sensor_count': 8}),
+        ('glazing_40', {'credits': 3, 'percentage_passing': 95.0})
+    ]
+    write_comparison(summaries, str(tmp_path))
+    with open(str(tmp_path / 'comparison.csv')) as inf:
+        lines = inf.read().splitlines()
+    assert lines[0].startswith('Variant,Credits,% Passing Combined')
+    assert lines[1] == 'base,2,62.50,,,,,8'
+    assert lines[2] == 'glazing_40,3,95.00,,,,,'
+    with open(str(tmp_path / 'batch_summary.json')) as inf:
+        assert json.load(inf)['glazing_40']['credits'] == 3
+
+
+def test_incremental_scope(tmp_path, monkeypatch):
+    runs = []
+
+    class _Run(object):
+        def __init__(self, model, wea, folder, **kwargs):
+            self.folder = folder
+            runs.append(kwargs)
+
+        def path(self, *args):
+            return '/'.join((self.folder,) + args)
+
+        def run(self):
+            return {'credits': 2, 'percentage_passing': 62.5}
+
+    monkeypatch.setattr(batch, 'LocalRun', _Run)
+    main(['base.hbjson', 'variant.hbjson', '--wea', 'weather.wea',
+          '--folder', str(tmp_path), '--incremental', '--incremental-scope', 'room'])
+    # the first model is the base model of the other variants
+    assert runs[0]['incremental'] is None
+    assert runs[1]['incremental'].scope == 'room'
+    assert runs[1]['incremental'].previous_run == str(tmp_path / 'base')
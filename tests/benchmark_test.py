@@ -0,0 +1,35 @@
+import os
+
+from tools.benchmark import synthetic_model, BenchmarkRun
+
+
+def test_synthetic_model():
+    model = synthetic_model(1000, room_count=4, glazing_ratio=0.3, louver_count=2)
+    grids = model.properties.radiance.sensor_grids
+    assert len(model.rooms) == 4
+    assert len(grids) == 4
+    assert abs(sum(g.count for g in grids) - 1000) < 50
+    assert all(grid.room_identifier for grid in grids)
+    apertures = [ap for room in model.rooms for face in room.faces for ap in face.apertures]
+    assert len(apertures) == 16
+    assert all(len(ap.outdoor_shades) == 2 for ap in apertures)
+
+
+def test_benchmark_stage(tmp_path):
+    model = synthetic_model(100, room_count=2)
+    model_file = model.to_hbjson('model', str(tmp_path))
+    wea = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'samples', 'artifacts',
+        'Boston-Logan Intl AP_0_8759.wea'
+    )
+    run = BenchmarkRun(model_file, wea, str(tmp_path / 'run'))
+    run.run_step('prepare_folder')
+    stage = run.stages['prepare_folder']
+    assert stage['command_count'] == 2
+    assert stage['cpu_time'] > 0
+    # the resource usage of the commands is not available on all platforms
+    if hasattr(os, 'wait4'):
+        assert stage['peak_memory'] > 0
+    else:
+        assert stage['peak_memory'] is None
+    assert stage['file_count'] > 0 and stage['file_size'] > 0
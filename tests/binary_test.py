@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from tools.binary import HEADER, MAGIC, write_values, write_pass_fail, read, \
+    read_results, binary_to_text
+
+
+def test_values_and_pass_fail(tmp_path):
+    values_file = str(tmp_path / 'grid.bin')
+    # values just below the thresholds are not rounded up to them
+    values = [0.5, 299.99999, 3000.0001, 3000.25]
+    write_values(values_file, values)
+    assert list(read(values_file)) == values
+    assert os.path.getsize(values_file) == 16 + 4 * 8
+
+    pass_fail_file = str(tmp_path / 'pass_fail.bin')
+    pass_fail = [1, 0, 0, 1, 1, 1, 0, 1, 1, 0]
+    write_pass_fail(pass_fail_file, pass_fail)
+    assert list(read(pass_fail_file)) == pass_fail
+    assert read(pass_fail_file)[-1] == 0
+    assert os.path.getsize(pass_fail_file) == 16 + 2
+
+    text_file = str(tmp_path / 'pass_fail.res')
+    binary_to_text(pass_fail_file, text_file)
+    assert read_results(text_file) == pass_fail
+
+
+
+def test_memory_mapped(tmp_path):
+    values_file = str(tmp_path / 'grid.bin')
+    write_values(values_file, range(1000))
+    values = read(values_file)
+    # the values are read from the mapped file without a copy
+    assert isinstance(values, memoryview) or values.typecode == 'd'
+    assert values[999] == 999.0
+    assert sum(values[10:20]) == sum(range(10, 20))
+
+    unknown_file = str(tmp_path / 'unknown.bin')
+    with open(unknown_file, 'wb') as outf:
+        outf.write(HEADER.pack(MAGIC, 9, 0))
+    with pytest.raises(AssertionError):
+        read(unknown_file)
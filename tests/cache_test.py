@@ -0,0 +1,57 @@
+import os
+
+from tools.cache import ArtifactCache, folder_hash
+
+
+def _write(path, content):
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(path, 'w') as outf:
+        outf.write(content)
+
+
+def test_cache_file_and_folder(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    src_file = str(tmp_path / 'scene.oct')
+    _write(src_file, 'octree')
+    src_folder = str(tmp_path / 'model')
+    _write(os.path.join(src_folder, 'grid', 'room.pts'), '0 0 0 0 0 1\n')
+
+    file_key = ArtifactCache.key('octree', 'a')
+    folder_key = ArtifactCache.key('rad-folder', 'a')
+    assert not cache.get(file_key, str(tmp_path / 'out.oct'))
+    cache.put(file_key, src_file)
+    cache.put(folder_key, src_folder)
+
+    assert cache.get(file_key, str(tmp_path / 'out.oct'))
+    with open(str(tmp_path / 'out.oct')) as inf:
+        assert inf.read() == 'octree'
+    assert cache.get(folder_key, str(tmp_path / 'out_model'))
+    assert folder_hash(str(tmp_path / 'out_model')) == folder_hash(src_folder)
+
+
+def test_cache_eviction(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'), max_size=25)
+    keys = []
+    for i in range(3):
+        src = str(tmp_path / ('%d.oct' % i))
+        _write(src, str(i) * 10)
+        key = ArtifactCache.key(i)
+        cache.put(key, src)
+        keys.append(key)
+        os.utime(os.path.join(cache.folder, key), (i, i))
+    # the first entry is the least recently used one
+    assert not cache.has(keys[0])
+    assert cache.has(keys[1]) and cache.has(keys[2])
+    assert cache.size <= 25
+
+
+def test_cache_bypass(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'), enabled=False)
+    src = str(tmp_path / 'scene.oct')
+    _write(src, 'octree')
+    key = ArtifactCache.key('octree')
+    cache.put(key, src)
+    assert not cache.has(key)
+    assert not cache.get(key, str(tmp_path / 'out.oct'))
@@ -0,0 +1,78 @@
+import json
+import os
+
+from honeybee.model import Model
+from honeybee.room import Room
+from honeybee_radiance.sensorgrid import SensorGrid
+from honeybee_radiance.postprocess.leed import leed_illuminance_to_folder
+
+from tools.credits import CreditEvaluator
+
+
+def _simulation_folder(folder):
+    room = Room.from_box('office', 6, 4, 3)
+    grid = SensorGrid.from_mesh3d('office', room.generate_grid(1, 1, 0.8))
+    model = Model('tower', [room])
+    model.properties.radiance.sensor_grids = [grid]
+    os.makedirs(folder)
+    model.to_hbjson('model', folder)
+    grids_info = [
+        {'name': 'office', 'identifier': 'office', 'full_id': 'office', 'count': 24}
+    ]
+    values = {
+        '9AM': [100 * i for i in range(24)],
+        '3PM': [200 * i for i in range(24)]
+    }
+    for sky, sky_values in values.items():
+        results = os.path.join(folder, sky, 'results')
+        os.makedirs(results)
+        with open(os.path.join(results, 'grids_info.json'), 'w') as outf:
+            json.dump(grids_info, outf)
+        with open(os.path.join(results, 'office.res'), 'w') as outf:
+            outf.writelines('%s\n' % v for v in sky_values)
+    return grids_info, values
+
+
+def test_credit_evaluator(tmp_path):
+    folder = str(tmp_path / 'simulation')
+    grids_info, values = _simulation_folder(folder)
+    expected = leed_illuminance_to_folder(folder, False, sub_folder='../expected')
+
+    # the sensors are split into two grids of 10 and 14 sensors
+    dist_info = [{'identifier': 'office', 'dist_info': [
+        {'identifier': 0, 'st_ln': 0, 'end_ln': 9},
+        {'identifier': 1, 'st_ln': 0, 'end_ln': 13}
+    ]}]
+    evaluator = CreditEvaluator(
+        grids_info, dist_info, os.path.join(folder, 'model.hbjson'), False
+    )
+    evaluator.add_chunk('9AM', '1', values['9AM'][10:])
+    evaluator.add_chunk('3PM', '1', values['3PM'][10:])
+    partial = evaluator.summary()
+    assert not evaluator.complete
+    assert partial['complete'] is False
+    assert round(partial['percentage_evaluated'], 2) == round(100 * 14 / 24, 2)
+    # the combined values are unset until both skies have results
+    evaluator.add_chunk('9AM', '0', values['9AM'][:10])
+    assert evaluator.pass_fail('9AM')[0][:5] == [0, 0, 0, 0, 1]
+    assert evaluator.pass_fail('combined')[0][:10] == [None] * 10
+    assert not evaluator.complete
+
+    evaluator.add_chunk('9AM', '0', values['9AM'][:10])
+    evaluator.add_chunk('3PM', '0', values['3PM'][:10])
+    assert evaluator.complete
+    assert evaluator.summary() == expected
+
+    evaluator.write_results(str(tmp_path / 'results'))
+    for name in ('space_summary.csv', 'combined/office.res', '9AM/office.res'):
+        with open(str(tmp_path / 'results' / name)) as inf:
+            result = inf.read()
+        with open(str(tmp_path / 'expected' / name)) as inf:
+            assert result == inf.read()
+
+    evaluator.write_space_summary(str(tmp_path / 'summary_only'))
+    assert os.listdir(str(tmp_path / 'summary_only')) == ['space_summary.csv']
+    with open(str(tmp_path / 'summary_only' / 'space_summary.csv')) as inf:
+        result = inf.read()
+    with open(str(tmp_path / 'expected' / 'space_summary.csv')) as inf:
+        assert result == inf.read()
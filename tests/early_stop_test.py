@@ -0,0 +1,45 @@
+from tools.credits import CreditEvaluator
+from tools.early_stop import stratified_order, passing_bounds, credits_decided
+
+
+def _grids_info():
+    return [
+        {'name': 'office', 'identifier': 'office', 'full_id': 'office', 'count': 300},
+        {'name': 'lobby', 'identifier': 'lobby', 'full_id': 'lobby', 'count': 100}
+    ]
+
+
+def test_stratified_order():
+    order = stratified_order(_grids_info(), seed=1)
+    assert sorted(order) == sorted(
+        [('office', i) for i in range(300)] + [('lobby', i) for i in range(100)]
+    )
+    # any prefix of the order samples the grids in proportion to their size
+    sample = order[:40]
+    assert abs(sum(1 for full_id, _ in sample if full_id == 'office') - 30) <= 1
+    assert stratified_order(_grids_info(), seed=1) == order
+
+
+def test_passing_bounds():
+    grids_info = _grids_info()
+    # all the sensors in the office pass and the sensors in the lobby fail
+    values = {'office': 1000, 'lobby': 100}
+    evaluator = CreditEvaluator(grids_info)
+    order = stratified_order(grids_info)
+    for full_id, index in order[:200]:
+        for sky in ('9AM', '3PM'):
+            evaluator.add_values(sky, full_id, [values[full_id]], index)
+    estimate, lower, upper = passing_bounds(evaluator)
+    assert lower <= 75 <= upper
+    assert lower <= estimate <= upper
+
+    for full_id, index in order[200:]:
+        for sky in ('9AM', '3PM'):
+            evaluator.add_values(sky, full_id, [values[full_id]], index)
+    assert passing_bounds(evaluator) == (75, 75, 75)
+
+
+def test_credits_decided():
+    assert credits_decided(91, 99)
+    assert not credits_decided(89, 91)
+    assert credits_decided(0, 54.9)
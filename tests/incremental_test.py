@@ -0,0 +1,89 @@
+import copy
+import json
+
+import pytest
+
+from tools.incremental import model_fingerprints, changed_grids
+
+
+def _room(identifier, height, adjacent=None):
+    faces = [{'identifier': '%s_floor' % identifier, 'height': height}]
+    if adjacent:
+        faces.append({
+            'identifier': '%s_wall' % identifier,
+            'boundary_condition': {
+                'type': 'Surface',
+                'boundary_condition_objects': ['%s_wall' % adjacent, adjacent]
+            }
+        })
+    return {'identifier': identifier, 'faces': faces}
+
+
+def _grid(identifier, room, z=0.8):
+    return {
+        'identifier': identifier, 'room_identifier': room,
+        'sensors': [{'pos': [0, 0, z], 'dir': [0, 0, 1]}]
+    }
+
+
+def _model():
+    return {
+        'identifier': 'tower', 'rooms': [
+            _room('floor_1', 3), _room('floor_2', 3, 'floor_3'),
+            _room('floor_3', 3, 'floor_2'), _room('floor_4', 3)
+        ],
+        'orphaned_shades': [],
+        'properties': {'radiance': {'modifiers': [], 'sensor_grids': [
+            _grid('grid_%d' % i, 'floor_%d' % i) for i in range(1, 5)
+        ]}}
+    }
+
+
+def _run_info(model, tmp_path, name, settings=None):
+    model_file = tmp_path / name
+    model_file.write_text(json.dumps(model))
+    return {
+        'fingerprints': model_fingerprints(str(model_file)),
+        'settings': settings or {'radiance_parameters': '-ab 5'}
+    }
+
+
+def test_changed_grids(tmp_path):
+    model = _model()
+    previous = _run_info(model, tmp_path, 'previous.hbjson')
+    assert changed_grids(previous, previous) == []
+
+    # change one floor that has no adjacent rooms
+    edited = copy.deepcopy(model)
+    edited['rooms'][0]['faces'][0]['height'] = 4
+    current = _run_info(edited, tmp_path, 'current.hbjson')
+    with pytest.warns(UserWarning):
+        assert changed_grids(current, previous, 'room') == ['grid_1']
+    assert len(changed_grids(current, previous, 'model')) == 4
+
+    # change a floor with an interior wall to the floor above
+    edited = copy.deepcopy(model)
+    edited['rooms'][1]['faces'][0]['height'] = 4
+    current = _run_info(edited, tmp_path, 'current.hbjson')
+    with pytest.warns(UserWarning):
+        assert changed_grids(current, previous, 'room') == ['grid_2', 'grid_3']
+    assert len(changed_grids(current, previous)) == 4
+
+    # move the sensors of one grid
+    edited = copy.deepcopy(model)
+    edited['properties']['radiance']['sensor_grids'][3] = _grid('grid_4', 'floor_4', 1)
+    current = _run_info(edited, tmp_path, 'current.hbjson')
+    assert changed_grids(current, previous, 'model') == ['grid_4']
+
+
+def test_changed_grids_context_and_settings(tmp_path):
+    model = _model()
+    previous = _run_info(model, tmp_path, 'previous.hbjson')
+
+    edited = copy.deepcopy(model)
+    edited['orphaned_shades'].append({'identifier': 'canopy'})
+    current = _run_info(edited, tmp_path, 'current.hbjson')
+    assert len(changed_grids(current, previous)) == 4
+
+    current = _run_info(model, tmp_path, 'current.hbjson', {'radiance_parameters': ''})
+    assert len(changed_grids(current, previous)) == 4
@@ -0,0 +1,85 @@
+import json
+import os
+
+import pytest
+from honeybee_radiance_folder.gridutil import restore_original_distribution
+
+from tools.binary import text_to_binary, read, read_results
+from tools.merge import line_offsets, merge_folder
+
+HEADER = '#?RADIANCE\nrtrace -h-\nFORMAT=ascii\n\n'
+
+
+def _dist_info():
+    # the chunks have 40 and 25 sensors and the grids have 30, 25 and 10 sensors
+    return [
+        {'identifier': 'office', 'dist_info': [
+            {'identifier': 0, 'st_ln': 0, 'end_ln': 29}
+        ]},
+        {'identifier': 'floor_2/lobby', 'dist_info': [
+            {'identifier': 0, 'st_ln': 30, 'end_ln': 39},
+            {'identifier': 1, 'st_ln': 0, 'end_ln': 14}
+        ]},
+        {'identifier': 'hall', 'dist_info': [
+            {'identifier': 1, 'st_ln': 15, 'end_ln': 24}
+        ]}
+    ]
+
+
+def test_line_offsets(tmp_path):
+    res_file = str(tmp_path / 'grid.res')
+    with open(res_file, 'w') as outf:
+        outf.write(HEADER + '1.5\n22\n333\n')
+    start = len(HEADER)
+    assert line_offsets(res_file, [3, 0, 1], buffer_size=2) == \
+        {0: start, 1: start + 4, 3: start + 11}
+    with pytest.raises(ValueError):
+        line_offsets(res_file, [4])
+
+
+@pytest.mark.parametrize('header', ['', HEADER])
+def test_merge_folder(tmp_path, header):
+    chunks = {
+        '0': ['%.4f' % (i * 10.5) for i in range(40)],
+        '1': ['%d' % (i * 7) for i in range(25)]
+    }
+    text_folder = tmp_path / 'text'
+    binary_folder = tmp_path / 'binary'
+    os.makedirs(str(text_folder))
+    os.makedirs(str(binary_folder))
+    for name, values in chunks.items():
+        res_file = str(text_folder / ('%s.res' % name))
+        with open(res_file, 'w') as outf:
+            outf.write(header)
+            outf.writelines('%s\n' % v for v in values)
+        if not header:
+            text_to_binary(res_file, str(binary_folder / ('%s.bin' % name)))
+    dist_info = _dist_info()
+    dist_info_file = str(tmp_path / '_redist_info.json')
+    with open(dist_info_file, 'w') as outf:
+        json.dump(dist_info, outf)
+    expected = tmp_path / 'expected'
+    os.makedirs(str(expected / 'floor_2'))
+    restore_original_distribution(
+        str(text_folder), str(expected), 'res', dist_info_file
+    )
+
+    # a small buffer to copy the segments in a number of blocks
+    merge_folder(
+        str(text_folder), str(tmp_path / 'results'), dist_info, workers=2,
+        buffer_size=16
+    )
+    for name in ('office', 'floor_2/lobby', 'hall'):
+        with open(str(expected / ('%s.res' % name))) as inf:
+            expected_text = inf.read()
+        with open(str(tmp_path / 'results' / ('%s.res' % name))) as inf:
+            assert inf.read() == expected_text
+    if header:
+        return
+
+    merge_folder(
+        str(binary_folder), str(tmp_path / 'binary_results'), dist_info, 'bin', 2
+    )
+    for name in ('office', 'floor_2/lobby', 'hall'):
+        result = read(str(tmp_path / 'binary_results' / ('%s.bin' % name)))
+        assert list(result) == read_results(str(expected / ('%s.res' % name)))
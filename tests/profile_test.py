@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+from tools.profile import Profile
+
+
+def test_task_resources(tmp_path):
+    profile = Profile()
+    with profile.task('prepare_folder'):
+        with profile.task('point_in_time_grid_ray_tracing', sky='9AM', sensor_count=10):
+            returncode, output = profile.run_command(
+                [sys.executable, '-c', 'print("done")'], str(tmp_path)
+            )
+        with profile.task('measure', record=False):
+            pass
+    assert returncode == 0 and output.strip() == b'done'
+
+    names = [task['task'] for task in profile.tasks]
+    assert names == ['point_in_time_grid_ray_tracing', 'prepare_folder']
+    ray_tracing, prepare = profile.tasks
+    assert ray_tracing['sky'] == '9AM' and ray_tracing['sensor_count'] == 10
+    for task in profile.tasks:
+        assert task['command_count'] == 1
+        assert task['end'] >= task['start']
+        assert task['cpu_time'] > 0
+        # the resource usage of the commands is not available on all platforms
+        if not hasattr(os, 'wait4'):
+            assert task['peak_memory'] is None and task['bytes_read'] is None
+            continue
+        assert task['peak_memory'] > 0
+        # the block I/O of other platforms is zero for reads from the page cache
+        if sys.platform.startswith('linux'):
+            assert task['bytes_read'] > 0
+        else:
+            assert task['bytes_read'] >= 0
+    assert prepare['duration'] >= ray_tracing['duration']
+
+    profile_file = str(tmp_path / 'profile.json')
+    profile.write(profile_file, {'cpu_count': 2})
+    with open(profile_file) as inf:
+        data = json.load(inf)
+    assert data['settings'] == {'cpu_count': 2}
+    assert len(data['tasks']) == 2
+    assert data['summary']['prepare_folder']['count'] == 1
+
+
+def test_output_file(tmp_path):
+    profile = Profile()
+    output_file = str(tmp_path / 'scene.oct')
+    returncode, output = profile.run_command(
+        [sys.executable, '-c', 'import sys; print("octree"); sys.stderr.write("log")'],
+        str(tmp_path), output_file
+    )
+    assert returncode == 0 and output == b'log'
+    with open(output_file) as inf:
+        assert inf.read().strip() == 'octree'
+
+
+def test_exit_code(tmp_path, monkeypatch):
+    # python < 3.9 has no os.waitstatus_to_exitcode
+    monkeypatch.delattr(os, 'waitstatus_to_exitcode', raising=False)
+    returncode, _ = Profile().run_command(
+        [sys.executable, '-c', 'import sys; sys.exit(3)'], str(tmp_path)
+    )
+    assert returncode == 3
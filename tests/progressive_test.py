@@ -0,0 +1,14 @@
+from tools.progressive import thresholds, near_thresholds, refine_lines
+
+
+def test_near_thresholds():
+    values = [100, 200, 299, 1000, 2500, 4000, 5000]
+    assert near_thresholds(values, thresholds(True), 0.5) == [1, 2]
+    assert near_thresholds(values, thresholds(False), 0.5) == [1, 2, 4, 5]
+    assert near_thresholds(values, thresholds(False), 0) == []
+
+
+def test_refine_lines():
+    lines = ['100\n', '290\n', '1000\n']
+    assert refine_lines(lines, [1], ['310\n']) == ['100\n', '310\n', '1000\n']
+    assert lines[1] == '290\n'
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from tools.binary import EXTENSION, read, write_values
+from tools.credits import CreditEvaluator
+from tools.prune import SpatialIndex, SensorMap, prune_sensors, expand_folder
+
+
+def _write_grids(folder):
+    # the lobby overlaps the office
+    grids = {
+        'office': ['0 0 0.8 0 0 1', '1 0 0.8 0 0 1', '2 0 0.8 0 0 1'],
+        'lobby': ['1 0 0.8 0 0 1', '2.0004 0 0.8 0 0 1', '2 0 0.8 0 1 0',
+                  '1.1 0.5 0.8 0 0 1'],
+        'hall': ['0 0 0.8 0 0 2']
+    }
+    grids_info = []
+    for name, lines in grids.items():
+        (folder / ('%s.pts' % name)).write_text('\n'.join(lines) + '\n')
+        grids_info.append({'name': name, 'identifier': name, 'full_id': name,
+                           'count': len(lines)})
+    return grids_info
+
+
+def test_spatial_index():
+    index = SpatialIndex(0.5)
+    assert list(index.near((0, 0, 0))) == []
+    for i, point in enumerate([(0, 0, 0), (0.6, 0.6, 0), (3, 0, 0)]):
+        index.add(point, i)
+    assert sorted(item for _, item in index.near((0.4, 0.4, 0))) == [0, 1]
+    assert [item for _, item in index.near((3.2, 0, 0))] == [2]
+
+
+def test_prune_sensors(tmp_path):
+    grids_info = _write_grids(tmp_path)
+    sensor_map = prune_sensors(
+        str(tmp_path), grids_info, str(tmp_path / 'pruned'), 0.001
+    )
+    # the sensors with the same position and direction are traced once
+    assert sensor_map.sensors == {
+        'office': [0, 1, 2], 'lobby': [1, 2, 3, 4], 'hall': [0]
+    }
+    assert [g['count'] for g in sensor_map.grids_info] == [3, 2]
+    assert (tmp_path / 'pruned' / 'lobby.pts').read_text() == \
+        '2 0 0.8 0 1 0\n1.1 0.5 0.8 0 0 1\n'
+    assert not (tmp_path / 'pruned' / 'hall.pts').exists()
+    with open(str(tmp_path / 'pruned' / '_info.json')) as inf:
+        assert json.load(inf) == sensor_map.grids_info
+    assert sensor_map.original_sensors('lobby', 0, 1) == [(0, 'lobby', 2)]
+
+    sensor_map.to_file(str(tmp_path / 'sensor_map.json'))
+    loaded = SensorMap.from_file(str(tmp_path / 'sensor_map.json'))
+    assert loaded.sensors == sensor_map.sensors
+    assert loaded.sensor_count == 8
+
+
+def test_prune_duplicated_grid(tmp_path):
+    # a copy of a grid is traced once
+    lines = ['%d %d 0.8 0 0 1\n' % (x, y) for x in range(10) for y in range(5)]
+    grids_info = []
+    for name in ('office', 'office_copy'):
+        (tmp_path / ('%s.pts' % name)).write_text(''.join(lines))
+        grids_info.append({'name': name, 'identifier': name, 'full_id': name,
+                           'count': len(lines)})
+    sensor_map = prune_sensors(
+        str(tmp_path), grids_info, str(tmp_path / 'pruned'), 0.001
+    )
+    assert sensor_map.sensor_count == 100
+    assert sensor_map.traced_count == 50
+    assert sensor_map.sensors['office_copy'] == sensor_map.sensors['office']
+    assert not (tmp_path / 'pruned' / 'office_copy.pts').exists()
+
+
+@pytest.mark.parametrize('extension', ['res', EXTENSION])
+def test_expand_folder(tmp_path, extension):
+    sensor_map = prune_sensors(
+        str(tmp_path), _write_grids(tmp_path), str(tmp_path / 'pruned'), 0.001
+    )
+    values = {'office': [100, 200, 300], 'lobby': [400, 500]}
+    for name, grid_values in values.items():
+        path = str(tmp_path / ('%s.%s' % (name, extension)))
+        if extension == EXTENSION:
+            write_values(path, grid_values)
+        else:
+            with open(path, 'w') as outf:
+                outf.writelines('%d\n' % v for v in grid_values)
+    expand_folder(sensor_map, str(tmp_path), str(tmp_path / 'results'), extension)
+    expected = {'office': [100, 200, 300], 'lobby': [200, 300, 400, 500],
+                'hall': [100]}
+    for name, grid_values in expected.items():
+        path = str(tmp_path / 'results' / ('%s.%s' % (name, extension)))
+        if extension == EXTENSION:
+            assert list(read(path)) == grid_values
+        else:
+            with open(path) as inf:
+                assert [int(line) for line in inf] == grid_values
+
+
+def test_evaluate_pruned_chunks(tmp_path):
+    grids_info = _write_grids(tmp_path)
+    sensor_map = prune_sensors(
+        str(tmp_path), grids_info, str(tmp_path / 'pruned'), 0.001
+    )
+    dist_info = [
+        {'identifier': 'office', 'dist_info': [
+            {'identifier': 0, 'st_ln': 0, 'end_ln': 2}
+        ]},
+        {'identifier': 'lobby', 'dist_info': [
+            {'identifier': 1, 'st_ln': 0, 'end_ln': 1}
+        ]}
+    ]
+    evaluator = CreditEvaluator(grids_info, dist_info, sensor_map=sensor_map)
+    for sky in ('9AM', '3PM'):
+        evaluator.add_chunk(sky, 0, [100, 500, 500])
+        assert not evaluator.complete
+        evaluator.add_chunk(sky, 1, [500, 100])
+    assert evaluator.complete
+    assert evaluator.pass_fail('combined') == [[0, 1, 1], [1, 1, 1, 0], [0]]
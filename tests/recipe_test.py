@@ -0,0 +1,30 @@
+import pytest
+
+from tools.recipe import recipe_tasks, topological_order
+
+
+def test_recipe_tasks():
+    tasks = {task['name']: task for task in recipe_tasks()}
+    ray_tracing = tasks['illuminance_simulation/point_in_time_grid_ray_tracing']
+    # the nested tasks get the needs and the loop of their parent
+    assert ray_tracing['loop']
+    assert tasks['illuminance_simulation/create_octree']['loop']
+    assert ray_tracing['needs'] == [
+        'illuminance_simulation/create_octree',
+        'illuminance_simulation/split_grid_folder',
+        'prepare_folder/copy_model', 'prepare_folder/create_rad_folder',
+        'prepare_folder/create_skies'
+    ]
+    assert not tasks['evaluate_credits']['loop']
+    assert 'illuminance_simulation/restructure_results' in \
+        tasks['evaluate_credits']['needs']
+    assert tasks['prepare_folder/create_skies']['needs'] == []
+
+
+def test_topological_order():
+    assert topological_order({'c': ['a', 'b'], 'b': ['a'], 'a': []}) == \
+        ['a', 'b', 'c']
+    with pytest.raises(AssertionError):
+        topological_order({'a': ['b'], 'b': ['a']})
+    with pytest.raises(AssertionError):
+        topological_order({'a': ['d']})
@@ -0,0 +1,168 @@
+import json
+import sys
+import threading
+
+import pytest
+
+from tools import run_local
+from tools.local import early_stop, split, tracing
+from tools.local.ambient import AmbientCache
+from tools.local.early_stop import EarlyStop
+from tools.local.split import CostSplit
+from tools.run_local import LocalRun
+
+
+def test_run_parallel(tmp_path):
+    run = LocalRun('model.hbjson', 'weather.wea', str(tmp_path), workers=4)
+    # the barrier is only passed if the four tasks run at the same time
+    barrier = threading.Barrier(4, timeout=30)
+
+    def _task(index):
+        barrier.wait()
+        with run.profile.task('task', index=index):
+            run.run_command([sys.executable, '-c', 'pass'])
+        return index * 2
+
+    with run.profile.task('stage', record=False) as stage:
+        results = dict(run.run_parallel(_task, range(4)))
+    assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+    assert len(run.profile.tasks) == 4
+    assert all(task['command_count'] == 1 for task in run.profile.tasks)
+    assert stage['command_count'] == 4
+
+    def _fail(index):
+        if index == 1:
+            raise ValueError('Task failed.')
+        return index
+
+    with pytest.raises(ValueError):
+        list(run.run_parallel(_fail, range(4)))
+
+
+def test_ambient_file(tmp_path):
+    commands = []
+
+    class _Run(LocalRun):
+        def run_command(self, args, cwd=None, output_file=None):
+            commands.append(args)
+
+    run = _Run('model.hbjson', 'weather.wea', str(tmp_path),
+               ambient_cache=AmbientCache())
+    ambient_file = tracing.ambient_file(run, '9AM')
+    assert ambient_file == str(tmp_path / 'simulation' / '9AM' / 'resources' /
+                               'ambient.amb')
+    cwd = str(tmp_path / 'simulation' / 'resources' / 'grid')
+    tracing.raytrace(run, 'scene.oct', 'grid.pts', 'grid.res', '-ab 5', cwd,
+                     ambient_file)
+    params = commands[-1][commands[-1].index('--rad-params') + 1]
+    assert params == '-ab 5 -af ../../9AM/resources/ambient.amb'
+
+    run = LocalRun('model.hbjson', 'weather.wea', str(tmp_path))
+    assert tracing.ambient_file(run, '9AM') is None
+
+
+def test_largest_first(tmp_path, monkeypatch):
+    grid_folder = tmp_path / 'simulation' / 'resources' / 'grid'
+    grid_folder.mkdir(parents=True)
+    counts = [10, 40, 20]
+    (grid_folder / '_info.json').write_text(json.dumps([
+        {'name': str(i), 'full_id': str(i), 'count': c} for i, c in enumerate(counts)
+    ]))
+    (grid_folder / '_redist_info.json').write_text(json.dumps([
+        {'identifier': 'room', 'dist_info': [
+            {'identifier': i, 'st_ln': 0, 'end_ln': c - 1}
+            for i, c in enumerate(counts)
+        ]}
+    ]))
+    order = []
+
+    def _trace_grid(run, sky, grid):
+        order.append((sky, grid['name']))
+        return None, {'duration': 1}
+
+    monkeypatch.setattr(tracing, 'trace_grid', _trace_grid)
+    run = LocalRun('model.hbjson', 'weather.wea', str(tmp_path), workers=1)
+    tracing.ray_tracing(run)
+    # both skies share one queue that starts with the largest split grid
+    assert order == [('9AM', '1'), ('3PM', '1'), ('9AM', '2'), ('3PM', '2'),
+                     ('9AM', '0'), ('3PM', '0')]
+    timing_file = tmp_path / 'simulation' / 'initial_results' / '_timing.json'
+    assert [t['estimate'] for t in json.loads(timing_file.read_text())] == \
+        [40, 40, 20, 20, 10, 10]
+
+
+def test_probe_parameters(tmp_path, monkeypatch):
+    probes = []
+
+    def _probe(octree, grid_folder, grid_info, **kwargs):
+        probes.append(kwargs)
+        return {g['full_id']: 1 for g in grid_info}
+
+    monkeypatch.setattr(split, 'probe_grid_costs', _probe)
+    run = LocalRun('model.hbjson', 'weather.wea', str(tmp_path),
+                   radiance_parameters='-ab 4 -ad 1024', workers=3)
+    assert CostSplit().grid_costs(run, [{'full_id': 'room'}]) == {'room': 1}
+    # the probe uses its own low-precision parameters and runs with the workers
+    assert probes == [{'workers': 3}]
+
+
+def test_trace_sensors_chunks(tmp_path, monkeypatch):
+    traced = []
+
+    def _raytrace(run, octree, sensor_file, output, radiance_parameters, cwd,
+                  ambient=None):
+        with open(sensor_file) as inf:
+            lines = inf.readlines()
+        traced.append(len(lines))
+        with open(output, 'w') as outf:
+            outf.writelines('%s\n' % line.split()[0] for line in lines)
+
+    class _Evaluator(object):
+        def __init__(self):
+            self.values = []
+
+        def add_values(self, sky, full_id, values, index):
+            self.values.append((sky, full_id, index, values[0]))
+
+    monkeypatch.setattr(early_stop, 'raytrace', _raytrace)
+    run = LocalRun('model.hbjson', 'weather.wea', str(tmp_path), workers=3)
+    lines = {'room': ['%d 0 0.8 0 0 1\n' % i for i in range(7)]}
+    sensors = [('room', i) for i in range(6, -1, -1)]
+    results = {sky: {'room': [None] * 7} for sky in ('9AM', '3PM')}
+    evaluator = _Evaluator()
+    EarlyStop().trace_sensors(
+        run, sensors, 'batch_0', '-ab 1', evaluator, results, lines
+    )
+    # the batch is split between the workers for each sky
+    assert sorted(traced) == [1, 1, 3, 3, 3, 3]
+    for sky in ('9AM', '3PM'):
+        assert [float(v) for v in results[sky]['room']] == list(range(7))
+    assert sorted(evaluator.values) == sorted(
+        (sky, 'room', i, float(i)) for sky in ('9AM', '3PM') for i in range(7)
+    )
+
+
+def test_steps(tmp_path, monkeypatch):
+    run = LocalRun('model.hbjson', 'weather.wea', str(tmp_path))
+    assert run.steps() == [
+        'prepare_folder', 'copy_sensor_grid_info', 'create_octree',
+        'split_grid_folder', 'point_in_time_grid_ray_tracing', 'restructure_results',
+        'evaluate_credits', 'create_visualization'
+    ]
+
+    # a task of the recipe without a step
+    tasks = run_local.recipe_tasks()
+    monkeypatch.setattr(
+        run_local, 'recipe_tasks',
+        lambda: tasks + [{'name': 'calculate_daylight_factor', 'needs': []}]
+    )
+    with pytest.raises(ValueError, match='calculate_daylight_factor'):
+        run.steps()
+
+    # a step without a task of the recipe
+    monkeypatch.setattr(
+        run_local, 'recipe_tasks',
+        lambda: [t for t in tasks if t['name'] != 'evaluate_credits']
+    )
+    with pytest.raises(ValueError, match='evaluate_credits'):
+        run.steps()
@@ -0,0 +1,63 @@
+import json
+import os
+
+from honeybee.model import Model
+from honeybee.room import Room
+from honeybee_radiance.sensorgrid import SensorGrid
+from honeybee_radiance.postprocess.leed import leed_illuminance_to_folder
+
+from tools.scenarios import evaluate_scenarios
+
+
+def _run_folder(folder):
+    room = Room.from_box('office', 6, 4, 3)
+    grid = SensorGrid.from_mesh3d('office', room.generate_grid(1, 1, 0.8))
+    model = Model('tower', [room])
+    model.properties.radiance.sensor_grids = [grid]
+    simulation = os.path.join(folder, 'simulation')
+    os.makedirs(simulation)
+    model.to_hbjson('model', simulation)
+    grids_info = [
+        {'name': 'office', 'identifier': 'office', 'full_id': 'office', 'count': 24}
+    ]
+    values = {'9AM': [200 * i for i in range(24)], '3PM': [250 * i for i in range(24)]}
+    for sky, sky_values in values.items():
+        results = os.path.join(simulation, sky, 'results')
+        os.makedirs(results)
+        with open(os.path.join(results, 'grids_info.json'), 'w') as outf:
+            json.dump(grids_info, outf)
+        with open(os.path.join(results, 'office.res'), 'w') as outf:
+            outf.writelines('%s\n' % v for v in sky_values)
+    return simulation
+
+
+def test_evaluate_scenarios(tmp_path):
+    simulation = _run_folder(str(tmp_path))
+    scenarios = [
+        {'name': 'glare-control', 'glare_control': True},
+        {'name': 'no-glare-control', 'glare_control': False},
+        {'name': 'strict', 'glare_control': False, 'min_illuminance': 1000,
+         'max_illuminance': 2000}
+    ]
+    summaries = dict(evaluate_scenarios(str(tmp_path), scenarios))
+
+    for name in ('glare-control', 'no-glare-control'):
+        expected = leed_illuminance_to_folder(
+            simulation, name == 'glare-control', sub_folder='../expected/%s' % name
+        )
+        assert summaries[name] == expected
+        folder = tmp_path / 'scenarios' / name
+        with open(str(folder / 'credit_summary.json')) as inf:
+            assert json.load(inf) == expected
+        for result in ('space_summary.csv', 'combined/office.res'):
+            with open(str(folder / 'results' / result)) as inf:
+                output = inf.read()
+            with open(str(tmp_path / 'expected' / name / result)) as inf:
+                assert output == inf.read()
+
+    # the sensors 6 to 9 pass at 9AM and the sensors 5 to 7 pass at 3PM
+    assert summaries['strict']['sensor_count_passing_9AM'] == 4
+    assert summaries['strict']['sensor_count_passing_3PM'] == 3
+    assert summaries['strict']['sensor_count_passing'] == 2
+    with open(str(tmp_path / 'scenarios' / 'comparison.csv')) as inf:
+        assert len(inf.read().splitlines()) == 4
@@ -0,0 +1,39 @@
+import os
+import subprocess
+
+import pytest
+
+from tools.skies import is_current, sky_descriptor, write_skies
+
+WEA = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'samples', 'artifacts',
+    'Boston-Logan Intl AP_0_8759.wea'
+)
+
+
+def test_skies_from_descriptor(tmp_path):
+    descriptor = sky_descriptor(WEA)
+    assert sorted(descriptor['skies']) == ['3PM', '9AM']
+    for north in (0, 30):
+        folder = str(tmp_path / ('descriptor_%d' % north))
+        cli_folder = str(tmp_path / ('cli_%d' % north))
+        write_skies(descriptor, folder, north)
+        subprocess.check_call([
+            'honeybee-radiance', 'sky', 'leed-illuminance', WEA, '--north', str(north),
+            '--folder', cli_folder, '--log-file', os.path.join(cli_folder, 'sky_info.json')
+        ])
+        for name in ('9AM.sky', '3PM.sky'):
+            with open(os.path.join(folder, name)) as inf, \
+                    open(os.path.join(cli_folder, name)) as cli_inf:
+                assert inf.read() == cli_inf.read()
+        with open(os.path.join(folder, 'sky_info.json')) as inf, \
+                open(os.path.join(cli_folder, 'sky_info.json')) as cli_inf:
+            assert inf.read() == cli_inf.read().replace(cli_folder, folder)
+
+
+def test_descriptor_version(tmp_path):
+    descriptor = sky_descriptor(WEA)
+    assert is_current(descriptor)
+    descriptor['honeybee_radiance'] = '0.0.1'
+    with pytest.warns(UserWarning):
+        write_skies(descriptor, str(tmp_path / 'skies'))
@@ -0,0 +1,109 @@
+import json
+import os
+
+from honeybee_radiance_folder.gridutil import restore_original_distribution
+
+from tools import split
+from tools.split import redistribute_by_cost, grid_costs_from_timing, chunk_costs, \
+    probe_grid_costs
+
+
+def _grid_folder(folder, counts):
+    os.makedirs(folder)
+    info = []
+    for i, count in enumerate(counts):
+        name = 'room_%d' % i
+        with open(os.path.join(folder, '%s.pts' % name), 'w') as outf:
+            for j in range(count):
+                outf.write('%d %d 0.8 0 0 1\n' % (i, j))
+        info.append({'name': name, 'identifier': name, 'full_id': name, 'count': count})
+    with open(os.path.join(folder, '_info.json'), 'w') as outf:
+        json.dump(info, outf)
+    return info
+
+
+def test_redistribute_by_cost(tmp_path):
+    input_folder = str(tmp_path / 'grid')
+    output_folder = str(tmp_path / 'split')
+    _grid_folder(input_folder, [100, 100])
+    # sensors in the first room are 3 times more expensive than the second room
+    costs = {'room_0': 3, 'room_1': 1}
+    out_info = redistribute_by_cost(input_folder, output_folder, 4, costs)
+    assert [g['count'] for g in out_info] == [34, 33, 33, 100]
+
+    # the results can be restored to the original grids
+    restored = str(tmp_path / 'restored')
+    restore_original_distribution(
+        output_folder, restored, 'pts',
+        os.path.join(output_folder, '_redist_info.json')
+    )
+    for name in ('room_0', 'room_1'):
+        with open(os.path.join(input_folder, '%s.pts' % name)) as inf:
+            original = inf.read()
+        with open(os.path.join(restored, '%s.pts' % name)) as inf:
+            assert inf.read() == original
+
+
+def test_redistribute_min_sensor_count(tmp_path):
+    input_folder = str(tmp_path / 'grid')
+    output_folder = str(tmp_path / 'split')
+    _grid_folder(input_folder, [10, 30])
+    out_info = redistribute_by_cost(input_folder, output_folder, 10, {}, 20)
+    assert [g['count'] for g in out_info] == [20, 20]
+
+
+def test_grid_costs_from_timing():
+    dist_info = [
+        {'identifier': 'room_0',
+         'dist_info': [{'identifier': 0, 'st_ln': 0, 'end_ln': 9}]},
+        {'identifier': 'room_1', 'dist_info': [
+            {'identifier': 0, 'st_ln': 10, 'end_ln': 19},
+            {'identifier': 1, 'st_ln': 0, 'end_ln': 19}
+        ]}
+    ]
+    timing = [
+        {'sky': '9AM', 'name': '0', 'count': 20, 'duration': 20},
+        {'sky': '3PM', 'name': '0', 'count': 20, 'duration': 20},
+        {'sky': '9AM', 'name': '1', 'count': 20, 'duration': 5},
+        {'sky': '3PM', 'name': '1', 'count': 20, 'duration': 5}
+    ]
+    costs = grid_costs_from_timing(timing, dist_info)
+    assert costs['room_0'] == 2
+    assert costs['room_1'] == (10 * 2 + 20 * 0.5) / 30
+
+
+def test_chunk_costs():
+    dist_info = [
+        {'identifier': 'room_0',
+         'dist_info': [{'identifier': 0, 'st_ln': 0, 'end_ln': 9}]},
+        {'identifier': 'room_1', 'dist_info': [
+            {'identifier': 0, 'st_ln': 10, 'end_ln': 19},
+            {'identifier': 1, 'st_ln': 0, 'end_ln': 19}
+        ]},
+        {'identifier': 'room_2',
+         'dist_info': [{'identifier': 2, 'st_ln': 0, 'end_ln': 4}]}
+    ]
+    assert chunk_costs(dist_info) == {'0': 20, '1': 20, '2': 5}
+    # room_2 gets the average cost
+    costs = chunk_costs(dist_info, {'room_0': 2, 'room_1': 0.5})
+    assert costs == {'0': 25, '1': 10, '2': 1.25 * 5}
+
+
+def test_probe_grid_costs(tmp_path, monkeypatch):
+    grid_folder = str(tmp_path / 'grid')
+    info = _grid_folder(grid_folder, [10, 20])
+    commands = []
+
+    def _run(command, **kwargs):
+        commands.append(command)
+
+    monkeypatch.setattr(split.subprocess, 'run', _run)
+    costs = probe_grid_costs('scene.oct', grid_folder, info, sample_count=5, workers=2)
+    assert sorted(costs) == ['room_0', 'room_1']
+    # one command for the start-up time and one for each grid
+    assert len(commands) == 3
+    # the command is rendered from the ray tracing template of the recipe
+    assert commands[0][:5] == \
+        ['honeybee-radiance', 'raytrace', 'point-in-time', 'scene.oct',
+         os.path.join(os.path.dirname(commands[0][-1]), 'probe.pts')]
+    assert '-ab 1 -aa 0.2 -ad 256 -ar 16' in commands[0]
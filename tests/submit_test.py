@@ -0,0 +1,156 @@
+import email
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from pollination.leed_daylight_option_two import recipe_dict
+from tools.submit import Submitter
+
+interactors = pytest.importorskip('pollination_io.interactors')
+ApiClient = pytest.importorskip('pollination_io.api.client').ApiClient
+
+
+class _MockApi(BaseHTTPRequestHandler):
+    """A mock of the Pollination API for a single project."""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers['Content-Length']))
+
+    def do_GET(self):
+        state = self.server.state
+        url = urlparse(self.path)
+        if url.path == '/projects/ladybug/leed/artifacts':
+            folder = parse_qs(url.query)['path'][0]
+            self._send({'resources': [
+                {'key': key, 'file_type': 'file'}
+                for key in state['artifacts'] if key.rsplit('/', 1)[0] == folder
+            ]})
+        elif url.path == '/registries/pollination/recipe/leed-daylight-option-two/' \
+                'latest/json':
+            self._send(state['recipe'])
+        elif url.path.startswith('/projects/ladybug/leed/jobs/'):
+            job_id = url.path.split('/')[-1]
+            with state['lock']:
+                state['polls'][job_id] = polls = state['polls'].get(job_id, 0) + 1
+            if job_id == 'job-0' and polls == 2:
+                self._send({'detail': 'Internal Server Error'}, 500)
+                return
+            status = 'Running' if polls < 4 else 'Completed'
+            self._send({'id': job_id, 'status': {
+                'id': job_id, 'status': status, 'runs_failed': 0,
+                'started_at': '2024-01-01T00:00:00'
+            }})
+        else:
+            self._send({'detail': 'Not Found'}, 404)
+
+    def do_POST(self):
+        state = self.server.state
+        body = self._body()
+        if self.path == '/projects/ladybug/leed/artifacts':
+            key = json.loads(body)['key']
+            url = 'http://%s:%d/upload' % self.server.server_address
+            self._send({'url': url, 'fields': {'key': key}})
+        elif self.path == '/upload':
+            message = email.message_from_bytes(
+                b'Content-Type: ' + self.headers['Content-Type'].encode() +
+                b'\r\n\r\n' + body
+            )
+            parts = {
+                part.get_param('name', header='content-disposition'): part
+                for part in message.get_payload()
+            }
+            key = parts['key'].get_payload()
+            state['artifacts'][key] = parts['file'].get_payload(decode=True)
+            state['uploads'].append(key)
+            self._send({}, 204)
+        elif self.path == '/projects/ladybug/leed/recipes/filters':
+            state['recipes'].append(json.loads(body))
+            self._send({})
+        elif self.path == '/projects/ladybug/leed/jobs':
+            with state['lock']:
+                job_id = 'job-%d' % len(state['jobs'])
+                state['jobs'][job_id] = json.loads(body)
+            self._send({'id': job_id})
+        else:
+            self._send({'detail': 'Not Found'}, 404)
+
+
+def _server(recipe):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _MockApi)
+    server.state = {
+        'recipe': recipe, 'artifacts': {}, 'uploads': [], 'jobs': {}, 'polls': {},
+        'recipes': [], 'lock': threading.Lock()
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_submit_jobs(tmp_path):
+    server = _server(recipe_dict(str(tmp_path / 'recipe')))
+    host = 'http://%s:%d' % server.server_address
+    for name, content in (('model.hbjson', 'model'), ('copy.hbjson', 'model'),
+                          ('weather.wea', 'wea'), ('other.wea', 'other')):
+        (tmp_path / name).write_text(content)
+    client = ApiClient(host, 'token')
+    recipe = interactors.Recipe(
+        'pollination', 'leed-daylight-option-two', 'latest', client=client
+    )
+    submitter = Submitter(client, 'ladybug', 'leed', recipe, 4)
+    existing = submitter.artifact_key(str(tmp_path / 'other.wea'))
+    server.state['artifacts'][existing] = b'other'
+
+    runs = [
+        {'artifacts': {'model': 'model.hbjson', 'wea': 'weather.wea'}, 'inputs': {}},
+        {'artifacts': {'model': 'copy.hbjson', 'wea': 'other.wea'},
+         'inputs': {'north': 30}}
+    ]
+    try:
+        submitter.add_recipe()
+        job_ids = submitter.create_jobs([
+            ('first', runs, str(tmp_path)), ('second', runs[:1], str(tmp_path))
+        ])
+        intervals = []
+        statuses = submitter.wait(job_ids, min_interval=1, sleep=intervals.append)
+    finally:
+        submitter.close()
+        server.shutdown()
+
+    assert server.state['recipes'] == [
+        {'owner': 'pollination', 'name': 'leed-daylight-option-two', 'tag': 'latest'}
+    ]
+    # the model and its copy have the same content and the project already has the
+    # other weather file
+    assert sorted(server.state['uploads']) == sorted(submitter.uploaded)
+    assert len(submitter.uploaded) == 2
+    assert submitter.skipped == {existing}
+    assert sorted(server.state['artifacts'].values()) == [b'model', b'other', b'wea']
+
+    # the jobs are created in parallel
+    assert sorted(job_ids) == ['job-0', 'job-1']
+    job = server.state['jobs'][job_ids[0]]
+    assert job['name'] == 'first'
+    assert job['source'] == \
+        host + '/registries/pollination/recipe/leed-daylight-option-two/latest'
+    arguments = [{arg['name']: arg for arg in args} for args in job['arguments']]
+    assert arguments[1]['north']['value'] == 30
+    assert arguments[0]['model']['source']['path'] == \
+        arguments[1]['model']['source']['path']
+    assert arguments[0]['model']['source']['path'] in submitter.uploaded
+
+    assert all(status.status.value == 'Completed' for status in statuses.values())
+    # the interval grows while the status does not change
+    assert intervals == [1, 2, 4]
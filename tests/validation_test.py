@@ -1,4 +1,12 @@
+import os
+import subprocess
+import sys
+
+from pollination.leed_daylight_option_two import recipe_dict, load_recipe
+from pollination.leed_daylight_option_two._compiled import recipe_key
 from pollination.leed_daylight_option_two.entry import LeedDaylightOptionTwoEntryPoint
+from pollination.leed_daylight_option_two._post_process import \
+    LeedDaylightOptionTwoPostProcessEntryPoint
 from queenbee.recipe.dag import DAG
 
 
@@ -6,3 +14,50 @@ def test_leed_daylight_daylight_option_two():
     recipe = LeedDaylightOptionTwoEntryPoint().queenbee
     assert recipe.name == 'leed-daylight-option-two-entry-point'
     assert isinstance(recipe, DAG)
+
+
+def test_visualization_outputs():
+    outputs = {o.name: o for o in LeedDaylightOptionTwoEntryPoint().queenbee.outputs}
+    # the full visualization is still a file for the existing consumers
+    assert outputs['visualization'].type == 'DAGFileOutput'
+    assert outputs['visualization'].from_.path == 'visualization.vsf'
+    assert outputs['compact-visualization'].type == 'DAGFolderOutput'
+
+
+def test_leed_daylight_option_two_post_process():
+    dag = LeedDaylightOptionTwoPostProcessEntryPoint().queenbee
+    assert dag.name == 'leed-daylight-option-two-post-process-entry-point'
+    assert isinstance(dag, DAG)
+    assert sorted(t.name for t in dag.tasks) == [
+        'create-visualization-glare-control', 'create-visualization-no-glare-control',
+        'evaluate-credits-glare-control', 'evaluate-credits-no-glare-control'
+    ]
+    assert sorted(o.name for o in dag.outputs) == [
+        'credit-summary-glare-control', 'credit-summary-no-glare-control',
+        'glare-control', 'no-glare-control'
+    ]
+
+
+def test_post_process_package():
+    # the post-process recipe is published from the post_process folder
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.path.join(root, 'post_process'))
+    code = 'import sys, pollination.leed_daylight_option_two_post_process as m; ' \
+        'from pollination.leed_daylight_option_two._post_process import ' \
+        'LeedDaylightOptionTwoPostProcessEntryPoint as e; ' \
+        'sys.exit(m.__pollination__["entry_point"] is not e)'
+    assert subprocess.call([sys.executable, '-c', code], env=env) == 0
+
+
+def test_compiled_recipe(tmp_path):
+    folder = str(tmp_path / 'recipe')
+    recipe = recipe_dict(folder)
+    assert os.listdir(folder) == ['%s.json' % recipe_key()]
+    assert recipe_dict(folder) == recipe
+    assert load_recipe(folder).metadata.name == recipe['metadata']['name']
+
+
+def test_lazy_import():
+    code = 'import sys, pollination.leed_daylight_option_two; ' \
+        'sys.exit("pollination_dsl" in sys.modules)'
+    assert subprocess.call([sys.executable, '-c', code]) == 0
@@ -0,0 +1,129 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from honeybee.model import Model
+from honeybee.room import Room
+from honeybee_radiance.sensorgrid import SensorGrid
+
+from tools.binary import text_to_binary
+from tools.visualization import RUN_GRID_DATA, write_manifest, manifest_to_vis_set, \
+    run_folder_to_vis_set
+
+
+def _write_results(folder, grids_info, values):
+    os.makedirs(folder)
+    with open(os.path.join(folder, 'grids_info.json'), 'w') as outf:
+        json.dump(grids_info, outf)
+    with open(os.path.join(folder, 'office.res'), 'w') as outf:
+        outf.writelines('%s\n' % v for v in values)
+
+
+def _model(folder):
+    room = Room.from_box('office', 6, 4, 3)
+    grid = SensorGrid.from_mesh3d('office', room.generate_grid(1, 1, 0.8))
+    grid.room_identifier = 'office'
+    model = Model('tower', [room])
+    model.properties.radiance.sensor_grids = [grid]
+    return model.to_hbjson('model', folder)
+
+
+GRIDS_INFO = [
+    {'name': 'office', 'identifier': 'office', 'full_id': 'office', 'count': 24}
+]
+
+
+def test_manifest_to_vis_set(tmp_path):
+    model_file = _model(str(tmp_path))
+    grids_info = GRIDS_INFO
+
+    # the layout that honeybee-display expects
+    grid_data = str(tmp_path / 'visualization')
+    _write_results(os.path.join(grid_data, 'illuminance'), grids_info, range(24))
+    _write_results(os.path.join(grid_data, 'pass-fail'), grids_info, [1, 0] * 12)
+    expected = Model.from_file(model_file).to_vis_set(
+        grid_data_path=grid_data, active_grid_data='pass-fail'
+    ).to_dict()
+
+    # the results are read from their original folders
+    text_to_binary(
+        os.path.join(grid_data, 'illuminance', 'office.res'),
+        os.path.join(grid_data, 'illuminance', 'office.bin')
+    )
+    os.remove(os.path.join(grid_data, 'illuminance', 'office.res'))
+    manifest = str(tmp_path / 'run' / 'manifest.json')
+    write_manifest(
+        manifest, model_file, os.path.join(grid_data, 'pass-fail', 'grids_info.json'),
+        [
+            ('illuminance', os.path.join(grid_data, 'illuminance'), None),
+            ('pass-fail', os.path.join(grid_data, 'pass-fail'), None)
+        ], 'pass-fail'
+    )
+    output_file = str(tmp_path / 'run' / 'visualization.vsf')
+    result = manifest_to_vis_set(manifest, output_file).to_dict()
+    assert os.path.isfile(output_file)
+
+    def _sorted_data(vis_set):
+        for geo in vis_set['geometry']:
+            if geo['identifier'] == 'Grid_Data':
+                active = geo['data_sets'][geo['active_data']]
+                geo['data_sets'].sort(key=lambda d: d['data_type']['name'])
+                geo['active_data'] = geo['data_sets'].index(active)
+        return vis_set
+
+    assert _sorted_data(result) == _sorted_data(expected)
+
+
+def _run_folder(folder):
+    os.makedirs(str(folder / 'resources'))
+    os.makedirs(str(folder / 'simulation'))
+    _model(str(folder / 'simulation'))
+    with open(str(folder / 'resources' / 'grids_info.json'), 'w') as outf:
+        json.dump(GRIDS_INFO, outf)
+    for _, source in RUN_GRID_DATA:
+        _write_results(str(folder / source), GRIDS_INFO, [1, 0] * 12)
+
+
+def test_run_folder_to_vis_set(tmp_path):
+    folder = tmp_path / 'run'
+    _run_folder(folder)
+
+    vis_set = run_folder_to_vis_set(str(folder))
+    assert os.path.isfile(str(folder / 'visualization.vsf'))
+    assert os.path.isfile(str(folder / 'visualization' / 'manifest.json'))
+    grid_data = [geo for geo in vis_set.geometry if geo.identifier == 'Grid_Data'][0]
+    assert len(grid_data.data_sets) == len(RUN_GRID_DATA)
+    assert grid_data.active_data == len(RUN_GRID_DATA) - 1
+
+
+
+def test_compact_vis_set(tmp_path):
+    folder = tmp_path / 'run'
+    _run_folder(folder)
+
+    run_folder_to_vis_set(str(folder), compact=True)
+    with open(str(folder / 'compact' / 'visualization.pkl'), 'rb') as inf:
+        vis_set = pickle.load(inf)
+    # only the combined pass/fail results without the model geometry
+    assert [geo['identifier'] for geo in vis_set['geometry']] == ['Grid_Data']
+    assert len(vis_set['geometry'][0]['data_sets']) == 1
+
+
+def test_room_level_of_detail(tmp_path):
+    folder = tmp_path / 'run'
+    _run_folder(folder)
+
+    vis_set = run_folder_to_vis_set(
+        str(folder), str(tmp_path / 'rooms.vsf'), level_of_detail='room'
+    )
+    grid_data = [geo for geo in vis_set.geometry if geo.identifier == 'Grid_Data'][0]
+    # one value for the floor of the room at the height of the sensors
+    assert len(grid_data.geometry) == 1
+    assert grid_data.geometry[0].area == pytest.approx(24)
+    assert grid_data.geometry[0].center.z == pytest.approx(0.8)
+    assert grid_data.data_sets[-1].values == (0.5,)
+    run_folder_to_vis_set(str(folder))
+    assert os.path.getsize(str(tmp_path / 'rooms.vsf')) < \
+        os.path.getsize(str(folder / 'visualization.vsf'))
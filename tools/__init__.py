@@ -0,0 +1 @@
+"""Tools for running the LEED daylight option two workflow on a local machine."""
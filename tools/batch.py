@@ -0,0 +1,194 @@
+"""Run the LEED daylight option two workflow for a number of design variants.
+
+The variants are models of the same project that only differ in parts such as the
+glazing or the shading. The preprocessing that is the same for all the variants is
+only done once:
+
+* The LEED skies are created from the wea for the first variant and copied to the
+  other variants.
+* The Radiance folders, octrees and split sensor grids are shared through a
+  content-addressed cache. Variants with identical sensor grids reuse the same split
+  grids.
+* With ``--incremental`` the first model is the base model. Each variant only
+  simulates the sensor grids that are affected by its changes to the base model and
+  copies the results of the other grids from the base run. Use
+  ``--incremental-scope room`` to only simulate the grids in the changed rooms and
+  the rooms adjacent to them.
+
+Each variant is run in its own sub-folder with its own ``credit_summary.json``. The
+comparison of all the variants is written to ``comparison.csv`` and
+``batch_summary.json``::
+
+    batch/
+        base/                   run folder of the first variant
+        variant_1/              run folder of another variant
+        comparison.csv
+        batch_summary.json
+
+Usage::
+
+    python -m tools.batch base.hbjson variant_1.hbjson variant_2.hbjson \\
+        --wea weather.wea --folder ./batch
+"""
+import argparse
+import json
+import os
+import sys
+
+from .cache import ArtifactCache, DEFAULT_FOLDER
+from .incremental import SCOPES
+from .local import makedirs
+from .local.incremental import Incremental
+from .run_local import LocalRun
+
+COMPARISON_HEADER = (
+    'Variant', 'Credits', '% Passing Combined', '% Passing 9AM', '% Passing 3PM',
+    'Floor Area Passing', 'Total Floor Area', 'Sensor Count'
+)
+
+
+def variant_names(models):
+    """Get a unique name for each model based on the file name."""
+    names, used, count = [], set(), {}
+    for model in models:
+        base = name = os.path.splitext(os.path.basename(model))[0]
+        # the generated name can be the file name of another model
+        while name in used:
+            count[base] = count.get(base, 1) + 1
+            name = '%s_%d' % (base, count[base])
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def write_comparison(summaries, folder, summary_file='batch_summary.json'):
+    """Write the comparison of the variants to comparison.csv and batch_summary.json.
+
+    Args:
+        summaries: A list of tuples with the name of each variant and its credit
+            summary.
+        folder: Path to the output folder.
+        summary_file: Name of the JSON file with the credit summary of all the
+            variants.
+    """
+    with open(os.path.join(folder, 'comparison.csv'), 'w') as outf:
+        outf.write(','.join(COMPARISON_HEADER) + '\n')
+        for name, summary in summaries:
+            row = [
+                name, summary['credits'], summary['percentage_passing'],
+                summary.get('percentage_passing_9AM', ''),
+                summary.get('percentage_passing_3PM', ''),
+                summary.get('floor_area_passing', ''),
+                summary.get('total_floor_area', ''),
+                summary.get('total_sensor_count', '')
+            ]
+            outf.write(','.join(
+                '%.2f' % v if isinstance(v, float) else str(v) for v in row
+            ) + '\n')
+    with open(os.path.join(folder, summary_file), 'w') as outf:
+        json.dump(dict(summaries), outf, indent=4)
+
+
+def run_batch(
+    models, wea, folder, names=None, cache=None, incremental=False,
+    incremental_scope='model', **kwargs
+):
+    """Run the workflow for a number of design variants.
+
+    Args:
+        models: A list of paths to the Honeybee models of the variants.
+        wea: Path to an annual .wea or .epw file.
+        folder: Path to the batch folder.
+        names: Optional list of names for the variants. By default the names of
+            the model files are used.
+        cache: An optional ArtifactCache. The cache is used to share the Radiance
+            folders, octrees and split sensor grids between the variants. A cache
+            inside the batch folder is used if the cache is not provided or
+            disabled.
+        incremental: A boolean to use the first model as the base model. The other
+            variants only simulate the sensor grids that are affected by their
+            changes to the base model.
+        incremental_scope: Scope for finding the sensor grids of each variant that
+            are affected by its changes to the base model. Either model or room.
+            See tools.incremental for more information. (Default: model).
+        kwargs: Additional arguments for LocalRun.
+
+    Returns:
+        A list of tuples with the name of each variant and its credit summary.
+    """
+    folder = os.path.abspath(folder)
+    makedirs(folder)
+    names = names or variant_names(models)
+    assert len(names) == len(models), \
+        'Expected %d names but found %d.' % (len(models), len(names))
+    if cache is None or not cache.enabled:
+        cache = ArtifactCache(os.path.join(folder, '.cache'))
+    summaries, sky_folder, base_run = [], None, None
+    for name, model in zip(names, models):
+        run = LocalRun(
+            model, wea, os.path.join(folder, name), cache=cache,
+            sky_folder=sky_folder,
+            incremental=Incremental(base_run, incremental_scope) if base_run else None,
+            **kwargs
+        )
+        summaries.append((name, run.run()))
+        if sky_folder is None:
+            sky_folder = run.path('resources', 'skies')
+            if incremental:
+                base_run = run.folder
+    write_comparison(summaries, folder)
+    return summaries
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Run the LEED daylight option two workflow for design variants.'
+    )
+    parser.add_argument('models', nargs='+',
+                        help='Paths to the Honeybee models of the variants.')
+    parser.add_argument('--wea', required=True,
+                        help='Path to an annual .wea or .epw file.')
+    parser.add_argument('--folder', default='leed_daylight_option_two_batch',
+                        help='Path to the batch folder.')
+    parser.add_argument('--names', nargs='+', help='Names for the variants.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only simulate the sensor grids of each variant that '
+                        'are affected by its changes to the first model.')
+    parser.add_argument('--incremental-scope', default='model', choices=SCOPES,
+                        help='Scope for finding the sensor grids that are affected '
+                        'by the changes. Room is an approximation that only '
+                        'simulates the changed rooms and the rooms adjacent to them.')
+    parser.add_argument('--north', type=float, default=0)
+    parser.add_argument('--grid-filter', default='*')
+    parser.add_argument('--glare-control-devices', default='glare-control',
+                        choices=['glare-control', 'no-glare-control'])
+    parser.add_argument('--cpu-count', type=int, default=50)
+    parser.add_argument('--min-sensor-count', type=int, default=500)
+    parser.add_argument('--radiance-parameters', default='-ab 5 -aa 0.1 -ad 2048 -ar 64')
+    parser.add_argument('--cache-folder', default=DEFAULT_FOLDER,
+                        help='Path to the cache folder.')
+    parser.add_argument('--workers', type=int,
+                        help='Number of tasks that run in parallel.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    summaries = run_batch(
+        args.models, args.wea, args.folder, names=args.names,
+        cache=ArtifactCache(args.cache_folder), incremental=args.incremental,
+        incremental_scope=args.incremental_scope, north=args.north,
+        grid_filter=args.grid_filter,
+        glare_control_devices=args.glare_control_devices, cpu_count=args.cpu_count,
+        min_sensor_count=args.min_sensor_count,
+        radiance_parameters=args.radiance_parameters, workers=args.workers
+    )
+    for name, summary in summaries:
+        print('%s: %d credits, %.1f%% passing' % (
+            name, summary['credits'], summary['percentage_passing']
+        ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Benchmark the workflow with synthetic models of a controllable size.
+
+The synthetic models are made of box rooms with windows on all the walls. The number
+of sensors, the number of rooms and the complexity of the glazing can be set for each
+model. Each step of LocalRun is timed and the report includes the wall time, the CPU
+time and peak memory of the commands, and the number and size of the files written.
+The peak memory is None on the platforms where the resource usage of the commands is
+not available (e.g. Windows).
+
+Usage::
+
+    python -m tools.benchmark --sensor-count 10000 100000 1000000 --room-count 100 \\
+        --folder ./benchmark --output benchmark.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+from honeybee.model import Model
+from honeybee.room import Room
+from ladybug_geometry.geometry3d import Point3D
+from honeybee_radiance.sensorgrid import SensorGrid
+
+from .profile import _max_rss
+from .local import makedirs
+from .run_local import LocalRun
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+STAGES = (
+    'prepare_folder', 'create_octree', 'split_grid_folder',
+    'point_in_time_grid_ray_tracing', 'restructure_results', 'create_visualization'
+)
+DEFAULT_WEA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'samples', 'artifacts', 'Boston-Logan Intl AP_0_8759.wea'
+)
+
+
+def synthetic_model(
+    sensor_count, room_count=10, glazing_ratio=0.4, louver_count=0,
+    room_width=10, room_depth=8, room_height=3
+):
+    """Create a model with box rooms and a sensor grid in each room.
+
+    Args:
+        sensor_count: Approximate number of sensors in the model.
+        room_count: Number of rooms.
+        glazing_ratio: Ratio of the window area to the area of each wall.
+        louver_count: Number of louvers for each window. Louvers make the glazing
+            more complex to trace.
+        room_width: Width of each room in meters.
+        room_depth: Depth of each room in meters.
+        room_height: Height of each room in meters.
+
+    Returns:
+        A Honeybee Model.
+    """
+    per_row = int(math.ceil(math.sqrt(room_count)))
+    spacing = math.sqrt(room_width * room_depth * room_count / sensor_count)
+    rooms, grids = [], []
+    for i in range(room_count):
+        origin = Point3D(
+            (i % per_row) * (room_width + 2), (i // per_row) * (room_depth + 2), 0
+        )
+        room = Room.from_box(
+            'Room_%d' % i, room_width, room_depth, room_height, origin=origin
+        )
+        for face in room.faces[1:5]:
+            face.apertures_by_ratio(glazing_ratio)
+            if louver_count:
+                for aperture in face.apertures:
+                    aperture.louvers_by_count(louver_count, 0.2)
+        mesh = room.generate_grid(spacing, offset=0.8)
+        grid = SensorGrid.from_mesh3d('Room_%d' % i, mesh)
+        grid.room_identifier = room.identifier
+        rooms.append(room)
+        grids.append(grid)
+    model = Model('Benchmark_%d' % sensor_count, rooms)
+    model.properties.radiance.sensor_grids = grids
+    return model
+
+
+def folder_stats(folder):
+    """Get the number of files and their total size in bytes for a folder."""
+    count, size = 0, 0
+    for root, _, files in os.walk(folder):
+        for f in files:
+            count += 1
+            size += os.path.getsize(os.path.join(root, f))
+    return count, size
+
+
+class BenchmarkRun(LocalRun):
+    """A LocalRun that measures each stage of the workflow.
+
+    The report is available from the stages attribute after the run. Each stage has
+    the wall time in seconds, the CPU time of the commands and the Python process in
+    seconds, the peak memory of the commands in MB and the number and size of the
+    files that are written to the run folder. The stages are measured with the
+    profile of the run. See tools.profile for more information.
+    """
+
+    def __init__(self, *args, **kwargs):
+        LocalRun.__init__(self, *args, **kwargs)
+        self.stages = {}
+
+    def run_step(self, step):
+        """Run a step of the workflow and record its report in stages."""
+        if step not in STAGES:
+            LocalRun.run_step(self, step)
+            return
+        files, size = folder_stats(self.folder)
+        with self.profile.task(step, record=False) as task:
+            LocalRun.run_step(self, step)
+        end_files, end_size = folder_stats(self.folder)
+        self.stages[step] = {
+            'wall_time': task['duration'],
+            'command_count': task['command_count'],
+            'cpu_time': task['cpu_time'],
+            'peak_memory': task['peak_memory'] or None,
+            'file_count': end_files - files,
+            'file_size': end_size - size
+        }
+
+
+def benchmark(
+    folder, sensor_count, room_count=10, glazing_ratio=0.4, louver_count=0,
+    wea=DEFAULT_WEA, **kwargs
+):
+    """Run the workflow for a synthetic model and get the benchmark report.
+
+    Args:
+        folder: Path to a folder for the model and the run.
+        sensor_count: Approximate number of sensors in the model.
+        room_count: Number of rooms.
+        glazing_ratio: Ratio of the window area to the area of each wall.
+        louver_count: Number of louvers for each window.
+        wea: Path to an annual .wea or .epw file.
+        kwargs: Additional arguments for LocalRun.
+
+    Returns:
+        A dictionary with the model information and the report for each stage.
+    """
+    makedirs(folder)
+    start = time.time()
+    model = synthetic_model(sensor_count, room_count, glazing_ratio, louver_count)
+    model_file = model.to_hbjson(model.identifier, folder)
+    model_time = time.time() - start
+    grids = model.properties.radiance.sensor_grids
+    run = BenchmarkRun(model_file, wea, os.path.join(folder, 'run'), **kwargs)
+    run.run()
+    return {
+        'sensor_count': sum(g.count for g in grids),
+        'room_count': room_count,
+        'glazing_ratio': glazing_ratio,
+        'louver_count': louver_count,
+        'model_time': model_time,
+        'wall_time': sum(s['wall_time'] for s in run.stages.values()),
+        'peak_memory': _max_rss(resource.getrusage(resource.RUSAGE_SELF))
+        if resource else None,
+        'stages': run.stages
+    }
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the workflow with synthetic models.'
+    )
+    parser.add_argument('--sensor-count', type=int, nargs='+', default=[10000])
+    parser.add_argument('--room-count', type=int, default=10)
+    parser.add_argument('--glazing-ratio', type=float, default=0.4)
+    parser.add_argument('--louver-count', type=int, default=0)
+    parser.add_argument('--wea', default=DEFAULT_WEA)
+    parser.add_argument('--folder', default='benchmark',
+                        help='Path to a folder for the models and the runs.')
+    parser.add_argument('--cpu-count', type=int, default=50)
+    parser.add_argument('--radiance-parameters', default='-ab 5 -aa 0.1 -ad 2048 -ar 64')
+    parser.add_argument('--output', help='Optional path to a JSON file for the report.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    reports = []
+    for sensor_count in args.sensor_count:
+        report = benchmark(
+            os.path.join(args.folder, str(sensor_count)), sensor_count,
+            args.room_count, args.glazing_ratio, args.louver_count, args.wea,
+            cpu_count=args.cpu_count, radiance_parameters=args.radiance_parameters
+        )
+        reports.append(report)
+        print('%d sensors: %.1f s' % (report['sensor_count'], report['wall_time']))
+        for name, stage in report['stages'].items():
+            memory = '%8.1f MB' % stage['peak_memory'] \
+                if stage['peak_memory'] is not None else '%11s' % 'n/a'
+            print(
+                '    %-22s %8.1f s %s %6d files' % (
+                    name, stage['wall_time'], memory, stage['file_count']
+                )
+            )
+    if args.output:
+        with open(args.output, 'w') as outf:
+            json.dump(reports, outf, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
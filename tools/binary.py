@@ -0,0 +1,150 @@
+"""A compact binary format for the illuminance and pass/fail results.
+
+Each file has a 16 byte header followed by the data::
+
+    magic       4 bytes     b'LDR1'
+    data type   1 byte      3 for float64 values and 2 for packed bits
+    padding     3 bytes
+    count       8 bytes     number of values as an unsigned little-endian integer
+
+The float64 values are stored in little-endian order and the pass/fail values are
+packed into bits with the first value in the least significant bit of the first byte.
+The files are read with memory mapping, so the values are neither parsed nor copied
+and the pages of a file are only loaded when its values are used. The illuminance
+values keep the full precision of the text results, so a sensor at exactly 300 or
+3000 lux gets the same pass/fail result in both formats.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'LDR1'
+BITS = 2
+FLOAT64 = 3
+VALUE_SIZE = 8  # size of the float64 values in bytes
+HEADER = struct.Struct('<4sB3xQ')
+EXTENSION = 'bin'
+FORMATS = ('text', 'binary')
+
+
+class PackedBits(object):
+    """A read-only sequence of zero/one values that are packed into bits."""
+
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('PackedBits index out of range.')
+        return (self._data[index >> 3] >> (index & 7)) & 1
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield (self._data[i >> 3] >> (i & 7)) & 1
+
+
+def _write(path, data_type, count, data):
+    with open(path, 'wb') as outf:
+        outf.write(HEADER.pack(MAGIC, data_type, count))
+        outf.write(data)
+
+
+def _read_header(inf, path):
+    """Read the header of a binary result file and get the data type and count."""
+    magic, data_type, count = HEADER.unpack(inf.read(HEADER.size))
+    assert magic == MAGIC, 'Not a binary result file: %s' % path
+    return data_type, count
+
+
+def write_values(path, values):
+    """Write a list of numbers to a binary file as float64 values."""
+    data = array('d', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    _write(path, FLOAT64, len(data), data.tobytes())
+
+
+def write_pass_fail(path, values):
+    """Write a list of zero/one values to a binary file as packed bits."""
+    values = list(values)
+    data = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value:
+            data[i >> 3] |= 1 << (i & 7)
+    _write(path, BITS, len(values), bytes(data))
+
+
+def read(path):
+    """Read a binary result file with memory mapping.
+
+    The file stays mapped until the returned values are garbage collected.
+
+    Returns:
+        A read-only memoryview of float values for float64 files or a read-only
+        sequence of zero/one values for packed bits.
+    """
+    with open(path, 'rb') as inf:
+        data_type, count = _read_header(inf, path)
+        assert data_type in (FLOAT64, BITS), \
+            'Unsupported data type %d in binary result file: %s' % (data_type, path)
+        data = memoryview(mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ))
+    if data_type == BITS:
+        return PackedBits(data[HEADER.size:HEADER.size + (count + 7) // 8], count)
+    values = data[HEADER.size:HEADER.size + count * VALUE_SIZE].cast('d')
+    if sys.byteorder != 'little':
+        # the values are copied to swap the bytes on big-endian machines
+        swapped = array('d')
+        swapped.frombytes(values.tobytes())
+        swapped.byteswap()
+        values = swapped
+    return values
+
+
+def is_binary(path):
+    """Check if a file is a binary result file."""
+    with open(path, 'rb') as inf:
+        return inf.read(len(MAGIC)) == MAGIC
+
+
+def read_results(path):
+    """Read the values of a result file in either the text or the binary format."""
+    if is_binary(path):
+        return read(path)
+    with open(path) as inf:
+        return [float(line) for line in inf if line.strip()]
+
+
+def result_file(folder, name):
+    """Get the path to the result file for a sensor grid in either format.
+
+    Returns:
+        Path to the .bin file if it exists, otherwise the path to the .res file.
+    """
+    binary = os.path.join(folder, '%s.%s' % (name, EXTENSION))
+    return binary if os.path.isfile(binary) else os.path.join(folder, '%s.res' % name)
+
+
+def text_to_binary(res_file, output):
+    """Convert a text result file to a binary file with float64 values."""
+    write_values(output, read_results(res_file))
+
+
+def binary_to_text(path, output):
+    """Convert a binary result file to a text file with one value in each line."""
+    values = read(path)
+    with open(output, 'w') as outf:
+        if isinstance(values, PackedBits):
+            outf.writelines('%d\n' % v for v in values)
+        else:
+            outf.writelines('%s\n' % v for v in values)
+
@@ -0,0 +1,170 @@
+"""Content-addressed cache for the outputs of the preprocessing steps.
+
+Entries are stored under a key that is the hash of everything the output depends on
+(e.g. the model file, the sky file and the options that change the output). The cache
+is bounded in size and the least recently used entries are evicted first.
+
+The cache is for the local runs of tools.run_local. The recipe does not need it since
+Pollination reuses the outputs of the tasks with the same inputs across jobs.
+"""
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+DEFAULT_FOLDER = os.path.join(
+    os.path.expanduser('~'), '.cache', 'leed-daylight-option-two'
+)
+DEFAULT_MAX_SIZE = 10 * 1024 ** 3  # 10 GB
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_hash(path):
+    """Return the sha256 hash for the content of a file."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as inf:
+        for chunk in iter(lambda: inf.read(_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def folder_hash(folder):
+    """Return the sha256 hash for the relative paths and content of a folder."""
+    sha = hashlib.sha256()
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for f in sorted(files):
+            fp = os.path.join(root, f)
+            sha.update(os.path.relpath(fp, folder).replace(os.sep, '/').encode())
+            sha.update(file_hash(fp).encode())
+    return sha.hexdigest()
+
+
+def path_size(path):
+    """Return the size of a file or a folder in bytes."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            size += os.path.getsize(os.path.join(root, f))
+    return size
+
+
+def copy_path(src, dst):
+    """Copy a file or a folder to dst and overwrite dst if it already exists."""
+    if os.path.isdir(dst):
+        shutil.rmtree(dst)
+    elif os.path.isfile(dst):
+        os.remove(dst)
+    parent = os.path.dirname(dst)
+    if parent and not os.path.isdir(parent):
+        os.makedirs(parent)
+    if os.path.isdir(src):
+        shutil.copytree(src, dst)
+    else:
+        shutil.copyfile(src, dst)
+
+
+class ArtifactCache(object):
+    """A size-bounded, content-addressed cache for files and folders.
+
+    Args:
+        folder: Path to the cache folder. It will be created if it does not exist.
+        max_size: Maximum size of the cache in bytes. The least recently used
+            entries will be removed once the cache is larger than this value.
+        enabled: Set to False to bypass the cache. A disabled cache never returns
+            an entry and never stores one.
+    """
+    PAYLOAD = 'payload'
+
+    def __init__(self, folder=DEFAULT_FOLDER, max_size=DEFAULT_MAX_SIZE, enabled=True):
+        self.folder = os.path.abspath(folder)
+        self.max_size = max_size
+        self.enabled = enabled
+        if self.enabled and not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+    @staticmethod
+    def key(*parts):
+        """Create a cache key from a number of strings."""
+        sha = hashlib.sha256()
+        for part in parts:
+            sha.update(str(part).encode('utf-8'))
+            sha.update(b'\0')
+        return sha.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.folder, key)
+
+    def has(self, key):
+        """Check if an entry for key exists in the cache."""
+        if not self.enabled:
+            return False
+        return os.path.exists(os.path.join(self._entry(key), self.PAYLOAD))
+
+    def get(self, key, dst):
+        """Copy a cached entry to dst.
+
+        Returns:
+            True if the entry was found and copied, otherwise False.
+        """
+        if not self.has(key):
+            return False
+        entry = self._entry(key)
+        try:
+            copy_path(os.path.join(entry, self.PAYLOAD), dst)
+        except (OSError, shutil.Error):
+            # the entry was evicted by another process while copying
+            return False
+        now = time.time()
+        os.utime(entry, (now, now))
+        return True
+
+    def put(self, key, src):
+        """Add a file or a folder to the cache under key."""
+        if not self.enabled or self.has(key):
+            return
+        # copy to a temporary folder first so a partial copy is never visible
+        temp = os.path.join(self.folder, '.tmp-%s' % uuid.uuid4().hex)
+        os.makedirs(temp)
+        try:
+            copy_path(src, os.path.join(temp, self.PAYLOAD))
+            os.rename(temp, self._entry(key))
+        except OSError:
+            # another process added the same entry first
+            shutil.rmtree(temp, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """Get a list of (key, last access time, size) for all the cache entries."""
+        entries = []
+        if not os.path.isdir(self.folder):
+            return entries
+        for key in os.listdir(self.folder):
+            entry = self._entry(key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            entries.append((key, os.path.getmtime(entry), path_size(entry)))
+        return entries
+
+    @property
+    def size(self):
+        """Total size of the cache entries in bytes."""
+        return sum(entry[2] for entry in self.entries())
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits max_size."""
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        total = sum(entry[2] for entry in entries)
+        for key, _, size in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove all the entries from the cache."""
+        for key, _, _ in self.entries():
+            shutil.rmtree(self._entry(key), ignore_errors=True)
@@ -0,0 +1,338 @@
+"""Evaluate the LEED daylight credits while the ray tracing is still running.
+
+``honeybee-radiance post-process leed-illuminance`` can only run after the results for
+both skies are merged back into the original sensor grids. CreditEvaluator takes the
+results of each split sensor grid as soon as they are available, maps them back to
+the original sensor grids with the ``_redist_info.json`` file and keeps the pass/fail
+values for each sensor. A partial summary can be requested at any point and the
+final outputs are written as soon as the last result is added.
+
+The outputs are the same as the outputs of ``leed_illuminance_to_folder`` in
+honeybee-radiance. The pass/fail values of each grid are kept in a bytearray with one
+byte per sensor so that the values of a whole result file are set with one slice
+assignment, the combined values are computed with the bitwise operators of integers
+and the totals are counted in C instead of a Python loop for each sensor.
+"""
+import json
+import math
+import os
+import shutil
+from itertools import compress
+
+from honeybee.model import Model
+from honeybee.units import conversion_factor_to_meters
+
+from .binary import EXTENSION, read_results, write_pass_fail
+
+SKIES = ('9AM', '3PM')
+COMBINED = 'combined'
+# the byte for a sensor without results. the bit for it is not used by pass and fail
+UNSET = 2
+# tables to translate the pass/fail bytes to a byte for passing and evaluated sensors
+_PASSING = bytes([0, 1, 0]) + bytes(253)
+_EVALUATED = bytes([1, 1, 0]) + bytes(253)
+
+
+def credits_from_percentage(percentage):
+    """Get the number of LEED credits for the percentage of passing floor area."""
+    if percentage >= 90:
+        return 3
+    elif percentage >= 75:
+        return 2
+    elif percentage >= 55:
+        return 1
+    return 0
+
+
+def grid_areas_from_model(model_file):
+    """Get the area of each sensor in the sensor grids of a HBJSON model.
+
+    Returns:
+        A tuple with a dictionary of sensor grid full identifiers and the list of
+        sensor areas, and the conversion factor from the model units to meters.
+    """
+    model = Model.from_file(model_file)
+    areas = {}
+    for grid in model.properties.radiance.sensor_grids:
+        if grid.mesh is not None:
+            areas[grid.full_identifier] = grid.mesh.face_areas
+    return areas, conversion_factor_to_meters(model.units)
+
+
+def grid_areas(model_file, grids_info):
+    """Get the sensor areas for a list of sensor grids from a HBJSON model.
+
+    Returns:
+        A tuple with a list of sensor areas for each sensor grid or None if any of
+        the sensor grids does not have a mesh, and the conversion factor from the
+        model units to meters.
+    """
+    areas, units_conversion = grid_areas_from_model(model_file)
+    if all(g['full_id'] in areas for g in grids_info):
+        return [areas[g['full_id']] for g in grids_info], units_conversion
+    return None, units_conversion
+
+
+class CreditEvaluator(object):
+    """Evaluate the LEED daylight credits one result file at a time.
+
+    Args:
+        grids_info: List of dictionaries for the original sensor grids.
+        dist_info: Optional content of the _redist_info.json file for the split
+            sensor grids. This is required for adding the results of split grids.
+        model_file: Optional path to the HBJSON model. If all the sensor grids have
+            meshes, the area of each sensor is used to calculate the percentages.
+        glare_control: A boolean for whether the model has glare-control devices.
+        min_illuminance: The illuminance that a sensor must be above to pass.
+        max_illuminance: The illuminance that a sensor must be below to pass if the
+            model does not have glare-control devices.
+        sensor_map: Optional tools.prune.SensorMap if the split sensor grids are
+            split from pruned sensor grids. The dist_info is for the pruned grids
+            and the values are added to all the original sensors of each traced
+            sensor.
+    """
+
+    def __init__(
+        self, grids_info, dist_info=None, model_file=None, glare_control=True,
+        min_illuminance=300, max_illuminance=3000, sensor_map=None
+    ):
+        self.grids_info = grids_info
+        self.sensor_map = sensor_map
+        self.glare_control = glare_control
+        self.min_illuminance = min_illuminance
+        self.max_illuminance = max_illuminance
+        self._pass_fail = {
+            sky: {g['full_id']: bytearray([UNSET]) * g['count'] for g in grids_info}
+            for sky in SKIES
+        }
+        self._remaining = {sky: sum(g['count'] for g in grids_info) for sky in SKIES}
+
+        # map the lines of each split grid to the original grids
+        self._chunks = {}
+        for grid in dist_info or []:
+            offset = 0
+            for seg in grid['dist_info']:
+                self._chunks.setdefault(str(seg['identifier']), []).append(
+                    (grid['identifier'], seg['st_ln'], seg['end_ln'], offset)
+                )
+                offset += seg['end_ln'] - seg['st_ln'] + 1
+
+        self.areas, self.units_conversion = None, 1
+        if model_file:
+            self.areas, self.units_conversion = grid_areas(model_file, grids_info)
+
+    @property
+    def complete(self):
+        """A boolean to note if the results for all the sensors are added."""
+        return all(v == 0 for v in self._remaining.values())
+
+    def _pass_fail_values(self, values):
+        low = self.min_illuminance
+        if self.glare_control:
+            return bytes([value > low for value in values])
+        high = self.max_illuminance
+        return bytes([low < value < high for value in values])
+
+    def add_values(self, sky, full_id, values, start=0):
+        """Add illuminance values for a range of sensors in an original sensor grid.
+
+        Args:
+            sky: Either 9AM or 3PM.
+            full_id: Full identifier of the original sensor grid.
+            values: A list of illuminance values.
+            start: Index of the first sensor in the sensor grid.
+        """
+        pass_fail = self._pass_fail[sky][full_id]
+        end = start + len(values)
+        self._remaining[sky] -= pass_fail.count(UNSET, start, end)
+        pass_fail[start:end] = self._pass_fail_values(values)
+
+    def add_chunk(self, sky, name, values):
+        """Add the illuminance values for a split sensor grid.
+
+        Args:
+            sky: Either 9AM or 3PM.
+            name: Name of the split sensor grid.
+            values: A list of illuminance values for all the sensors in the split
+                sensor grid.
+        """
+        for full_id, st_ln, end_ln, offset in self._chunks[str(name)]:
+            if self.sensor_map is None:
+                self.add_values(sky, full_id, values[st_ln:end_ln + 1], offset)
+                continue
+            for i, o_id, o_index in self.sensor_map.original_sensors(
+                    full_id, offset, end_ln - st_ln + 1):
+                self.add_values(sky, o_id, [values[st_ln + i]], o_index)
+
+    def add_chunk_file(self, sky, name, res_file):
+        """Add the illuminance values for a split sensor grid from a result file."""
+        self.add_chunk(sky, name, read_results(res_file))
+
+    def add_grid_file(self, sky, full_id, res_file):
+        """Add the illuminance values for an original sensor grid from a result file."""
+        self.add_values(sky, full_id, read_results(res_file))
+
+    def _pass_fail_bytes(self, key):
+        """Get the pass/fail bytes of each sensor grid for 9AM, 3PM or combined."""
+        if key != COMBINED:
+            return [self._pass_fail[key][g['full_id']] for g in self.grids_info]
+        combined = []
+        for pf_9, pf_3 in zip(self._pass_fail_bytes('9AM'), self._pass_fail_bytes('3PM')):
+            # a sensor passes if it passes for both skies and it is unset if it is
+            # unset for either sky
+            count = len(pf_9)
+            v9, v3 = int.from_bytes(pf_9, 'big'), int.from_bytes(pf_3, 'big')
+            ones = int.from_bytes(b'\x01' * count, 'big')
+            value = ((v9 | v3) & (ones << 1)) | (v9 & v3 & ones)
+            combined.append(value.to_bytes(count, 'big'))
+        return combined
+
+    def pass_fail(self, key):
+        """Get the pass/fail values for 9AM, 3PM or combined as a list of lists.
+
+        Sensors without results are None.
+        """
+        pass_fail = []
+        for values in self._pass_fail_bytes(key):
+            if UNSET in values:
+                pass_fail.append([None if v == UNSET else v for v in values])
+            else:
+                pass_fail.append(list(values))
+        return pass_fail
+
+    def _totals(self, pass_fail):
+        """Get the passing and evaluated sensor count and area for pass/fail bytes."""
+        count_pass = count_total = 0
+        area_pass = area_total = 0
+        for i, values in enumerate(pass_fail):
+            passing = values.count(1)
+            evaluated = len(values) - values.count(UNSET)
+            count_pass += passing
+            count_total += evaluated
+            if self.areas is None:
+                area_pass += passing
+                area_total += evaluated
+                continue
+            area_pass += sum(compress(self.areas[i], values.translate(_PASSING)))
+            area_total += sum(compress(self.areas[i], values.translate(_EVALUATED)))
+        return count_pass, count_total, area_pass, area_total
+
+    def summary(self):
+        """Get a dictionary with a summary of the LEED credits.
+
+        The keys are the same as the output of leed_illuminance_to_folder. If the
+        results are not complete, the percentages are estimated from the sensors
+        that have results and the summary includes the complete and
+        percentage_evaluated keys.
+        """
+        totals = {
+            key: self._totals(self._pass_fail_bytes(key)) for key in (COMBINED,) + SKIES
+        }
+        summary = {
+            'sensor_count_passing': totals[COMBINED][0],
+            'sensor_count_passing_9AM': totals['9AM'][0],
+            'sensor_count_passing_3PM': totals['3PM'][0],
+            'total_sensor_count': sum(g['count'] for g in self.grids_info)
+        }
+
+        if self.areas is not None:
+            summary['floor_area_passing'] = totals[COMBINED][2]
+            summary['floor_area_passing_9AM'] = totals['9AM'][2]
+            summary['floor_area_passing_3PM'] = totals['3PM'][2]
+            summary['total_floor_area'] = sum(sum(sar) for sar in self.areas)
+            index = 2
+        else:
+            index = 0
+
+        def _percentage(key):
+            passing, total = totals[key][index], totals[key][index + 1]
+            return (passing / total) * 100 if total else 0
+
+        summary['percentage_passing'] = _percentage(COMBINED)
+        summary['percentage_passing_9AM'] = _percentage('9AM')
+        summary['percentage_passing_3PM'] = _percentage('3PM')
+        summary['credits'] = credits_from_percentage(summary['percentage_passing'])
+        if not self.complete:
+            summary['complete'] = False
+            summary['percentage_evaluated'] = \
+                100 * totals[COMBINED][1] / (summary['total_sensor_count'] or 1)
+        return summary
+
+    def write_results(self, folder, grids_info_file=None, binary=False):
+        """Write the pass/fail files for each sensor grid and space_summary.csv.
+
+        Args:
+            folder: Path to the output folder. The pass/fail files are written to the
+                combined, 9AM and 3PM sub-folders.
+            grids_info_file: Optional path to a grids_info.json file to copy to the
+                sub-folders. By default the grids_info of the evaluator is written.
+            binary: A boolean to write the pass/fail values as packed bits in the
+                binary format of tools.binary instead of text files.
+        """
+        assert self.complete, 'The results for all the sensors must be added first.'
+        pass_fails = {key: self.pass_fail(key) for key in (COMBINED,) + SKIES}
+        for key, pass_fail in pass_fails.items():
+            sub_folder = os.path.join(folder, key)
+            if not os.path.isdir(sub_folder):
+                os.makedirs(sub_folder)
+            info_file = os.path.join(sub_folder, 'grids_info.json')
+            if grids_info_file:
+                shutil.copyfile(grids_info_file, info_file)
+            else:
+                with open(info_file, 'w') as outf:
+                    json.dump(self.grids_info, outf)
+            for grid, values in zip(self.grids_info, pass_fail):
+                if binary:
+                    write_pass_fail(os.path.join(
+                        sub_folder, '%s.%s' % (grid['full_id'], EXTENSION)
+                    ), values)
+                    continue
+                res_file = os.path.join(sub_folder, '%s.res' % grid['full_id'])
+                with open(res_file, 'w') as outf:
+                    outf.writelines('%d\n' % v for v in values)
+        self._write_space_summary(
+            os.path.join(folder, 'space_summary.csv'), pass_fails
+        )
+
+    def write_space_summary(self, folder):
+        """Only write space_summary.csv without the pass/fail files.
+
+        Args:
+            folder: Path to the output folder.
+        """
+        assert self.complete, 'The results for all the sensors must be added first.'
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        self._write_space_summary(
+            os.path.join(folder, 'space_summary.csv'),
+            {key: self.pass_fail(key) for key in (COMBINED,) + SKIES}
+        )
+
+    def _write_space_summary(self, output_file, pass_fails):
+        """Write a CSV with the percentage of passing area for each space."""
+        csv_data = [['Space Name', 'Sensor Count']]
+        if self.areas is not None:
+            csv_data[0].extend(['Area (m2)', 'Area (ft2)', 'Spacing (m)'])
+        csv_data[0].extend(['% Passing 9AM', '% Passing 3PM', '% Passing Combined'])
+
+        keys = ('9AM', '3PM', COMBINED)
+        for i, grid in enumerate(self.grids_info):
+            csv_row = [grid['name'], grid['count']]
+            grid_pf = [pass_fails[key][i] for key in keys]
+            if self.areas is not None:
+                grid_areas = self.areas[i]
+                total_a = sum(grid_areas)
+                csv_row.append(round(total_a * self.units_conversion, 3))
+                csv_row.append(round(csv_row[2] / 0.305, 3))
+                csv_row.append(round(math.sqrt(csv_row[2] / csv_row[1]), 3))
+                for pf in grid_pf:
+                    area_pass = sum(a for v, a in zip(pf, grid_areas) if v == 1)
+                    csv_row.append(round(100 * (area_pass / total_a), 2))
+            else:
+                for pf in grid_pf:
+                    csv_row.append(round(100 * (sum(pf) / grid['count']), 2))
+            csv_data.append(csv_row)
+
+        with open(output_file, 'w') as outf:
+            for row in csv_data:
+                outf.write(','.join((str(v) for v in row)) + '\n')
@@ -0,0 +1,99 @@
+"""Stop the ray tracing once the number of LEED credits can no longer change.
+
+The credits only depend on the percentage of the floor area that passes. Tracing the
+sensors in a stratified random order makes every batch of results a representative
+sample of the whole model. After each batch, the percentage of passing area is
+estimated with a confidence interval and the tracing stops once the lower and the
+upper bounds of the interval give the same number of credits.
+
+The interval is a Wilson score interval for the passing fraction of the sensors that
+are not traced yet with a finite population correction. When the sensors have
+different areas the effective sample size of the weighted sample is used.
+"""
+import math
+import random
+from statistics import NormalDist
+
+from .credits import COMBINED, credits_from_percentage
+
+MODES = ('stop', 'low-precision')
+
+
+def stratified_order(grids_info, seed=0):
+    """Get a stratified random order for tracing the sensors of all the grids.
+
+    The sensors of each grid are shuffled and the grids are interleaved based on
+    their sensor count. Any number of sensors from the start of the order is a
+    random sample of each grid in proportion to its size.
+
+    Args:
+        grids_info: List of dictionaries for the sensor grids.
+        seed: Seed for the random number generator.
+
+    Returns:
+        A list of tuples with the full_id of the sensor grid and the index of the
+        sensor in the grid.
+    """
+    rnd = random.Random(seed)
+    keys = []
+    for grid in grids_info:
+        count = grid['count']
+        indices = list(range(count))
+        rnd.shuffle(indices)
+        for pos, index in enumerate(indices):
+            keys.append(((pos + rnd.random()) / count, grid['full_id'], index))
+    keys.sort()
+    return [(full_id, index) for _, full_id, index in keys]
+
+
+def passing_bounds(evaluator, confidence=0.95):
+    """Estimate the percentage of passing area from the results that are added so far.
+
+    Args:
+        evaluator: A CreditEvaluator with the results for some of the sensors.
+        confidence: Confidence level for the bounds.
+
+    Returns:
+        A tuple with the estimated percentage of passing area and the lower and
+        upper bounds for it.
+    """
+    pass_fail = evaluator.pass_fail(COMBINED)
+    areas = evaluator.areas or [[1] * len(pf) for pf in pass_fail]
+    pass_area = sampled_area = total_area = sum_squares = 0
+    for p_fails, g_areas in zip(pass_fail, areas):
+        for pf, area in zip(p_fails, g_areas):
+            total_area += area
+            if pf is None:
+                continue
+            sampled_area += area
+            sum_squares += area ** 2
+            if pf == 1:
+                pass_area += area
+    if not sampled_area:
+        return 0, 0, 100
+    remaining_area = total_area - sampled_area
+
+    ratio = pass_area / sampled_area
+    sample_size = sampled_area ** 2 / sum_squares
+    population = sample_size * total_area / sampled_area
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    fpc = math.sqrt(max(population - sample_size, 0) / max(population - 1, 1))
+    denominator = 1 + z ** 2 / sample_size
+    center = (ratio + z ** 2 / (2 * sample_size)) / denominator
+    half_width = z * math.sqrt(
+        ratio * (1 - ratio) / sample_size + z ** 2 / (4 * sample_size ** 2)
+    ) / denominator * fpc
+
+    def _percentage(passing_ratio):
+        return 100 * (pass_area + remaining_area * passing_ratio) / total_area
+
+    return (
+        _percentage(ratio),
+        _percentage(max(0, center - half_width)),
+        _percentage(min(1, center + half_width))
+    )
+
+
+def credits_decided(lower, upper):
+    """Check if the lower and the upper bound give the same number of credits."""
+    return credits_from_percentage(lower) == credits_from_percentage(upper)
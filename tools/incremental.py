@@ -0,0 +1,151 @@
+"""Find the sensor grids that have to be simulated again after a model change.
+
+Each run writes a ``resources/run_info.json`` file with fingerprints for the sensor
+grids, the rooms and the rest of the model. Comparing these fingerprints with the ones
+from a previous run gives the list of grids whose results can be reused.
+
+Two scopes are supported:
+
+    * model: Any change to the geometry or the modifiers invalidates all the grids.
+        Only the grids that are new or have different sensors are simulated again.
+    * room: A change to a room only invalidates the grids in that room and the grids
+        in the rooms that are adjacent to it. Changes to anything outside of the
+        rooms (e.g. orphaned shades or modifiers) still invalidate all the grids.
+
+The model scope is the default. The room scope ignores light that is inter-reflected
+between rooms that are not adjacent, which can change the results of the grids that
+are reused, and it should only be used when this is acceptable for the study. A
+warning is raised every time it is used.
+"""
+import hashlib
+import json
+import os
+import warnings
+
+SCOPES = ('model', 'room')
+
+
+def _hash(obj):
+    """Get a stable hash for a JSON-serializable object."""
+    content = json.dumps(obj, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _adjacent_rooms(room):
+    """Get the identifiers of the rooms that share a Surface boundary with a room."""
+    adjacent = set()
+    for face in room.get('faces', []):
+        bc = face.get('boundary_condition', {})
+        if bc.get('type') == 'Surface':
+            adjacent.add(bc['boundary_condition_objects'][-1])
+    return adjacent
+
+
+def model_fingerprints(model_file):
+    """Get the fingerprints for the grids, the rooms and the rest of a HBJSON model.
+
+    Returns:
+        A dictionary with the following keys.
+
+        * grids: A dictionary of sensor grid identifiers and a dictionary with the
+            hash of the sensors and the identifier of the host room.
+        * rooms: A dictionary of room identifiers and a dictionary with the hash of
+            the room and the identifiers of the adjacent rooms.
+        * context: A hash for everything in the model other than the rooms and the
+            sensor grids.
+    """
+    with open(model_file) as inf:
+        model = json.load(inf)
+
+    grids = {}
+    radiance = model.get('properties', {}).get('radiance', {})
+    for grid in radiance.get('sensor_grids', []):
+        grids[grid['identifier']] = {
+            'hash': _hash(grid['sensors']),
+            'room': grid.get('room_identifier')
+        }
+
+    rooms = {}
+    for room in model.get('rooms', []):
+        rooms[room['identifier']] = {
+            'hash': _hash(room),
+            'adjacent': sorted(_adjacent_rooms(room))
+        }
+
+    context = {
+        k: v for k, v in model.items()
+        if k not in ('rooms', 'properties', 'display_name', 'identifier')
+    }
+    context['properties'] = dict(model.get('properties', {}))
+    context['properties']['radiance'] = {
+        k: v for k, v in radiance.items() if k not in ('sensor_grids', 'views')
+    }
+
+    return {'grids': grids, 'rooms': rooms, 'context': _hash(context)}
+
+
+def changed_grids(current, previous, scope='model'):
+    """Get the identifiers of the sensor grids that must be simulated again.
+
+    Args:
+        current: A dictionary of run information for the current run.
+        previous: A dictionary of run information for the previous run. The run
+            information includes the output of model_fingerprints under a
+            fingerprints key and a settings key for any other value that affects
+            all the results (e.g. sky files and radiance parameters).
+        scope: Either model or room. The room scope is an approximation. See the
+            module docstring for details. (Default: model).
+
+    Returns:
+        A sorted list of sensor grid identifiers.
+    """
+    assert scope in SCOPES, 'Invalid scope: %s. Choose from %s' % (scope, SCOPES)
+    if scope == 'room':
+        warnings.warn(
+            'The room scope ignores the light that is inter-reflected between the '
+            'rooms that are not adjacent. The results of the reused sensor grids '
+            'can differ from a full run.'
+        )
+    cur_fp, prev_fp = current['fingerprints'], previous['fingerprints']
+    cur_grids, prev_grids = cur_fp['grids'], prev_fp['grids']
+    all_grids = sorted(cur_grids)
+
+    if current.get('settings') != previous.get('settings') or \
+            cur_fp['context'] != prev_fp['context']:
+        return all_grids
+
+    changed_rooms = set()
+    for room_id in set(cur_fp['rooms']) | set(prev_fp['rooms']):
+        cur_room = cur_fp['rooms'].get(room_id)
+        prev_room = prev_fp['rooms'].get(room_id)
+        if cur_room is None or prev_room is None or \
+                cur_room['hash'] != prev_room['hash']:
+            changed_rooms.add(room_id)
+    if changed_rooms and scope == 'model':
+        return all_grids
+
+    # light reaches the rooms next to a changed room through the interior apertures
+    affected_rooms = set(changed_rooms)
+    for room_id in changed_rooms:
+        for fp in (cur_fp, prev_fp):
+            affected_rooms.update(fp['rooms'].get(room_id, {}).get('adjacent', []))
+
+    changed = []
+    for grid_id, grid in cur_grids.items():
+        prev_grid = prev_grids.get(grid_id)
+        if prev_grid is None or prev_grid['hash'] != grid['hash'] or \
+                grid['room'] in affected_rooms:
+            changed.append(grid_id)
+        elif grid['room'] is None and changed_rooms:
+            # the grid is not assigned to a room. we can't tell what affects it
+            changed.append(grid_id)
+    return sorted(changed)
+
+
+def load_run_info(folder):
+    """Load the run information from a run folder if it exists."""
+    info_file = os.path.join(folder, 'resources', 'run_info.json')
+    if not os.path.isfile(info_file):
+        return None
+    with open(info_file) as inf:
+        return json.load(inf)
@@ -0,0 +1,23 @@
+"""Steps and features of the local runner of tools.run_local.
+
+Each module has the code for one step of the workflow or one feature of the local
+runner. The steps and the features take the LocalRun as their first argument for the
+paths of the run folder, the inputs of the recipe and the helpers to run the commands
+of the recipe in parallel.
+"""
+import os
+
+SKIES = ('9AM', '3PM')
+# radiance parameters for the low-precision passes of the early stop and progressive
+LOW_PRECISION_PARAMETERS = '-ab 2 -aa 0.25 -ad 512 -ar 16'
+
+
+def makedirs(folder):
+    """Create a folder and its parents if they do not exist."""
+    if not os.path.isdir(folder):
+        try:
+            os.makedirs(folder)
+        except OSError:
+            # the folder can be created by another worker at the same time
+            if not os.path.isdir(folder):
+                raise
@@ -0,0 +1,45 @@
+"""Share the ambient values of the indirect calculation between ray tracing tasks.
+
+The ray tracing tasks of each sky share one ambient file with the ``-af`` option of
+rtrace, which locks the file while it adds new ambient values. The ambient values
+depend on the sky so each sky has its own ambient file. The ambient files are stored
+in the cache for the runs with the same octree and radiance parameters. Sharing the
+ambient values changes the results slightly within the accuracy of ``-aa``.
+
+This is local only. The RayTracingPointInTime tasks of the recipe run in separate
+containers and have no shared file for rtrace to lock, so they can not share the
+ambient values.
+"""
+import os
+
+from ..cache import ArtifactCache
+from ..skies import honeybee_radiance_version
+from . import SKIES
+from .octree import octree_key
+
+
+class AmbientCache(object):
+    """Share and cache an ambient file for the ray tracing tasks of each sky."""
+
+    def key(self, run, sky):
+        """Cache key for the ambient file of a sky."""
+        return ArtifactCache.key(
+            'ambient', honeybee_radiance_version(), octree_key(run, sky),
+            run.radiance_parameters
+        )
+
+    def ambient_file(self, run, sky):
+        """Path to the shared ambient file of a sky."""
+        return os.path.join(run.simulation_folder, sky, 'resources', 'ambient.amb')
+
+    def load(self, run):
+        """Copy the cached ambient files of previous runs with the same octrees."""
+        for sky in SKIES:
+            run.cache.get(self.key(run, sky), self.ambient_file(run, sky))
+
+    def store(self, run):
+        """Add the ambient files of a run to the cache."""
+        for sky in SKIES:
+            ambient_file = self.ambient_file(run, sky)
+            if os.path.isfile(ambient_file):
+                run.cache.put(self.key(run, sky), ambient_file)
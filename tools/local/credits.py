@@ -0,0 +1,74 @@
+"""Evaluate the LEED credits of a local run while the ray tracing is still running.
+
+The results of each split sensor grid are added to a CreditEvaluator of tools.credits
+as soon as they are ready. ``credit_estimate.json`` has a partial estimate until the
+results for all the sensors are added, and the pass/fail results, space_summary.csv
+and credit_summary.json are written right after the last task finishes.
+
+This is local only. The recipe evaluates the credits with LeedIlluminanceCredits after
+the results of both skies are merged back into the original sensor grids, since a DSL
+task can only start once the loops that it needs are finished.
+"""
+import json
+import os
+
+from ..credits import CreditEvaluator
+from .split import dist_info
+
+
+def credit_evaluator(run, grids, sensor_map=None):
+    """Get a CreditEvaluator for the results of a run.
+
+    The results for the sensor grids that are not simulated are added from the
+    previous run.
+
+    Args:
+        run: A LocalRun.
+        grids: A list of full_id for the sensor grids that are simulated.
+        sensor_map: An optional SensorMap if the split sensor grids are split from
+            pruned sensor grids.
+    """
+    # the early stop mode adds the results of the original sensor grids
+    split_info = dist_info(run) if grids and not run.early_stop else None
+    evaluator = CreditEvaluator(
+        run.grids_info, split_info, run.model,
+        run.glare_control_devices == 'glare-control',
+        sensor_map=sensor_map if split_info else None
+    )
+    if run.incremental:
+        run.incremental.add_results(run, evaluator, grids)
+    return evaluator
+
+
+def update_credits(run, evaluator, info=None):
+    """Write the LEED credits for the results that are added to the evaluator.
+
+    A partial estimate is written to credit_estimate.json until the results for all
+    the sensors are added. The pass/fail results, space_summary.csv and
+    credit_summary.json are written once the results are complete. Only
+    space_summary.csv and credit_summary.json are written in the summary-only mode.
+
+    Args:
+        run: A LocalRun.
+        evaluator: A CreditEvaluator.
+        info: Optional dictionary of additional information to add to the summary.
+    """
+    summary = evaluator.summary()
+    summary.update(info or {})
+    estimate_file = run.path('credit_estimate.json')
+    if not evaluator.complete:
+        with open(estimate_file, 'w') as outf:
+            json.dump(summary, outf, indent=4)
+        return
+    with run.profile.task('evaluate_credits'):
+        if run.outputs.summary_only:
+            evaluator.write_space_summary(run.path('results'))
+        else:
+            evaluator.write_results(
+                run.path('results'), run.path('resources', 'grids_info.json'),
+                run.outputs.binary
+            )
+    with open(run.path('credit_summary.json'), 'w') as outf:
+        outf.write(json.dumps(summary, indent=4))
+    if os.path.isfile(estimate_file):
+        os.remove(estimate_file)
@@ -0,0 +1,60 @@
+"""Trace the coincident sensors of overlapping sensor grids only once.
+
+The sensor grids are pruned with tools.prune before they are split. The pruned sensor
+grids are written to ``simulation/resources/grid_pruned`` and the map from the
+original sensors to the traced sensors to ``simulation/resources/sensor_map.json``.
+The results are expanded back to the original sensor grids after they are merged, so
+the credits and the visualization use the original sensor grids.
+
+This is local only. The recipe splits and traces the sensor grids of the Radiance
+folder as they are, since the plugins have no template to prune the sensors or to
+expand the results.
+"""
+import os
+
+from ..prune import SensorMap, prune_sensors
+
+
+class Dedupe(object):
+    """Collapse the sensors with the same direction that are closer than a tolerance.
+
+    Args:
+        tolerance: Distance in model units to collapse the sensors into one traced
+            sensor.
+    """
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+
+    def grid_folder(self, run):
+        """Path to the pruned sensor grids of a run."""
+        return os.path.join(run.simulation_folder, 'resources', 'grid_pruned')
+
+    def sensor_map(self, run):
+        """Load the SensorMap of the pruned sensor grids of a run."""
+        return SensorMap.from_file(
+            os.path.join(run.simulation_folder, 'resources', 'sensor_map.json')
+        )
+
+    def prune(self, run, grids=None):
+        """Prune the sensor grids of a run and write the sensor map.
+
+        Args:
+            run: A LocalRun.
+            grids: An optional list of full_id for the sensor grids to be pruned. By
+                default all the sensor grids will be pruned.
+
+        Returns:
+            The SensorMap of the pruned sensor grids.
+        """
+        grids_info = run.grids_info
+        if grids is not None:
+            grids_info = [g for g in grids_info if g['full_id'] in set(grids)]
+        sensor_map = prune_sensors(
+            run.path('model', 'grid'), grids_info, self.grid_folder(run),
+            self.tolerance
+        )
+        sensor_map.to_file(
+            os.path.join(run.simulation_folder, 'resources', 'sensor_map.json')
+        )
+        return sensor_map
@@ -0,0 +1,175 @@
+"""Trace the sensors of a local run in batches until the number of credits is decided.
+
+The sensors of the original sensor grids are traced in a stratified random order
+instead of the split sensor grids. Each batch is split between the workers for each
+sky. See tools.early_stop for the confidence bounds.
+
+This is local only. The recipe traces every split sensor grid with
+RayTracingPointInTime and evaluates the credits once all the results are merged, so
+it has no point where it could stop tracing.
+"""
+import json
+import os
+
+from .. import binary
+from ..credits import credits_from_percentage
+from ..early_stop import MODES, stratified_order, passing_bounds, credits_decided
+from . import SKIES, LOW_PRECISION_PARAMETERS, makedirs
+from .credits import update_credits
+from .octree import octree_file
+from .tracing import ambient_file, raytrace
+
+
+class EarlyStop(object):
+    """Stop tracing once the number of credits is decided.
+
+    Args:
+        mode: Either stop or low-precision. Stop only writes the credit summary.
+            Low-precision traces the rest of the sensors with the
+            low_precision_parameters to create the full results.
+        confidence: Confidence level for deciding the number of credits.
+        batch_size: Number of sensors that are traced before checking if the number
+            of credits is decided. By default 5% of the sensors (minimum 100).
+        low_precision_parameters: Radiance parameters for the sensors that are
+            traced after the number of credits is decided in the low-precision mode.
+    """
+
+    def __init__(
+        self, mode='stop', confidence=0.95, batch_size=None,
+        low_precision_parameters=LOW_PRECISION_PARAMETERS
+    ):
+        assert mode in MODES, \
+            'Invalid early stop mode: %s. Choose from %s' % (mode, MODES)
+        self.mode = mode
+        self.confidence = confidence
+        self.batch_size = batch_size
+        self.low_precision_parameters = low_precision_parameters
+
+    def trace_sensors(
+        self, run, sensors, name, radiance_parameters, evaluator, results, lines
+    ):
+        """Trace a list of sensors for each sky and add the results to the evaluator.
+
+        Args:
+            run: A LocalRun.
+            sensors: A list of tuples with the full_id of the sensor grid and the
+                index of the sensor.
+            name: Name prefix for the sensor and result files of the batch.
+            radiance_parameters: The radiance parameters for ray tracing.
+            evaluator: A CreditEvaluator.
+            results: A dictionary of skies, full_id and the list of result lines for
+                each sensor. The results of the sensors are added to this dictionary.
+            lines: A dictionary of full_id and the list of lines of the sensors of
+                each sensor grid.
+        """
+        folder = os.path.join(run.simulation_folder, 'early_stop')
+        makedirs(folder)
+        # split the batch so each worker traces a part of it for each sky
+        chunk_count = max(1, min(run.workers, len(sensors)))
+        size = -(-len(sensors) // chunk_count)
+        chunks = [sensors[i:i + size] for i in range(0, len(sensors), size)]
+        for i, chunk in enumerate(chunks):
+            with open(os.path.join(folder, '%s_%d.pts' % (name, i)), 'w') as outf:
+                for full_id, index in chunk:
+                    outf.write(lines[full_id][index])
+
+        def _trace(job):
+            sky, i = job
+            sensor_file = os.path.join(folder, '%s_%d.pts' % (name, i))
+            res_file = os.path.join(folder, '%s_%d_%s.res' % (name, i, sky))
+            # the ambient values of the low-precision parameters are not shared
+            ambient = ambient_file(run, sky) \
+                if radiance_parameters == run.radiance_parameters else None
+            with run.profile.task(
+                'point_in_time_grid_ray_tracing', sky=sky, grid='%s_%d' % (name, i),
+                sensor_count=len(chunks[i])
+            ):
+                raytrace(
+                    run, octree_file(run, sky), sensor_file, res_file,
+                    radiance_parameters, folder, ambient
+                )
+            with open(res_file) as inf:
+                return [line for line in inf if line.strip()]
+
+        jobs = [(sky, i) for sky in SKIES for i in range(len(chunks))]
+        for (sky, i), res_lines in run.run_parallel(_trace, jobs):
+            for (full_id, index), line in zip(chunks[i], res_lines):
+                results[sky][full_id][index] = line
+                evaluator.add_values(sky, full_id, [float(line)], index)
+
+    def trace(self, run, evaluator, grids):
+        """Trace the sensors of a run in batches until the number of credits is decided.
+
+        Args:
+            run: A LocalRun.
+            evaluator: A CreditEvaluator.
+            grids: A list of full_id for the sensor grids that are simulated.
+
+        Returns:
+            True if the results for all the sensors are created. This is always the
+            case for the low-precision mode.
+        """
+        grids_info = [g for g in run.grids_info if g['full_id'] in set(grids)]
+        lines = {}
+        for grid in grids_info:
+            with open(run.path('model', 'grid', '%s.pts' % grid['full_id'])) as inf:
+                lines[grid['full_id']] = [line for line in inf if line.strip()]
+        results = {
+            sky: {g['full_id']: [None] * g['count'] for g in grids_info}
+            for sky in SKIES
+        }
+        order = stratified_order(grids_info)
+        batch_size = self.batch_size or max(100, len(order) // 20)
+        traced = 0
+        while traced < len(order):
+            self.trace_sensors(
+                run, order[traced:traced + batch_size],
+                'batch_%d' % (traced // batch_size), run.radiance_parameters,
+                evaluator, results, lines
+            )
+            traced += batch_size
+            estimate, lower, upper = passing_bounds(evaluator, self.confidence)
+            info = {'early_stop': {
+                'sensor_count_traced': min(traced, len(order)),
+                'percentage_passing_lower': lower,
+                'percentage_passing_upper': upper,
+                'confidence': self.confidence
+            }}
+            if evaluator.complete or credits_decided(lower, upper):
+                break
+            update_credits(run, evaluator, info)
+
+        remaining = order[traced:]
+        if remaining and self.mode == 'stop':
+            summary = evaluator.summary()
+            summary.update(info)
+            summary['percentage_passing'] = estimate
+            summary['credits'] = credits_from_percentage(lower)
+            with open(run.path('credit_summary.json'), 'w') as outf:
+                outf.write(json.dumps(summary, indent=4))
+            estimate_file = run.path('credit_estimate.json')
+            if os.path.isfile(estimate_file):
+                os.remove(estimate_file)
+            return False
+
+        if remaining:
+            info['early_stop']['low_precision_parameters'] = \
+                self.low_precision_parameters
+            self.trace_sensors(
+                run, remaining, 'remaining', self.low_precision_parameters, evaluator,
+                results, lines
+            )
+        for sky in SKIES:
+            folder = os.path.join(run.simulation_folder, sky, 'results')
+            makedirs(folder)
+            for full_id, res_lines in results[sky].items():
+                if run.outputs.binary:
+                    binary.write_values(
+                        os.path.join(folder, '%s.%s' % (full_id, binary.EXTENSION)),
+                        [float(line) for line in res_lines]
+                    )
+                    continue
+                with open(os.path.join(folder, '%s.res' % full_id), 'w') as outf:
+                    outf.writelines(res_lines)
+        update_credits(run, evaluator, info if remaining else None)
+        return True
@@ -0,0 +1,114 @@
+"""Only simulate the sensor grids that are affected by the changes since a previous run.
+
+Each run writes the fingerprints of its inputs to ``resources/run_info.json``. A run
+with a previous run of the same project only traces the sensor grids that are affected
+by the changes and copies the results of the other grids from the previous run before
+the credits are evaluated. See tools.incremental for the scopes of the comparison.
+"""
+import json
+import os
+
+from .. import binary
+from ..cache import file_hash, copy_path
+from ..incremental import model_fingerprints, changed_grids, load_run_info
+from ..skies import honeybee_radiance_version
+from . import SKIES, makedirs
+
+
+def write_run_info(run):
+    """Write the fingerprints of the inputs of a run to resources/run_info.json."""
+    info = {
+        'fingerprints': model_fingerprints(run.model),
+        'settings': {
+            'radiance_parameters': run.radiance_parameters,
+            'honeybee_radiance': honeybee_radiance_version(),
+            'skies': {
+                sky: file_hash(run.path('resources', 'skies', '%s.sky' % sky))
+                for sky in SKIES
+            }
+        }
+    }
+    with open(run.path('resources', 'run_info.json'), 'w') as outf:
+        json.dump(info, outf)
+
+
+class Incremental(object):
+    """Reuse the results of a previous run for the sensor grids that did not change.
+
+    Args:
+        previous_run: Path to the folder of a previous run of the same project.
+        scope: Scope for finding the sensor grids that are affected by a change to
+            the model. Either model or room. The room scope is an approximation and
+            raises a warning. See tools.incremental for more information.
+            (Default: model).
+    """
+
+    def __init__(self, previous_run, scope='model'):
+        self.previous_run = os.path.abspath(previous_run)
+        self.scope = scope
+
+    def results_folder(self, sky):
+        """Path to the illuminance results of a sky in the previous run."""
+        return os.path.join(self.previous_run, 'simulation', sky, 'results')
+
+    def grids_to_simulate(self, run):
+        """Get the full_id of the sensor grids of a run that should be simulated."""
+        grids_info = run.grids_info
+        previous = load_run_info(self.previous_run)
+        if previous is None:
+            return [grid['full_id'] for grid in grids_info]
+        current = load_run_info(run.folder)
+        changed = set(changed_grids(current, previous, self.scope))
+        return [
+            grid['full_id'] for grid in grids_info
+            if grid['identifier'] in changed or not all(
+                os.path.isfile(
+                    binary.result_file(self.results_folder(sky), grid['full_id'])
+                ) for sky in SKIES
+            )
+        ]
+
+    def add_results(self, run, evaluator, grids):
+        """Add the results of the grids that are not simulated to a CreditEvaluator.
+
+        Args:
+            run: A LocalRun.
+            evaluator: A CreditEvaluator.
+            grids: A list of full_id for the sensor grids that are simulated.
+        """
+        simulated = set(grids)
+        for grid in run.grids_info:
+            if grid['full_id'] in simulated:
+                continue
+            for sky in SKIES:
+                evaluator.add_grid_file(sky, grid['full_id'], binary.result_file(
+                    self.results_folder(sky), grid['full_id']
+                ))
+
+    def reuse_results(self, run, grids):
+        """Copy the results of the grids that were not simulated to a run.
+
+        Args:
+            run: A LocalRun.
+            grids: A list of full_id for the sensor grids that were simulated.
+        """
+        simulated = set(grids)
+        for sky in SKIES:
+            results = os.path.join(run.simulation_folder, sky, 'results')
+            for grid in run.grids_info:
+                if grid['full_id'] in simulated:
+                    continue
+                src = binary.result_file(self.results_folder(sky), grid['full_id'])
+                if run.outputs.binary == src.endswith('.res'):
+                    # the previous run used the other format
+                    makedirs(results)
+                    if run.outputs.binary:
+                        binary.text_to_binary(src, os.path.join(
+                            results, '%s.%s' % (grid['full_id'], binary.EXTENSION)
+                        ))
+                    else:
+                        binary.binary_to_text(src, os.path.join(
+                            results, '%s.res' % grid['full_id']
+                        ))
+                    continue
+                copy_path(src, os.path.join(results, os.path.basename(src)))
@@ -0,0 +1,81 @@
+"""Create the octree of each sky from one frozen octree of the scene.
+
+The scene is the same for both skies, so a local run compiles it once into a frozen
+octree without a sky and adds each sky to a copy of it with ``oconv -i``. The sky only
+has light sources so adding it does not rebuild the octree of the scene. The octrees
+are reused from the cache when the same model is submitted again.
+
+This is local only. The recipe still compiles an octree for each sky with
+CreateOctreeWithSkyStatic, because the plugins have no template to add a sky to an
+existing octree.
+"""
+import os
+
+from ..cache import ArtifactCache, file_hash
+from ..skies import honeybee_radiance_version
+from . import SKIES, makedirs
+from .prepare import rad_folder_key
+
+
+def octree_file(run, sky):
+    """Path to the octree of the scene and a sky."""
+    return os.path.join(run.simulation_folder, sky, 'resources', 'scene.oct')
+
+
+def static_octree_file(run):
+    """Path to the frozen octree of the scene without a sky."""
+    return os.path.join(run.simulation_folder, 'resources', 'scene_static.oct')
+
+
+def static_octree_key(run):
+    """Cache key for the octree of the scene without a sky."""
+    return ArtifactCache.key(
+        'octree-static', honeybee_radiance_version(), rad_folder_key(run)
+    )
+
+
+def octree_key(run, sky):
+    """Cache key for the octree of a sky."""
+    sky_file = run.path('resources', 'skies', '%s.sky' % sky)
+    return ArtifactCache.key(
+        'octree', honeybee_radiance_version(), rad_folder_key(run), file_hash(sky_file)
+    )
+
+
+def create_static_octree(run):
+    """Create a frozen octree of the scene without a sky."""
+    static_octree = static_octree_file(run)
+    with run.profile.task('create_static_octree'):
+        key = static_octree_key(run)
+        if run.cache.get(key, static_octree):
+            return
+        makedirs(os.path.dirname(static_octree))
+        run.run_command([
+            'honeybee-radiance', 'octree', 'from-folder-static', run.path('model'),
+            '--output', static_octree
+        ])
+        run.cache.put(key, static_octree)
+
+
+def create_octree(run, sky):
+    """Create the octree for a sky by adding the sky to the static octree."""
+    octree = octree_file(run, sky)
+    with run.profile.task('create_octree', sky=sky):
+        makedirs(os.path.dirname(octree))
+        run.run_command([
+            'oconv', '-f', '-i', static_octree_file(run),
+            run.path('resources', 'skies', '%s.sky' % sky)
+        ], output_file=octree)
+        run.cache.put(octree_key(run, sky), octree)
+
+
+def create_octrees(run):
+    """Create an octree for each sky that is not in the cache."""
+    skies = [
+        sky for sky in SKIES
+        if not run.cache.get(octree_key(run, sky), octree_file(run, sky))
+    ]
+    if skies:
+        create_static_octree(run)
+    for _ in run.run_parallel(lambda sky: create_octree(run, sky), skies):
+        pass
@@ -0,0 +1,51 @@
+"""Prepare the run folder with the Radiance folder of the model and the LEED skies.
+
+On Pollination, a task with the same inputs as a task of a previous job is reused by
+the platform. A local run has no platform to do that, so the Radiance folder is reused
+from a content-addressed cache when the same model is submitted again. See
+tools.cache for more information.
+"""
+import os
+import shutil
+
+from ..cache import ArtifactCache
+from ..skies import honeybee_radiance_version
+from . import makedirs
+from .incremental import write_run_info
+from .skies import create_skies
+
+
+def rad_folder_key(run):
+    """Cache key for the Radiance folder."""
+    return ArtifactCache.key(
+        'rad-folder', honeybee_radiance_version(), run.model_hash, run.grid_filter
+    )
+
+
+def prepare_folder(run):
+    """Translate the model to a Radiance folder and create the LEED skies."""
+    resources = run.path('resources')
+    makedirs(resources)
+    makedirs(run.simulation_folder)
+    shutil.copyfile(run.model, os.path.join(run.simulation_folder, 'model.hbjson'))
+
+    model_folder = run.path('model')
+    key = rad_folder_key(run)
+    if not run.cache.get(key, model_folder):
+        # the Radiance folder is written next to the model as in the recipe
+        input_model = run.path('model.hbjson')
+        shutil.copyfile(run.model, input_model)
+        run.run_command(run.task_command(
+            'prepare_folder/create_rad_folder', {'grid_filter': run.grid_filter}
+        ))
+        run.cache.put(key, model_folder)
+        for path in (input_model, run.path('output_model.hbjson')):
+            if os.path.isfile(path):
+                os.remove(path)
+    shutil.copyfile(
+        os.path.join(model_folder, 'grid', '_info.json'),
+        os.path.join(resources, 'grids_info.json')
+    )
+
+    create_skies(run)
+    write_run_info(run)
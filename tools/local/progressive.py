@@ -0,0 +1,61 @@
+"""Trace each split sensor grid with low precision first in a local run.
+
+Only the sensors near the LEED thresholds are traced again with the full radiance
+parameters. This is a heuristic and the pass/fail results are not guaranteed to match
+a full-precision run. See tools.progressive for more information.
+
+This is local only. The recipe traces each split sensor grid once with the radiance
+parameters of the run, which keeps its results exact.
+"""
+import os
+
+from ..progressive import thresholds, near_thresholds, refine_lines
+from . import LOW_PRECISION_PARAMETERS, makedirs
+from .tracing import raytrace
+
+
+class Progressive(object):
+    """Trace the sensors with low precision and refine the sensors near thresholds.
+
+    Args:
+        band: Relative band around the thresholds for selecting the sensors that are
+            traced again with the full radiance parameters.
+        low_precision_parameters: Radiance parameters for the first pass.
+    """
+
+    def __init__(self, band=0.5, low_precision_parameters=LOW_PRECISION_PARAMETERS):
+        self.band = band
+        self.low_precision_parameters = low_precision_parameters
+
+    def raytrace(
+        self, run, octree, sensor_file, output, cwd, refine_folder, ambient=None
+    ):
+        """Trace a sensor grid with low precision and refine the sensors near thresholds.
+
+        The sensors near the thresholds are traced again with the radiance parameters
+        of the run and the optional ambient file. The sensors and the results of the
+        second pass are written to the refine_folder.
+        """
+        raytrace(run, octree, sensor_file, output, self.low_precision_parameters, cwd)
+        with open(output) as inf:
+            lines = [line for line in inf if line.strip()]
+        limits = thresholds(run.glare_control_devices == 'glare-control')
+        indices = near_thresholds([float(line) for line in lines], limits, self.band)
+        if not indices:
+            return
+        with open(sensor_file) as inf:
+            sensors = [line for line in inf if line.strip()]
+        makedirs(refine_folder)
+        name = os.path.splitext(os.path.basename(output))[0]
+        refine_sensors = os.path.join(refine_folder, '%s.pts' % name)
+        refine_output = os.path.join(refine_folder, '%s.res' % name)
+        with open(refine_sensors, 'w') as outf:
+            outf.writelines(sensors[i] for i in indices)
+        raytrace(
+            run, octree, refine_sensors, refine_output, run.radiance_parameters, cwd,
+            ambient
+        )
+        with open(refine_output) as inf:
+            refined = [line for line in inf if line.strip()]
+        with open(output, 'w') as outf:
+            outf.writelines(refine_lines(lines, indices, refined))
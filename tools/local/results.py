@@ -0,0 +1,107 @@
+"""Write the results and the visualizations of a local run.
+
+The results of the split sensor grids are merged back into the original sensor grids
+with tools.merge, which copies the segments of the split grids to their offsets in the
+merged files in parallel. The visualization is created from the result folders in
+place with a manifest instead of copying them. See tools.visualization.
+
+A local run can skip some of the outputs:
+
+* The summary-only mode only writes credit_summary.json and space_summary.csv. The
+  pass/fail results are not written, the illuminance results are not merged and the
+  visualization is not created.
+* The visualizations can be skipped and created later from the run folder with
+  ``python -m tools.visualization <run folder>``.
+* The results can be written in the binary format of tools.binary.
+
+All of this is local only. The recipe merges the results with RestructureResults,
+writes the pass/fail folders with LeedIlluminanceCredits and always creates the
+visualizations with its five copy tasks, since a queenbee DAG can not skip a task
+based on an input and ModelToVis only reads the sub-folders of a single folder.
+"""
+import os
+import shutil
+
+from .. import binary
+from ..merge import merge_folder
+from ..prune import expand_folder
+from ..visualization import RUN_VIS_SET, RUN_COMPACT_VIS, write_run_manifest, \
+    manifest_to_vis_set
+from . import SKIES, makedirs
+from .split import dist_info
+
+
+class Outputs(object):
+    """The outputs that a local run writes.
+
+    Args:
+        result_format: Either text or binary. Binary writes the illuminance results
+            as float64 values and the pass/fail results as packed bits. See
+            tools.binary for more information.
+        summary_only: A boolean to only write credit_summary.json and
+            space_summary.csv. The credits are evaluated from the results of the
+            split sensor grids.
+        visualization: Set to False to skip creating visualization.vsf and the
+            compact visualization.
+    """
+
+    def __init__(self, result_format='text', summary_only=False, visualization=True):
+        assert result_format in binary.FORMATS, 'Invalid result format: %s. ' \
+            'Choose from %s' % (result_format, binary.FORMATS)
+        self.result_format = result_format
+        self.summary_only = summary_only
+        self.visualization = visualization
+
+    @property
+    def binary(self):
+        """A boolean to note if the results are written in the binary format."""
+        return self.result_format == 'binary'
+
+
+def copy_sensor_grid_info(run):
+    """Copy grids_info.json to the result folder of each sky."""
+    for sky in SKIES:
+        results = os.path.join(run.simulation_folder, sky, 'results')
+        makedirs(results)
+        shutil.copyfile(
+            run.path('resources', 'grids_info.json'),
+            os.path.join(results, 'grids_info.json')
+        )
+
+
+def restructure_results(run, sensor_map=None):
+    """Merge the results of the split sensor grids back into the input grids.
+
+    Args:
+        run: A LocalRun.
+        sensor_map: An optional SensorMap if the split sensor grids are split from
+            pruned sensor grids. The results are expanded to the original sensor
+            grids after they are merged.
+    """
+    split_info = dist_info(run)
+    extension = binary.EXTENSION if run.outputs.binary else 'res'
+
+    def _restructure(sky):
+        results = os.path.join(run.simulation_folder, sky, 'results')
+        initial_results = os.path.join(run.simulation_folder, 'initial_results', sky)
+        merged = results if sensor_map is None else \
+            os.path.join(run.simulation_folder, sky, 'pruned_results')
+        makedirs(merged)
+        merge_folder(initial_results, merged, split_info, extension, run.workers)
+        if sensor_map is not None:
+            expand_folder(sensor_map, merged, results, extension)
+
+    for _ in run.run_parallel(_restructure, SKIES):
+        pass
+
+
+def create_visualization(run):
+    """Create the visualizations from the illuminance and pass/fail results.
+
+    The data sets are mapped to the result folders in visualization/manifest.json.
+    The compact visualization only has the combined pass/fail results as in the
+    recipe.
+    """
+    manifest = write_run_manifest(run.folder, run.run_command)
+    manifest_to_vis_set(manifest, run.path(*RUN_VIS_SET))
+    manifest_to_vis_set(manifest, run.path(*RUN_COMPACT_VIS), compact=True)
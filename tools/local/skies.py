@@ -0,0 +1,50 @@
+"""Create the LEED skies of a local run without parsing the weather file again.
+
+The LEED skies are cached by the hash of the weather file and the north angle, so the
+weather file is only parsed the first time. The skies can also be copied from the run
+of another design variant or created from a sky descriptor of tools.skies without
+the weather file.
+"""
+import json
+
+from ..cache import ArtifactCache, file_hash, copy_path
+from ..skies import honeybee_radiance_version, is_current, sky_descriptor, \
+    write_skies, write_sky_info
+from . import makedirs
+
+
+def create_skies(run):
+    """Create the 9AM and 3PM LEED skies in resources/skies.
+
+    The skies are copied from the sky_folder of the run or created from its
+    sky_descriptor if either is provided. Otherwise they are read from the cache by
+    the hash of the weather file and the north angle. The weather file is only parsed
+    if the skies are not in the cache.
+    """
+    skies = run.path('resources', 'skies')
+    if run.sky_folder:
+        copy_path(run.sky_folder, skies)
+        write_sky_info(skies)
+        return
+    if run.sky_descriptor:
+        with open(run.sky_descriptor) as inf:
+            descriptor = json.load(inf)
+        assert not run.wea or descriptor['wea_hash'] == file_hash(run.wea), \
+            'The sky descriptor was not created from %s' % run.wea
+        if run.wea and not is_current(descriptor):
+            # the descriptor of another version of honeybee-radiance
+            descriptor = sky_descriptor(run.wea)
+        write_skies(descriptor, skies, run.north)
+        return
+    key = ArtifactCache.key(
+        'skies', honeybee_radiance_version(), file_hash(run.wea), float(run.north)
+    )
+    if run.cache.get(key, skies):
+        write_sky_info(skies)
+        return
+    makedirs(skies)
+    run.run_command(run.task_command(
+        'prepare_folder/create_skies', {'north': run.north},
+        {'sky.epw': run.wea, 'output': skies}
+    ))
+    run.cache.put(key, skies)
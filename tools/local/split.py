@@ -0,0 +1,173 @@
+"""Split the sensor grids of a local run and predict the cost of each split grid.
+
+The sensor grids are split once for both skies with the same number of CPUs per grid
+as the recipe. Identical sensor grids are split the same way, so the split grids are
+reused from the cache, e.g. for design variants.
+
+The cost split balances the split grids by the predicted time it takes to trace them
+instead of their number of sensors. See tools.split for more information. The cost of
+each sensor grid is read from a previous run or measured with a quick low-precision
+pass, and each run writes the measured costs to
+``simulation/resources/grid_costs.json``.
+
+This is local only. The recipe splits the sensor grids of each sky with
+SplitGridFolder, which gives every split grid the same number of sensors.
+"""
+import json
+import os
+
+from ..cache import ArtifactCache, folder_hash, copy_path
+from ..skies import honeybee_radiance_version
+from ..split import redistribute_by_cost, grid_costs_from_timing, probe_grid_costs, \
+    chunk_costs as _chunk_costs
+from . import makedirs
+from .octree import octree_file
+
+# the recipe splits the sensor grids of each sky for half of the CPUs
+CPUS_PER_GRID = 2
+
+
+def load_grid_costs(folder):
+    """Load the cost of each sensor grid from a run folder if it exists."""
+    costs_file = os.path.join(folder, 'simulation', 'resources', 'grid_costs.json')
+    if not os.path.isfile(costs_file):
+        return {}
+    with open(costs_file) as inf:
+        return json.load(inf)
+
+
+def previous_grid_costs(run):
+    """Load the cost of each sensor grid from the cost run and the previous run."""
+    costs = {}
+    if run.cost_split and run.cost_split.cost_run:
+        costs.update(load_grid_costs(run.cost_split.cost_run))
+    if run.incremental:
+        costs.update(load_grid_costs(run.incremental.previous_run))
+    return costs
+
+
+class CostSplit(object):
+    """Split the sensor grids based on the predicted cost of ray tracing.
+
+    Args:
+        cost_run: Optional path to the folder of a previous run to read the cost of
+            each sensor grid from. The costs are measured with a quick low-precision
+            pass if this run is not provided.
+    """
+
+    def __init__(self, cost_run=None):
+        self.cost_run = os.path.abspath(cost_run) if cost_run else None
+
+    def grid_costs(self, run, grids_info):
+        """Get the cost per sensor for the sensor grids of a run.
+
+        The costs are read from the cost run. The grids that are missing from the
+        cost run are measured with a quick low-precision pass that traces a sample of
+        their sensors in parallel.
+        """
+        costs = load_grid_costs(self.cost_run) if self.cost_run else {}
+        missing = [g for g in grids_info if g['full_id'] not in costs]
+        if missing:
+            costs.update(probe_grid_costs(
+                octree_file(run, '9AM'), run.path('model', 'grid'), missing,
+                workers=run.workers
+            ))
+        return costs
+
+    def split(self, run, input_folder, output_folder, grids_info):
+        """Split the sensor grids to have the same predicted cost in each split grid.
+
+        Returns:
+            The cost per sensor of the sensor grids that the split used.
+        """
+        costs = self.grid_costs(run, grids_info)
+        redistribute_by_cost(
+            input_folder, output_folder, max(1, run.cpu_count // CPUS_PER_GRID),
+            costs, run.min_sensor_count, grids_info
+        )
+        return costs
+
+
+def split_grid_folder(run, grids=None, sensor_map=None):
+    """Split the sensor grids of a run based on the number of CPUs.
+
+    Args:
+        run: A LocalRun.
+        grids: An optional list of full_id for the sensor grids to be split. By
+            default all the sensor grids will be split.
+        sensor_map: An optional SensorMap if the sensor grids are pruned. The pruned
+            sensor grids are split instead of the original sensor grids.
+    """
+    resources = os.path.join(run.simulation_folder, 'resources')
+    makedirs(resources)
+    input_folder = run.path('model', 'grid')
+    grids_info = run.grids_info
+    if sensor_map is not None:
+        input_folder = run.dedupe.grid_folder(run)
+        grids_info = sensor_map.grids_info
+    elif grids is not None:
+        input_folder = os.path.join(resources, 'grid_input')
+        makedirs(input_folder)
+        grids_info = [g for g in grids_info if g['full_id'] in set(grids)]
+        for grid in grids_info:
+            copy_path(
+                run.path('model', 'grid', '%s.pts' % grid['full_id']),
+                os.path.join(input_folder, '%s.pts' % grid['full_id'])
+            )
+        with open(os.path.join(input_folder, '_info.json'), 'w') as outf:
+            json.dump(grids_info, outf)
+    output_folder = os.path.join(resources, 'grid')
+    if run.cost_split:
+        run.grid_costs = run.cost_split.split(
+            run, input_folder, output_folder, grids_info
+        )
+        return
+    # identical sensor grids are split the same way, e.g. for design variants
+    key = ArtifactCache.key(
+        'split', honeybee_radiance_version(), folder_hash(input_folder),
+        run.cpu_count, CPUS_PER_GRID, run.min_sensor_count
+    )
+    if run.cache.get(key, output_folder):
+        return
+    run.run_command(run.task_command(
+        'illuminance_simulation/split_grid_folder', {
+            'cpu_count': run.cpu_count, 'cpus_per_grid': CPUS_PER_GRID,
+            'min_sensor_count': run.min_sensor_count
+        },
+        {'input_folder': input_folder, 'output_folder': output_folder}
+    ))
+    run.cache.put(key, output_folder)
+
+
+def dist_info(run):
+    """Load the _redist_info.json file of the split sensor grids of a run."""
+    dist_info_file = os.path.join(
+        run.simulation_folder, 'resources', 'grid', '_redist_info.json'
+    )
+    with open(dist_info_file) as inf:
+        return json.load(inf)
+
+
+def chunk_costs(run):
+    """Estimate the cost of ray tracing each split sensor grid of a run.
+
+    The cost per sensor of each grid is the one that the cost split used or the one
+    from the cost run and the previous run. Without any costs, the cost of a split
+    grid is its number of sensors.
+    """
+    costs = run.grid_costs
+    if costs is None:
+        costs = previous_grid_costs(run)
+    return _chunk_costs(dist_info(run), costs)
+
+
+def write_grid_costs(run):
+    """Write the measured cost of each sensor grid to resources/grid_costs.json."""
+    timing_file = os.path.join(run.simulation_folder, 'initial_results', '_timing.json')
+    with open(timing_file) as inf:
+        timing = json.load(inf)
+    costs = previous_grid_costs(run)
+    costs.update(grid_costs_from_timing(timing, dist_info(run)))
+    costs_file = os.path.join(run.simulation_folder, 'resources', 'grid_costs.json')
+    with open(costs_file, 'w') as outf:
+        json.dump(costs, outf, indent=2)
@@ -0,0 +1,125 @@
+"""Trace the split sensor grids of both skies from one queue.
+
+The recipe traces the split sensor grids of each sky in its own loop. A local run
+splits the sensor grids once, and the ray tracing tasks of both skies share one queue
+that runs with the workers of the run. The queue starts with the split sensor grids
+with the largest predicted cost, so the long tasks do not start last and keep the
+other workers idle. The predicted cost and the run time of each task are written to
+``initial_results/_timing.json`` and added to the profile.
+
+This is local only. The DSL loop of the recipe runs the split grids of SplitGridFolder
+in their order and the platform schedules them, so the recipe has no queue to order.
+"""
+import json
+import os
+
+from .. import binary
+from . import SKIES, makedirs
+from .octree import octree_file
+from .split import chunk_costs
+
+
+def ambient_file(run, sky):
+    """Get the path to the shared ambient file of a sky or None if it is not shared."""
+    if run.ambient_cache is None:
+        return None
+    return run.ambient_cache.ambient_file(run, sky)
+
+
+def raytrace(run, octree, sensor_file, output, radiance_parameters, cwd, ambient=None):
+    """Run the point-in-time illuminance ray tracing command of the recipe.
+
+    Args:
+        run: A LocalRun.
+        octree: Path to the octree of the scene and the sky.
+        sensor_file: Path to the sensor file.
+        output: Path to the result file.
+        radiance_parameters: The radiance parameters for ray tracing.
+        cwd: The working directory for the command.
+        ambient: Optional path to an ambient file that is shared with the other ray
+            tracing tasks of the same octree and radiance parameters. rtrace locks
+            the file while it adds new ambient values.
+    """
+    if ambient:
+        # a relative path to avoid spaces in the radiance parameters
+        radiance_parameters = '%s -af %s' % (
+            radiance_parameters, os.path.relpath(ambient, cwd)
+        )
+    run.run_command(run.task_command(
+        'illuminance_simulation/point_in_time_grid_ray_tracing',
+        {'radiance_parameters': radiance_parameters, 'metric': 'illuminance'},
+        {'scene.oct': octree, 'grid.pts': sensor_file, 'grid.res': output}
+    ), cwd=cwd)
+
+
+def trace_grid(run, sky, grid):
+    """Run the ray tracing for a split sensor grid and a sky.
+
+    Returns:
+        A tuple with the path to the result file and the task in the profile.
+    """
+    grid_folder = os.path.join(run.simulation_folder, 'resources', 'grid')
+    output_folder = os.path.join(run.simulation_folder, 'initial_results', sky)
+    res_file = os.path.join(output_folder, '%s.res' % grid['name'])
+    sensor_file = os.path.join(grid_folder, '%s.pts' % grid['full_id'])
+    with run.profile.task(
+        'point_in_time_grid_ray_tracing', sky=sky, grid=grid['name'],
+        sensor_count=grid['count']
+    ) as task:
+        if run.progressive:
+            run.progressive.raytrace(
+                run, octree_file(run, sky), sensor_file, res_file, grid_folder,
+                os.path.join(run.simulation_folder, 'progressive', sky),
+                ambient_file(run, sky)
+            )
+        else:
+            raytrace(
+                run, octree_file(run, sky), sensor_file, res_file,
+                run.radiance_parameters, grid_folder, ambient_file(run, sky)
+            )
+        if run.outputs.binary:
+            bin_file = os.path.join(
+                output_folder, '%s.%s' % (grid['name'], binary.EXTENSION)
+            )
+            binary.text_to_binary(res_file, bin_file)
+            os.remove(res_file)
+            res_file = bin_file
+    return res_file, task
+
+
+def sensor_grids(run):
+    """Load the list of the split sensor grids of a run."""
+    info_file = os.path.join(run.simulation_folder, 'resources', 'grid', '_info.json')
+    with open(info_file) as inf:
+        return json.load(inf)
+
+
+def ray_tracing(run, on_result=None):
+    """Run the ray tracing for each split sensor grid and sky from one queue.
+
+    Args:
+        run: A LocalRun.
+        on_result: An optional function that is called with the sky, the name of the
+            split sensor grid and the path to its result file as soon as each task
+            finishes.
+    """
+    for sky in SKIES:
+        makedirs(os.path.join(run.simulation_folder, 'initial_results', sky))
+    costs = chunk_costs(run)
+    tasks = sorted(
+        ((sky, grid) for grid in sensor_grids(run) for sky in SKIES),
+        key=lambda task: -costs.get(task[1]['name'], task[1]['count'])
+    )
+    timing = []
+    for (sky, grid), (res_file, task) in run.run_parallel(
+        lambda task: trace_grid(run, *task), tasks
+    ):
+        timing.append({
+            'sky': sky, 'name': grid['name'], 'count': grid['count'],
+            'estimate': costs.get(grid['name']), 'duration': task['duration']
+        })
+        if on_result is not None:
+            on_result(sky, grid['name'], res_file)
+    timing_file = os.path.join(run.simulation_folder, 'initial_results', '_timing.json')
+    with open(timing_file, 'w') as outf:
+        json.dump(timing, outf, indent=2)
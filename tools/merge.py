@@ -0,0 +1,161 @@
+"""Merge the results of the split sensor grids back into the original grids in parallel.
+
+``honeybee-radiance grid merge-folder`` writes one original sensor grid at a time and
+reads the result file of a split grid from the start for each of its segments. The
+merge here has two passes that each run in parallel for all the split grids:
+
+1. Each result file of a split grid is read once to find the byte offsets of the
+   lines where its segments start and end. The offsets of the binary files of
+   tools.binary are calculated from the line numbers without reading the files.
+2. The offset of each segment in the merged file follows from the size of the
+   segments before it. The merged files are created at their final size and each
+   split grid copies its segments to their offsets with a fixed-size buffer.
+
+The memory use depends on the number of workers and the buffer size and not on the
+number of sensors. The merged files are the same as the output of the command.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .binary import EXTENSION, FLOAT64, HEADER, MAGIC, VALUE_SIZE
+
+BUFFER_SIZE = 1024 * 1024
+
+
+def _data_start(inf):
+    """Get the offset of the first line after the optional Radiance header."""
+    if inf.readline()[:10] != b'#?RADIANCE':
+        return 0
+    for line in inf:
+        if line[:7] == b'FORMAT=':
+            inf.readline()
+            break
+    return inf.tell()
+
+
+def line_offsets(path, lines, buffer_size=BUFFER_SIZE):
+    """Get the byte offsets where a number of lines start in a text result file.
+
+    Args:
+        path: Path to a text result file.
+        lines: A list of line numbers after the optional Radiance header. The line
+            number after the last line is the end of the file.
+        buffer_size: Number of bytes to read at a time.
+
+    Returns:
+        A dictionary of line numbers and byte offsets.
+    """
+    targets = sorted(set(lines))
+    offsets, t = {}, 0
+    with open(path, 'rb') as inf:
+        pos = _data_start(inf)
+        inf.seek(pos)
+        line, last = 0, b'\n'
+        while t < len(targets) and targets[t] == 0:
+            offsets[0] = pos
+            t += 1
+        while t < len(targets):
+            block = inf.read(buffer_size)
+            if not block:
+                break
+            i = 0
+            while t < len(targets) and line + block.count(b'\n', i) >= targets[t]:
+                for _ in range(targets[t] - line):
+                    i = block.find(b'\n', i) + 1
+                line = targets[t]
+                offsets[line] = pos + i
+                t += 1
+            line += block.count(b'\n', i)
+            pos += len(block)
+            last = block[-1:]
+    for target in targets[t:]:
+        # the last line of a file without a new line at the end
+        if target != line + 1 or last == b'\n':
+            raise ValueError(
+                'Line %d is out of range for %s with %d lines.' % (target, path, line)
+            )
+        offsets[target] = pos
+    return offsets
+
+
+def _copy(src, dst, src_offset, dst_offset, size, buffer_size=BUFFER_SIZE):
+    """Copy a range of bytes from an open source file to an open destination file."""
+    src.seek(src_offset)
+    dst.seek(dst_offset)
+    while size > 0:
+        data = src.read(min(size, buffer_size))
+        if not data:
+            raise ValueError('Unexpected end of file: %s' % src.name)
+        dst.write(data)
+        size -= len(data)
+
+
+def merge_folder(
+    input_folder, output_folder, dist_info, extension='res', workers=1,
+    buffer_size=BUFFER_SIZE
+):
+    """Restore the original sensor grids from the results of the split grids.
+
+    Args:
+        input_folder: Folder with the results of the split sensor grids.
+        output_folder: Folder to write the results of the original sensor grids.
+        dist_info: The content of the _redist_info.json file.
+        extension: Extension of the result files. The files with the extension of
+            tools.binary are merged as binary files and all the other files as text
+            files.
+        workers: Number of split grids that are read and copied at the same time.
+        buffer_size: Number of bytes that each worker copies at a time.
+    """
+    binary = extension == EXTENSION
+
+    def _path(name):
+        return os.path.join(input_folder, '%s.%s' % (name, extension))
+
+    # the lines that each split grid needs offsets for
+    chunk_lines = {}
+    for grid in dist_info:
+        for seg in grid['dist_info']:
+            chunk_lines.setdefault(str(seg['identifier']), set()).update(
+                (seg['st_ln'], seg['end_ln'] + 1)
+            )
+
+    def _offsets(name):
+        if binary:
+            return {ln: HEADER.size + VALUE_SIZE * ln for ln in chunk_lines[name]}
+        return line_offsets(_path(name), chunk_lines[name], buffer_size)
+
+    pool = ThreadPoolExecutor(max(1, workers))
+    try:
+        offsets = dict(zip(chunk_lines, pool.map(_offsets, chunk_lines)))
+
+        # the offset of each segment in the merged files
+        copies = {}
+        for grid in dist_info:
+            output = os.path.join(
+                output_folder, '%s.%s' % (grid['identifier'], extension)
+            )
+            parent = os.path.dirname(output)
+            if not os.path.isdir(parent):
+                os.makedirs(parent)
+            size = HEADER.size if binary else 0
+            for seg in grid['dist_info']:
+                name = str(seg['identifier'])
+                start = offsets[name][seg['st_ln']]
+                seg_size = offsets[name][seg['end_ln'] + 1] - start
+                copies.setdefault(name, []).append((output, start, size, seg_size))
+                size += seg_size
+            with open(output, 'wb') as outf:
+                if binary:
+                    count = (size - HEADER.size) // VALUE_SIZE
+                    outf.write(HEADER.pack(MAGIC, FLOAT64, count))
+                outf.truncate(size)
+
+        def _copy_chunk(name):
+            with open(_path(name), 'rb') as src:
+                for output, src_offset, dst_offset, size in copies[name]:
+                    with open(output, 'r+b') as dst:
+                        _copy(src, dst, src_offset, dst_offset, size, buffer_size)
+
+        list(pool.map(_copy_chunk, copies))
+    finally:
+        pool.shutdown()
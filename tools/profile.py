@@ -0,0 +1,238 @@
+"""Record the start, end and resource usage of the tasks of a run.
+
+A run writes the records to ``profile.json`` next to ``credit_summary.json``::
+
+    {
+        "settings": {"cpu_count": 50, "min_sensor_count": 500, ...},
+        "tasks": [
+            {
+                "task": "point_in_time_grid_ray_tracing",
+                "sky": "9AM",
+                "grid": "0",
+                "sensor_count": 512,
+                "start": 1700000000.0,
+                "end": 1700000012.5,
+                "duration": 12.5,
+                "cpu_time": 12.3,
+                "peak_memory": 85.2,
+                "bytes_read": 2012345,
+                "bytes_written": 10240,
+                "command_count": 1
+            }
+        ],
+        "summary": {
+            "point_in_time_grid_ray_tracing": {
+                "count": 100, "duration": 1250.0, "min": 10.1, "max": 14.2,
+                "mean": 12.5
+            }
+        }
+    }
+
+The CPU time includes the commands and the time spent in the Python thread of the
+task. Tasks can run in parallel threads. A task in a worker thread is also added to the
+tasks that are open in the thread that created the profile. The peak
+memory in MB and the bytes read and written are measured for the commands and their
+child processes. The bytes are the characters that are read and written on Linux,
+including the reads that are served from the page cache, and the block I/O on other
+platforms. The resource usage of the commands is not available on Windows and the
+peak_memory, bytes_read and bytes_written of the tasks are None there.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _max_rss(usage):
+    """Get the peak memory in MB from a resource usage."""
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return usage.ru_maxrss * scale / 1024 ** 2
+
+
+def _io_bytes(pid):
+    """Get the bytes read and written by a process that has exited but is not reaped.
+
+    Returns None if the I/O accounting of the process is not available.
+    """
+    try:
+        with open('/proc/%d/io' % pid) as inf:
+            io = dict(line.split(':') for line in inf if ':' in line)
+        return int(io['rchar']), int(io['wchar'])
+    except (IOError, OSError, KeyError, ValueError):
+        return None
+
+
+def _exit_code(status):
+    """Get the return code of a process from its wait status."""
+    if hasattr(os, 'waitstatus_to_exitcode'):
+        return os.waitstatus_to_exitcode(status)
+    # python < 3.9
+    return -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+
+
+def run_command(args, cwd=None, output_file=None):
+    """Run a command and measure the resources that it uses.
+
+    Args:
+        args: A list of arguments for the command.
+        cwd: Optional working directory for the command.
+        output_file: Optional path to a file to write the standard output of the
+            command. By default the standard output is returned with the errors.
+
+    Returns:
+        A tuple with the return code, the output of the command and a dictionary
+        with the cpu_time, peak_memory, bytes_read and bytes_written. The dictionary
+        is None if the resource usage is not available.
+    """
+    stdout = open(output_file, 'wb') if output_file else None
+    try:
+        if not hasattr(os, 'wait4'):
+            process = subprocess.run(
+                args, cwd=cwd, stdout=stdout or subprocess.PIPE,
+                stderr=subprocess.PIPE if stdout else subprocess.STDOUT
+            )
+            return process.returncode, process.stderr or process.stdout, None
+        process = subprocess.Popen(
+            args, cwd=cwd, stdout=stdout or subprocess.PIPE,
+            stderr=subprocess.PIPE if stdout else subprocess.STDOUT
+        )
+    finally:
+        if stdout:
+            stdout.close()
+    pipe = process.stderr if output_file else process.stdout
+    output = pipe.read()
+    pipe.close()
+    io = None
+    if hasattr(os, 'waitid'):
+        # wait without reaping the process to read its I/O accounting
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        io = _io_bytes(process.pid)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = _exit_code(status)
+    if io is None:
+        io = usage.ru_inblock * 512, usage.ru_oublock * 512
+    return process.returncode, output, {
+        'cpu_time': usage.ru_utime + usage.ru_stime,
+        'peak_memory': _max_rss(usage),
+        'bytes_read': io[0],
+        'bytes_written': io[1]
+    }
+
+
+class Profile(object):
+    """The records of the tasks of a run.
+
+    Tasks can be nested. The commands that run inside a task are added to all the
+    tasks that are open in the same thread and in the thread that created the profile.
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self._open = {}
+        self._main = threading.get_ident()
+        self._lock = threading.Lock()
+
+    def _open_tasks(self):
+        """Get the tasks that the resource usage of the current thread is added to."""
+        thread = threading.get_ident()
+        tasks = list(self._open.get(thread, []))
+        if thread != self._main:
+            tasks.extend(self._open.get(self._main, []))
+        return tasks
+
+    @contextmanager
+    def task(self, name, record=True, **info):
+        """Record a task.
+
+        Args:
+            name: Name of the task. Use the name of the task in the recipe where
+                possible.
+            record: Set to False to measure the task without adding it to the
+                profile.
+            info: Additional information for the task such as the sensor_count.
+
+        Yields:
+            The dictionary for the task. The end, duration and cpu_time are set once
+            the task is done.
+        """
+        task = {'task': name}
+        task.update(info)
+        task.update({
+            'start': time.time(), 'cpu_time': 0, 'peak_memory': None,
+            'bytes_read': None, 'bytes_written': None, 'command_count': 0
+        })
+        cpu_start = time.thread_time()
+        with self._lock:
+            self._open.setdefault(threading.get_ident(), []).append(task)
+        try:
+            yield task
+        finally:
+            cpu_time = time.thread_time() - cpu_start
+            thread = threading.get_ident()
+            with self._lock:
+                self._open[thread].remove(task)
+                if thread != self._main and not self._open[thread]:
+                    # the outermost task of a worker thread
+                    for main_task in self._open.get(self._main, []):
+                        main_task['cpu_time'] += cpu_time
+                task['end'] = time.time()
+                task['duration'] = task['end'] - task['start']
+                task['cpu_time'] += cpu_time
+                if record:
+                    self.tasks.append(task)
+
+    def add_command(self, usage):
+        """Add the resource usage of a command to the tasks that are open."""
+        with self._lock:
+            for task in self._open_tasks():
+                task['command_count'] += 1
+                if usage is None:
+                    continue
+                task['cpu_time'] += usage['cpu_time']
+                task['peak_memory'] = \
+                    max(task['peak_memory'] or 0, usage['peak_memory'])
+                task['bytes_read'] = (task['bytes_read'] or 0) + usage['bytes_read']
+                task['bytes_written'] = \
+                    (task['bytes_written'] or 0) + usage['bytes_written']
+
+    def run_command(self, args, cwd=None, output_file=None):
+        """Run a command and add its resource usage to the tasks that are open.
+
+        Returns:
+            A tuple with the return code and the output of the command.
+        """
+        returncode, output, usage = run_command(args, cwd, output_file)
+        self.add_command(usage)
+        return returncode, output
+
+    def summary(self):
+        """Get the count, total, min, max and mean duration of the tasks by name."""
+        summary = {}
+        for task in self.tasks:
+            summary.setdefault(task['task'], []).append(task['duration'])
+        return {
+            name: {
+                'count': len(durations), 'duration': sum(durations),
+                'min': min(durations), 'max': max(durations),
+                'mean': sum(durations) / len(durations)
+            }
+            for name, durations in summary.items()
+        }
+
+    def write(self, path, settings=None):
+        """Write the profile to a JSON file.
+
+        Args:
+            path: Path to the output JSON file.
+            settings: An optional dictionary of the settings of the run.
+        """
+        with open(path, 'w') as outf:
+            json.dump({
+                'settings': settings or {},
+                'tasks': self.tasks,
+                'summary': self.summary()
+            }, outf, indent=2)
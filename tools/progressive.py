@@ -0,0 +1,59 @@
+"""Trace the sensors with low precision first and refine the sensors near thresholds.
+
+The LEED pass/fail results only depend on whether the illuminance of each sensor is
+above 300 lux and, without glare-control devices, below 3000 lux. A low-precision
+pass is enough to classify most of the sensors. Only the sensors whose low-precision
+illuminance is within a relative band of one of the thresholds are traced again with
+the full radiance parameters.
+
+This is a heuristic. The error of a low-precision pass is not bounded: it depends on
+the model and the radiance parameters and a sensor well outside of the band can still
+land on the other side of a threshold at full precision. The pass/fail results are
+not guaranteed to match a full-precision run and the progressive mode is off by
+default. Use it for design iterations and use a full-precision run for documentation.
+"""
+
+
+def thresholds(glare_control=True):
+    """Get the illuminance thresholds for the LEED pass/fail criteria."""
+    return (300,) if glare_control else (300, 3000)
+
+
+def near_thresholds(values, limits, band=0.5):
+    """Get the index of the values that are within a relative band of the thresholds.
+
+    Args:
+        values: A list of illuminance values.
+        limits: A list of illuminance thresholds.
+        band: Relative band around each threshold. For instance 0.5 selects the
+            values between 150 and 450 lux for the 300 lux threshold. The band is
+            a heuristic and does not guarantee that the values outside of it are
+            on the same side of the thresholds at full precision.
+
+    Returns:
+        A list of indices.
+    """
+    ranges = [(limit * (1 - band), limit * (1 + band)) for limit in limits]
+    return [
+        i for i, value in enumerate(values)
+        if any(low <= value <= high for low, high in ranges)
+    ]
+
+
+def refine_lines(lines, indices, refined_lines):
+    """Replace the result lines for the refined sensors.
+
+    Args:
+        lines: A list of result lines from the low-precision pass.
+        indices: A list of indices for the sensors that are traced again.
+        refined_lines: A list of result lines for the refined sensors.
+
+    Returns:
+        A new list of result lines.
+    """
+    assert len(indices) == len(refined_lines), \
+        'Expected %d refined results but found %d.' % (len(indices), len(refined_lines))
+    lines = list(lines)
+    for i, line in zip(indices, refined_lines):
+        lines[i] = line
+    return lines
@@ -0,0 +1,224 @@
+"""Collapse the coincident sensors of overlapping sensor grids.
+
+The sensor grids of overlapping rooms often have sensors at the same position. The
+sensors with the same direction and a position within a tolerance of each other are
+traced once and all of them get the result of the first one. The sensors are found
+with a spatial index that hashes the positions to cubic cells of the tolerance size,
+so only the sensors in the neighboring cells are compared.
+
+The pruned sensor grids are written to a folder with the same structure as the grid
+folder of the Radiance folder and they are split and traced instead of the original
+sensor grids. Sensor grids where all the sensors are collapsed into the sensors of
+other grids are not written. The sensor map has the index of the traced sensor for
+each sensor of the original sensor grids, where the traced sensors are numbered in
+the order of the pruned sensor grids::
+
+    {
+        "grids_info": [...],
+        "sensors": {"<full_id>": [0, 1, 1, 2, ...]}
+    }
+"""
+import json
+import math
+import os
+
+from .binary import EXTENSION, read_results, write_values
+
+# tolerance for the difference between the unit vectors of two sensors
+DIRECTION_TOLERANCE = 1e-3
+
+
+def _read_lines(path):
+    with open(path) as inf:
+        return [line for line in inf if line.strip()]
+
+
+def _parse(line):
+    values = [float(v) for v in line.split()]
+    point, direction = values[:3], values[3:6]
+    length = math.sqrt(sum(d * d for d in direction)) or 1
+    return point, [d / length for d in direction]
+
+
+def _distance(pt_1, pt_2):
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(pt_1, pt_2)))
+
+
+class SpatialIndex(object):
+    """A spatial hash of points in cubic cells.
+
+    Args:
+        cell_size: The size of the cells in model units.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = {}
+
+    def _key(self, point):
+        return tuple(int(math.floor(c / self.cell_size)) for c in point)
+
+    def add(self, point, item):
+        """Add a point with an item to the index."""
+        self._cells.setdefault(self._key(point), []).append((point, item))
+
+    def near(self, point):
+        """Get the points and items in the cell of a point and its neighbors."""
+        x, y, z = self._key(point)
+        for i in (x - 1, x, x + 1):
+            for j in (y - 1, y, y + 1):
+                for k in (z - 1, z, z + 1):
+                    for item in self._cells.get((i, j, k), ()):
+                        yield item
+
+
+class SensorMap(object):
+    """Map the sensors of the original sensor grids to the traced sensors.
+
+    Args:
+        grids_info: List of dictionaries for the pruned sensor grids.
+        sensors: A dictionary of full_id of the original sensor grids and the list
+            of the traced sensor index for each sensor.
+    """
+
+    def __init__(self, grids_info, sensors):
+        self.grids_info = grids_info
+        self.sensors = sensors
+        self.offsets, offset = {}, 0
+        for grid in grids_info:
+            self.offsets[grid['full_id']] = offset
+            offset += grid['count']
+        self.traced_count = offset
+        self._origins = None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as inf:
+            data = json.load(inf)
+        return cls(data['grids_info'], data['sensors'])
+
+    def to_file(self, path):
+        with open(path, 'w') as outf:
+            json.dump({'grids_info': self.grids_info, 'sensors': self.sensors}, outf)
+
+    @property
+    def sensor_count(self):
+        """Number of sensors in the original sensor grids."""
+        return sum(len(s) for s in self.sensors.values())
+
+    @property
+    def origins(self):
+        """A list of the original full_id and sensor index for each traced sensor."""
+        if self._origins is None:
+            origins = [[] for _ in range(self.traced_count)]
+            for full_id, traced in self.sensors.items():
+                for index, t in enumerate(traced):
+                    origins[t].append((full_id, index))
+            self._origins = origins
+        return self._origins
+
+    def original_sensors(self, full_id, start, count):
+        """Get the original sensors for a range of sensors of a pruned sensor grid.
+
+        Args:
+            full_id: Full identifier of the pruned sensor grid.
+            start: Index of the first sensor in the pruned sensor grid.
+            count: Number of sensors in the range.
+
+        Returns:
+            A list of tuples with the index in the range, the full_id of the
+            original sensor grid and the index of the original sensor.
+        """
+        offset = self.offsets[full_id] + start
+        origins = self.origins
+        return [
+            (i, o_id, o_index) for i in range(count)
+            for o_id, o_index in origins[offset + i]
+        ]
+
+    def expand(self, values):
+        """Get the values of the original sensor grids from the traced values.
+
+        Args:
+            values: A list of values for all the traced sensors in the order of the
+                pruned sensor grids.
+
+        Returns:
+            A dictionary of full_id of the original sensor grids and their values.
+        """
+        return {
+            full_id: [values[t] for t in traced]
+            for full_id, traced in self.sensors.items()
+        }
+
+
+def prune_sensors(input_folder, grids_info, output_folder, tolerance=0.001):
+    """Collapse the coincident sensors into one traced sensor.
+
+    Args:
+        input_folder: Path to a folder with a .pts file for each sensor grid.
+        grids_info: List of dictionaries for the sensor grids.
+        output_folder: Path to the folder for the pruned sensor grids and their
+            _info.json file.
+        tolerance: The maximum distance in model units between the sensors that
+            are collapsed into one sensor.
+
+    Returns:
+        A SensorMap.
+    """
+    if not os.path.isdir(output_folder):
+        os.makedirs(output_folder)
+    index = SpatialIndex(tolerance)
+    pruned, sensors, traced_count = [], {}, 0
+    for grid in grids_info:
+        lines = _read_lines(os.path.join(input_folder, '%s.pts' % grid['full_id']))
+        kept, traced = [], []
+        for line in lines:
+            point, direction = _parse(line)
+            for other, (o_direction, t) in index.near(point):
+                if _distance(point, other) <= tolerance and \
+                        _distance(direction, o_direction) <= DIRECTION_TOLERANCE:
+                    break
+            else:
+                t = traced_count + len(kept)
+                kept.append(line)
+                index.add(point, (direction, t))
+            traced.append(t)
+        sensors[grid['full_id']] = traced
+        if kept:
+            with open(os.path.join(output_folder, '%s.pts' % grid['full_id']), 'w') \
+                    as outf:
+                outf.writelines(kept)
+            pruned.append(dict(grid, count=len(kept)))
+        traced_count += len(kept)
+    with open(os.path.join(output_folder, '_info.json'), 'w') as outf:
+        json.dump(pruned, outf)
+    return SensorMap(pruned, sensors)
+
+
+def expand_folder(sensor_map, input_folder, output_folder, extension='res'):
+    """Write the results of the original sensor grids from the pruned results.
+
+    Args:
+        sensor_map: A SensorMap.
+        input_folder: Path to the folder with the results of the pruned sensor grids.
+        output_folder: Path to the folder for the results of the original grids.
+        extension: Either res for text results or the extension of the binary
+            results of tools.binary.
+    """
+    if not os.path.isdir(output_folder):
+        os.makedirs(output_folder)
+    values = []
+    for grid in sensor_map.grids_info:
+        path = os.path.join(input_folder, '%s.%s' % (grid['full_id'], extension))
+        # the text results are copied as they are
+        values.extend(
+            read_results(path) if extension == EXTENSION else _read_lines(path)
+        )
+    for full_id, grid_values in sensor_map.expand(values).items():
+        path = os.path.join(output_folder, '%s.%s' % (full_id, extension))
+        if extension == EXTENSION:
+            write_values(path, grid_values)
+            continue
+        with open(path, 'w') as outf:
+            outf.writelines(grid_values)
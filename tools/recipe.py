@@ -0,0 +1,164 @@
+"""Read the tasks and the commands of the recipe for the local runner.
+
+The local runner does not keep its own copy of the commands of the recipe. The tasks
+of LeedDaylightOptionTwoEntryPoint and its nested DAGs are read from the DAG classes
+and the command of each task is rendered from the function template of the task,
+which is the same template that runs on Pollination. The paths of the artifacts in
+the template, such as ``./input_folder`` or ``grid.pts``, are replaced with the paths
+in the run folder, so a change to the recipe or to a plugin changes the local commands
+too.
+
+The tasks of the nested DAGs are flattened into a single list with the needs of each
+task, so the local runner can run the tasks in the order of the DAG of the recipe.
+"""
+import re
+import shlex
+
+_INPUT = re.compile(r'{{\s*inputs\.([\w-]+)\s*}}')
+
+
+def recipe_dag():
+    """Get the entry point DAG of the recipe."""
+    from pollination.leed_daylight_option_two.entry import \
+        LeedDaylightOptionTwoEntryPoint
+    return LeedDaylightOptionTwoEntryPoint
+
+
+def _task_methods(dag):
+    """Get the task methods of a DAG class or instance."""
+    for name in dir(dag):
+        method = getattr(dag, name)
+        if getattr(method, '__decorator__', None) == 'task':
+            yield name, method
+
+
+def recipe_templates(dag=None, prefix=''):
+    """Get the function template of each task of the recipe.
+
+    Args:
+        dag: Optional DAG class. By default the entry point of the recipe.
+        prefix: Prefix for the names of the tasks of a nested DAG.
+
+    Returns:
+        A dictionary of task names and function templates. The tasks of the nested
+        DAGs are named after the parent task, e.g.
+        ``illuminance_simulation/split_grid_folder``.
+    """
+    dag = dag or recipe_dag()
+    templates = {}
+    for name, method in _task_methods(dag):
+        template = method.__task_template__
+        if template.__decorator__ == 'dag':
+            templates.update(recipe_templates(template, prefix + name + '/'))
+        else:
+            templates[prefix + name] = template
+    return templates
+
+
+def recipe_tasks(dag=None, prefix='', needs=(), loop=False):
+    """Get the tasks of the recipe with their needs.
+
+    The tasks of a nested DAG need the tasks that the parent task needs and a task
+    that needs a nested DAG needs all the tasks of that DAG. The tasks of a nested DAG
+    that runs in a loop also run in a loop.
+
+    Args:
+        dag: Optional DAG class. By default the entry point of the recipe.
+        prefix: Prefix for the names of the tasks of a nested DAG.
+        needs: Names of the tasks that all the tasks of the DAG need.
+        loop: A boolean to note if the DAG runs in a loop.
+
+    Returns:
+        A list of dictionaries with the name, needs, loop and template of each task.
+        The tasks are named as in recipe_templates.
+    """
+    dag = dag or recipe_dag()
+    methods = list(_task_methods(dag))
+    leaves = {}
+    for name, method in methods:
+        template = method.__task_template__
+        leaves[name] = sorted(recipe_templates(template, prefix + name + '/')) \
+            if template.__decorator__ == 'dag' else [prefix + name]
+    tasks = []
+    for name, method in methods:
+        template = method.__task_template__
+        task_needs = set(needs)
+        for need in method.__task_needs__ or []:
+            task_needs.update(leaves[need.__name__])
+        task_loop = loop or bool(method.__task_loop__)
+        if template.__decorator__ == 'dag':
+            tasks.extend(
+                recipe_tasks(template, prefix + name + '/', task_needs, task_loop)
+            )
+            continue
+        tasks.append({
+            'name': prefix + name, 'needs': sorted(task_needs), 'loop': task_loop,
+            'template': template
+        })
+    return tasks
+
+
+def topological_order(needs):
+    """Sort the nodes of a graph so that each node comes after the nodes it needs.
+
+    Args:
+        needs: A dictionary of nodes and the list of nodes that each of them needs.
+            The nodes that are ready at the same time are sorted by name.
+
+    Returns:
+        A list of nodes.
+    """
+    remaining = {node: set(node_needs) for node, node_needs in needs.items()}
+    unknown = set().union(*remaining.values()) - set(remaining) if remaining else set()
+    assert not unknown, 'Unknown needs: %s' % ', '.join(sorted(unknown))
+    order = []
+    while remaining:
+        ready = sorted(node for node, node_needs in remaining.items() if not node_needs)
+        assert ready, 'Circular needs: %s' % ', '.join(sorted(remaining))
+        for node in ready:
+            del remaining[node]
+        for node_needs in remaining.values():
+            node_needs.difference_update(ready)
+        order.extend(ready)
+    return order
+
+
+def template_command(template, arguments=None, paths=None):
+    """Get the command of a function template as a list of arguments.
+
+    Args:
+        template: A function template of pollination-dsl, for instance one of the
+            values of recipe_templates.
+        arguments: A dictionary of input names and values for the parameters of the
+            template. The parameters that are not provided use their default.
+        paths: A dictionary of the paths of the artifacts in the template and the
+            paths to use instead, e.g. ``{'input_folder': '/run/model/grid'}``. The
+            paths inside an artifact folder are replaced too.
+
+    Returns:
+        A list of arguments for the command.
+    """
+    function = template.queenbee
+    values = {
+        i.name: i.default for i in function.inputs if getattr(i, 'path', None) is None
+    }
+    values.update({
+        name.replace('_', '-'): value for name, value in (arguments or {}).items()
+    })
+    for name, value in values.items():
+        assert value is not None, \
+            'Missing input %s for the %s template.' % (name, function.name)
+    command = _INPUT.sub(lambda m: str(values[m.group(1)]), function.command)
+    paths = paths or {}
+    args = []
+    for arg in shlex.split(command):
+        path = arg[2:] if arg.startswith('./') else arg
+        for src, dst in paths.items():
+            if path == src:
+                arg = dst
+                break
+            if path.startswith(src + '/'):
+                arg = dst + path[len(src):]
+                break
+        args.append(arg)
+    return args
@@ -0,0 +1,492 @@
+"""Run the LEED daylight option two workflow on a local machine.
+
+The commands of the tasks are rendered from the task templates of
+LeedDaylightOptionTwoEntryPoint with tools.recipe, so they are the same commands that
+run on Pollination. The run folder uses the same structure as the recipe::
+
+    model/                          Radiance folder
+    resources/grids_info.json
+    resources/skies/                9AM.sky, 3PM.sky and sky_info.json
+    simulation/model.hbjson
+    simulation/resources/grid       sensor grids split for parallel execution
+    simulation/9AM/results          illuminance results for 9AM
+    simulation/3PM/results          illuminance results for 3PM
+    results/                        pass/fail results and space_summary.csv
+    credit_estimate.json            partial credit estimate while the run is going
+    credit_summary.json
+    profile.json                    start, end and resource usage of each task
+    visualization/                  vis metadata and manifest.json for the results
+    visualization.vsf
+    compact/visualization.pkl       combined pass/fail results only
+
+LocalRun runs the steps of the workflow in the order of the ``needs`` of the tasks of
+the recipe, which are read from the DAG of the recipe. Each task of the recipe is run
+by the step with the same name as the task or as the DAG task that it is nested in,
+e.g. ``create_visualization/create_vsf`` is run by the create_visualization step. A
+task that is added to the recipe raises an error until it has a step. The tasks that
+the recipe runs in a loop run in parallel with ``--workers`` threads. Each thread runs
+its commands as separate processes so a 128-core machine is kept busy without any
+container or upload overhead.
+
+The code of each step and each feature of the local runner is in its own module of
+tools.local. The features are local only, and each module notes how the recipe runs
+the same task:
+
+* tools.local.skies: the LEED skies are cached or created from a sky descriptor.
+* tools.local.octree: the scene is compiled once for both skies.
+* tools.local.incremental: ``--previous-run`` only traces the changed sensor grids.
+* tools.local.dedupe: ``--dedupe-tolerance`` traces the coincident sensors once.
+* tools.local.split: ``--split-mode cost`` balances the split grids by their cost.
+* tools.local.tracing: the ray tracing tasks of both skies share one queue.
+* tools.local.ambient: ``--ambient-cache`` shares the ambient values of each sky.
+* tools.local.progressive: ``--progressive`` refines the sensors near thresholds.
+* tools.local.early_stop: ``--early-stop`` stops once the credits are decided.
+* tools.local.credits: the credits are evaluated while the ray tracing is running.
+* tools.local.results: ``--summary-only``, ``--no-visualization`` and
+  ``--result-format binary`` change the outputs of the run.
+
+Each run writes the start, end, CPU time, peak memory and bytes read and written of
+each task to ``profile.json``. See tools.profile for more information.
+
+Usage::
+
+    python -m tools.run_local model.hbjson weather.wea --folder ./leed_run
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import binary
+from .cache import ArtifactCache, DEFAULT_FOLDER, file_hash
+from .early_stop import MODES
+from .incremental import SCOPES
+from .profile import Profile
+from .recipe import recipe_tasks, recipe_templates, template_command, \
+    topological_order
+from .local import LOW_PRECISION_PARAMETERS
+from .local.ambient import AmbientCache
+from .local.credits import credit_evaluator, update_credits
+from .local.dedupe import Dedupe
+from .local.early_stop import EarlyStop
+from .local.incremental import Incremental
+from .local.octree import create_octrees
+from .local.prepare import prepare_folder
+from .local.progressive import Progressive
+from .local.results import Outputs, copy_sensor_grid_info, restructure_results, \
+    create_visualization
+from .local.split import CostSplit, split_grid_folder, write_grid_costs
+from .local.tracing import ray_tracing
+
+SPLIT_MODES = ('count', 'cost')
+
+
+class LocalRun(object):
+    """A local run of the LEED daylight option two workflow.
+
+    The first arguments are the inputs of the recipe. The features of the local
+    runner are off by default and each of them is turned on with an object of its
+    module in tools.local.
+
+    Args:
+        model: Path to a Honeybee model in HBJSON format.
+        wea: Path to an annual .wea or .epw file. It can be None if a sky_folder or a
+            sky_descriptor is provided.
+        folder: Path to the run folder.
+        north: A number between -360 and 360 for the rotation from north.
+        grid_filter: Pattern to filter the sensor grids that are simulated.
+        glare_control_devices: Either glare-control or no-glare-control.
+        cpu_count: The maximum number of CPUs for parallel execution.
+        min_sensor_count: The minimum number of sensors in each sensor grid after
+            redistributing the sensors based on cpu_count.
+        radiance_parameters: The radiance parameters for ray tracing.
+        cache: An optional ArtifactCache to reuse the Radiance folder, the octrees,
+            the skies and the split sensor grids from previous runs.
+        workers: Number of tasks that run in parallel. By default the smaller of
+            cpu_count and the number of CPUs of the machine.
+        sky_folder: Optional path to the skies folder of another run with the same
+            wea and north. The skies are copied from this folder instead of being
+            created again.
+        sky_descriptor: Optional path to a sky descriptor JSON file to create the
+            skies from instead of parsing the weather file. See tools.skies for
+            more information.
+        outputs: Optional tools.local.results.Outputs for the format of the results
+            and the outputs to skip. By default all the outputs are written as text.
+        incremental: Optional tools.local.incremental.Incremental to only simulate
+            the sensor grids that are affected by the changes since a previous run.
+        cost_split: Optional tools.local.split.CostSplit to split the sensor grids
+            by the predicted cost of ray tracing instead of the number of sensors.
+        early_stop: Optional tools.local.early_stop.EarlyStop to stop tracing once
+            the number of credits is decided.
+        progressive: Optional tools.local.progressive.Progressive to trace the
+            sensors with low precision first. This is a heuristic that can change the
+            pass/fail results. It is not used with early_stop.
+        ambient_cache: Optional tools.local.ambient.AmbientCache to share an ambient
+            file between the ray tracing tasks of each sky.
+        dedupe: Optional tools.local.dedupe.Dedupe to trace the coincident sensors of
+            the sensor grids only once.
+    """
+
+    def __init__(
+        self, model, wea, folder, north=0, grid_filter='*',
+        glare_control_devices='glare-control', cpu_count=50, min_sensor_count=500,
+        radiance_parameters='-ab 5 -aa 0.1 -ad 2048 -ar 64', cache=None, workers=None,
+        sky_folder=None, sky_descriptor=None, outputs=None, incremental=None,
+        cost_split=None, early_stop=None, progressive=None, ambient_cache=None,
+        dedupe=None
+    ):
+        self.model = os.path.abspath(model)
+        self.wea = os.path.abspath(wea) if wea else None
+        self.folder = os.path.abspath(folder)
+        self.north = north
+        self.grid_filter = grid_filter
+        self.glare_control_devices = glare_control_devices
+        self.cpu_count = cpu_count
+        self.min_sensor_count = min_sensor_count
+        self.radiance_parameters = radiance_parameters
+        self.cache = cache or ArtifactCache(enabled=False)
+        self.workers = workers or min(cpu_count, os.cpu_count() or 1)
+        self.sky_folder = os.path.abspath(sky_folder) if sky_folder else None
+        self.sky_descriptor = os.path.abspath(sky_descriptor) if sky_descriptor \
+            else None
+        assert self.wea or self.sky_folder or self.sky_descriptor, \
+            'Either a weather file or the skies must be provided.'
+        self.outputs = outputs or Outputs()
+        self.incremental = incremental
+        self.cost_split = cost_split
+        self.early_stop = early_stop
+        self.progressive = progressive
+        self.ambient_cache = ambient_cache
+        self.dedupe = dedupe
+        self.profile = Profile()
+        # the state that the steps pass to each other
+        self.grids = None
+        self.grid_costs = None
+        self.sensor_map = None
+        self.evaluator = None
+        self.stopped = False
+        self._model_hash = None
+        self._templates = None
+
+    def path(self, *args):
+        """Get a path inside the run folder."""
+        return os.path.join(self.folder, *args)
+
+    @property
+    def simulation_folder(self):
+        return self.path('simulation')
+
+    @property
+    def model_hash(self):
+        """The hash of the content of the model file."""
+        if self._model_hash is None:
+            self._model_hash = file_hash(self.model)
+        return self._model_hash
+
+    @property
+    def grids_info(self):
+        """List of the sensor grids in the model that are simulated."""
+        with open(self.path('resources', 'grids_info.json')) as inf:
+            return json.load(inf)
+
+    def run_command(self, args, cwd=None, output_file=None):
+        """Run a command and raise an error if it fails.
+
+        Args:
+            args: A list of arguments for the command.
+            cwd: Optional working directory. By default the run folder.
+            output_file: Optional path to a file to write the standard output of the
+                command.
+        """
+        returncode, output = self.profile.run_command(
+            args, cwd or self.folder, output_file
+        )
+        if returncode != 0:
+            raise RuntimeError(
+                'Command failed: %s\n%s' % (
+                    ' '.join(args), output.decode('utf-8', 'replace')
+                )
+            )
+
+    def task_command(self, task, arguments=None, paths=None):
+        """Get the command of a task of the recipe with the paths of this run.
+
+        Args:
+            task: Name of the task in the recipe, e.g.
+                ``illuminance_simulation/split_grid_folder``.
+            arguments: A dictionary of the parameters of the task.
+            paths: A dictionary of the artifact paths in the template of the task
+                and the paths in this run. See tools.recipe.template_command.
+        """
+        if self._templates is None:
+            self._templates = recipe_templates()
+        return template_command(self._templates[task], arguments, paths)
+
+    def run_parallel(self, func, items):
+        """Run a function for each item with a pool of workers.
+
+        The work of each task is done by the commands so the workers are threads
+        that wait for their commands to finish.
+
+        Args:
+            func: A function that takes an item as the only argument.
+            items: A list of items.
+
+        Yields:
+            A tuple with the item and the output of the function in the order that
+            the tasks finish.
+        """
+        if self.workers == 1:
+            for item in items:
+                yield item, func(item)
+            return
+        pool = ThreadPoolExecutor(self.workers)
+        futures = {pool.submit(func, item): item for item in items}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+
+    def _step_prepare_folder(self):
+        with self.profile.task('prepare_folder'):
+            prepare_folder(self)
+        self.grids = self.incremental.grids_to_simulate(self) if self.incremental \
+            else [grid['full_id'] for grid in self.grids_info]
+
+    def _step_copy_sensor_grid_info(self):
+        if not self.outputs.summary_only:
+            copy_sensor_grid_info(self)
+
+    def _step_create_octree(self):
+        if self.grids:
+            create_octrees(self)
+
+    def _step_split_grid_folder(self):
+        # the early stop mode traces the original sensor grids in batches
+        if not self.grids or self.early_stop:
+            return
+        grids = self.grids if self.incremental else None
+        if self.dedupe:
+            with self.profile.task('prune_sensors'):
+                self.sensor_map = self.dedupe.prune(self, grids)
+        with self.profile.task('split_grid_folder'):
+            split_grid_folder(self, grids, self.sensor_map)
+
+    def _step_point_in_time_grid_ray_tracing(self):
+        if not self.grids:
+            return
+        if self.ambient_cache:
+            self.ambient_cache.load(self)
+        # the credits are evaluated as soon as the results for each grid are ready
+        self.evaluator = credit_evaluator(self, self.grids, self.sensor_map)
+        if self.early_stop:
+            # only the credit summary is created if the tracing stops early
+            self.stopped = not self.early_stop.trace(self, self.evaluator, self.grids)
+        else:
+            def _add_result(sky, name, res_file):
+                self.evaluator.add_chunk_file(sky, name, res_file)
+                update_credits(self, self.evaluator)
+
+            ray_tracing(self, _add_result)
+            write_grid_costs(self)
+        if self.ambient_cache:
+            self.ambient_cache.store(self)
+
+    def _step_restructure_results(self):
+        if self.stopped or self.outputs.summary_only:
+            return
+        if self.grids and not self.early_stop:
+            with self.profile.task('restructure_results'):
+                restructure_results(self, self.sensor_map)
+        if self.incremental:
+            with self.profile.task('reuse_previous_results'):
+                self.incremental.reuse_results(self, self.grids)
+
+    def _step_evaluate_credits(self):
+        # the credits of the simulated grids are written during the ray tracing
+        if self.evaluator is None:
+            self.evaluator = credit_evaluator(self, self.grids)
+            update_credits(self, self.evaluator)
+
+    def _step_create_visualization(self):
+        if self.stopped or self.outputs.summary_only or not self.outputs.visualization:
+            return
+        with self.profile.task('create_visualization'):
+            create_visualization(self)
+
+    def steps(self):
+        """Get the steps of LocalRun in the order of the DAG of the recipe.
+
+        Each task of the recipe is run by the step with the same name as the task or
+        as the DAG task that it is nested in. The needs of each step are the needs of
+        the tasks of the recipe that it runs. An error is raised if a task of the
+        recipe does not have a step or if a step does not run any task.
+        """
+        names = set(
+            name[len('_step_'):] for name in dir(self) if name.startswith('_step_')
+        )
+
+        def _step(task):
+            parts = task.split('/')
+            for name in [parts[-1]] + parts[-2::-1]:
+                if name in names:
+                    return name
+
+        tasks = recipe_tasks()
+        steps = {task['name']: _step(task['name']) for task in tasks}
+        missing = [task for task, step in steps.items() if step is None]
+        unused = names - set(steps.values())
+        if missing or unused:
+            raise ValueError(
+                'The tasks of the recipe do not match the steps of the local run.\n'
+                'Tasks without a step: %s\nSteps without a task: %s' % (
+                    ', '.join(sorted(missing)) or '-', ', '.join(sorted(unused)) or '-'
+                )
+            )
+        needs = {}
+        for task in tasks:
+            step = steps[task['name']]
+            needs.setdefault(step, set()).update(steps[need] for need in task['needs'])
+            needs[step].discard(step)
+        return topological_order(needs)
+
+    def run_step(self, step):
+        """Run a step of the workflow."""
+        getattr(self, '_step_%s' % step)()
+
+    def write_profile(self):
+        """Write the start, end and resource usage of each task to profile.json."""
+        self.profile.write(self.path('profile.json'), {
+            'cpu_count': self.cpu_count,
+            'min_sensor_count': self.min_sensor_count,
+            'radiance_parameters': self.radiance_parameters,
+            'split_mode': 'cost' if self.cost_split else 'count',
+            'workers': self.workers,
+            'ambient_cache': self.ambient_cache is not None,
+            'dedupe_tolerance': self.dedupe.tolerance if self.dedupe else None,
+            'sensor_count': sum(g['count'] for g in self.grids_info)
+        })
+
+    def run(self):
+        """Run all the steps of the workflow in the order of the recipe."""
+        for step in self.steps():
+            self.run_step(step)
+        self.write_profile()
+        with open(self.path('credit_summary.json')) as inf:
+            return json.load(inf)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Run the LEED daylight option two workflow on a local machine.'
+    )
+    parser.add_argument('model', help='Path to a Honeybee model in HBJSON format.')
+    parser.add_argument('wea', nargs='?',
+                        help='Path to an annual .wea or .epw file. It is not '
+                        'needed if --sky-descriptor is provided.')
+    parser.add_argument('--folder', default='leed_daylight_option_two',
+                        help='Path to the run folder.')
+    parser.add_argument('--north', type=float, default=0)
+    parser.add_argument('--grid-filter', default='*')
+    parser.add_argument('--glare-control-devices', default='glare-control',
+                        choices=['glare-control', 'no-glare-control'])
+    parser.add_argument('--cpu-count', type=int, default=50)
+    parser.add_argument('--min-sensor-count', type=int, default=500)
+    parser.add_argument('--radiance-parameters', default='-ab 5 -aa 0.1 -ad 2048 -ar 64')
+    parser.add_argument('--cache-folder', default=DEFAULT_FOLDER,
+                        help='Path to the cache folder.')
+    parser.add_argument('--cache-size', type=float, default=10,
+                        help='Maximum size of the cache in GB.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the cache for the Radiance folder and octrees.')
+    parser.add_argument('--previous-run',
+                        help='Path to a previous run folder. Only the sensor grids '
+                        'that are affected by the changes will be simulated again.')
+    parser.add_argument('--incremental-scope', default='model', choices=SCOPES)
+    parser.add_argument('--split-mode', default='count', choices=SPLIT_MODES,
+                        help='Split the sensor grids based on the number of sensors '
+                        'or the predicted cost of ray tracing.')
+    parser.add_argument('--cost-run',
+                        help='Path to a previous run folder to read the cost of each '
+                        'sensor grid for --split-mode cost.')
+    parser.add_argument('--early-stop', choices=MODES,
+                        help='Stop tracing once the number of credits is decided. '
+                        'Use low-precision to trace the rest of the sensors with '
+                        '--low-precision-parameters.')
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--low-precision-parameters', default=LOW_PRECISION_PARAMETERS)
+    parser.add_argument('--batch-size', type=int,
+                        help='Number of sensors to trace before checking if the '
+                        'number of credits is decided.')
+    parser.add_argument('--progressive', action='store_true',
+                        help='Trace all the sensors with --low-precision-parameters '
+                        'and only trace the sensors near the thresholds with '
+                        '--radiance-parameters. This is a heuristic and the '
+                        'pass/fail results can differ from a full-precision run.')
+    parser.add_argument('--progressive-band', type=float, default=0.5,
+                        help='Relative band around the thresholds for the sensors '
+                        'that are traced again in the progressive mode.')
+    parser.add_argument('--result-format', default='text', choices=binary.FORMATS,
+                        help='Format of the illuminance and pass/fail results.')
+    parser.add_argument('--sky-descriptor',
+                        help='Path to a sky descriptor from tools.skies to create '
+                        'the skies without parsing the weather file.')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Only write credit_summary.json and space_summary.csv '
+                        'without the pass/fail results and the visualization.')
+    parser.add_argument('--no-visualization', action='store_true',
+                        help='Skip creating the visualizations. Use '
+                        'tools.visualization to create them later.')
+    parser.add_argument('--ambient-cache', action='store_true',
+                        help='Share an ambient file between the ray tracing tasks '
+                        'of each sky and reuse it for runs with the same octrees.')
+    parser.add_argument('--dedupe-tolerance', type=float,
+                        help='Distance in model units to collapse the coincident '
+                        'sensors into one traced sensor.')
+    parser.add_argument('--workers', type=int,
+                        help='Number of tasks that run in parallel. By default the '
+                        'smaller of --cpu-count and the number of CPUs.')
+    return parser
+
+
+def main(args=None):
+    parser = _parser()
+    args = parser.parse_args(args)
+    if args.cost_run and args.split_mode != 'cost':
+        parser.error('--cost-run is only used with --split-mode cost.')
+    cache = ArtifactCache(
+        args.cache_folder, int(args.cache_size * 1024 ** 3), enabled=not args.no_cache
+    )
+    run = LocalRun(
+        args.model, args.wea, args.folder, north=args.north,
+        grid_filter=args.grid_filter,
+        glare_control_devices=args.glare_control_devices, cpu_count=args.cpu_count,
+        min_sensor_count=args.min_sensor_count,
+        radiance_parameters=args.radiance_parameters, cache=cache,
+        workers=args.workers, sky_descriptor=args.sky_descriptor,
+        outputs=Outputs(
+            args.result_format, args.summary_only, not args.no_visualization
+        ),
+        incremental=Incremental(args.previous_run, args.incremental_scope)
+        if args.previous_run else None,
+        cost_split=CostSplit(args.cost_run) if args.split_mode == 'cost' else None,
+        early_stop=EarlyStop(
+            args.early_stop, args.confidence, args.batch_size,
+            args.low_precision_parameters
+        ) if args.early_stop else None,
+        progressive=Progressive(args.progressive_band, args.low_precision_parameters)
+        if args.progressive else None,
+        ambient_cache=AmbientCache() if args.ambient_cache else None,
+        dedupe=Dedupe(args.dedupe_tolerance) if args.dedupe_tolerance else None
+    )
+    credit_summary = run.run()
+    print(json.dumps(credit_summary, indent=4))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Evaluate the LEED credits for a number of scenarios from the results of a run.
+
+Changing the glare-control devices or the illuminance thresholds only changes the
+evaluation of the credits. The scenarios are evaluated from the illuminance results
+of a previous run of tools.run_local or the recipe without tracing the skies again.
+Each result file is read once for all the scenarios.
+
+A scenario file is a list of scenarios. The thresholds are optional::
+
+    [
+        {"name": "glare-control", "glare_control": true},
+        {"name": "no-glare-control", "glare_control": false},
+        {"name": "strict", "glare_control": false,
+         "min_illuminance": 350, "max_illuminance": 2500}
+    ]
+
+Without a scenario file both options for the glare-control devices are evaluated.
+The outputs of each scenario are written to a sub-folder of the output folder::
+
+    scenarios/
+        glare-control/
+            results/                pass/fail results and space_summary.csv
+            credit_summary.json
+        no-glare-control/
+        comparison.csv
+        scenario_summary.json
+
+Usage::
+
+    python -m tools.scenarios ./leed_run --scenarios scenarios.json
+"""
+import argparse
+import json
+import os
+import sys
+
+from .batch import write_comparison
+from .binary import EXTENSION, read_results, result_file
+from .credits import SKIES, CreditEvaluator, grid_areas
+
+DEFAULT_SCENARIOS = (
+    {'name': 'glare-control', 'glare_control': True},
+    {'name': 'no-glare-control', 'glare_control': False}
+)
+
+
+def load_scenarios(path):
+    """Load a list of scenarios from a JSON file."""
+    with open(path) as inf:
+        scenarios = json.load(inf)
+    names = [scenario['name'] for scenario in scenarios]
+    assert len(set(names)) == len(names), 'The scenario names must be unique.'
+    return scenarios
+
+
+def evaluate_scenarios(
+    folder, scenarios=DEFAULT_SCENARIOS, output_folder=None, summary_only=False
+):
+    """Evaluate the LEED credits for a number of scenarios from the results of a run.
+
+    Args:
+        folder: Path to the folder of a previous run. It must have the illuminance
+            results in simulation/9AM/results and simulation/3PM/results.
+        scenarios: A list of dictionaries for the scenarios. See the module
+            docstring for the keys.
+        output_folder: Path to the output folder. By default the scenarios folder
+            inside the run folder.
+        summary_only: A boolean to only write space_summary.csv and
+            credit_summary.json for each scenario without the pass/fail results.
+
+    Returns:
+        A list of tuples with the name of each scenario and its credit summary.
+    """
+    simulation = os.path.join(folder, 'simulation')
+    output_folder = output_folder or os.path.join(folder, 'scenarios')
+    grids_info_file = os.path.join(simulation, SKIES[0], 'results', 'grids_info.json')
+    with open(grids_info_file) as inf:
+        grids_info = json.load(inf)
+    model_file = os.path.join(simulation, 'model.hbjson')
+    areas, units_conversion = grid_areas(model_file, grids_info) \
+        if os.path.isfile(model_file) else (None, 1)
+
+    evaluators = []
+    for scenario in scenarios:
+        evaluator = CreditEvaluator(
+            grids_info, glare_control=scenario['glare_control'],
+            min_illuminance=scenario.get('min_illuminance', 300),
+            max_illuminance=scenario.get('max_illuminance', 3000)
+        )
+        evaluator.areas, evaluator.units_conversion = areas, units_conversion
+        evaluators.append(evaluator)
+
+    binary = False
+    for sky in SKIES:
+        results = os.path.join(simulation, sky, 'results')
+        for grid in grids_info:
+            res_file = result_file(results, grid['full_id'])
+            binary = res_file.endswith('.%s' % EXTENSION)
+            values = read_results(res_file)
+            for evaluator in evaluators:
+                evaluator.add_values(sky, grid['full_id'], values)
+
+    summaries = []
+    for scenario, evaluator in zip(scenarios, evaluators):
+        scenario_folder = os.path.join(output_folder, scenario['name'])
+        if summary_only:
+            evaluator.write_space_summary(os.path.join(scenario_folder, 'results'))
+        else:
+            evaluator.write_results(
+                os.path.join(scenario_folder, 'results'), grids_info_file, binary
+            )
+        summary = evaluator.summary()
+        with open(os.path.join(scenario_folder, 'credit_summary.json'), 'w') as outf:
+            outf.write(json.dumps(summary, indent=4))
+        summaries.append((scenario['name'], summary))
+    write_comparison(summaries, output_folder, 'scenario_summary.json')
+    return summaries
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Evaluate the LEED credits for a number of scenarios from the '
+        'results of a run.'
+    )
+    parser.add_argument('folder', help='Path to the folder of a previous run.')
+    parser.add_argument('--scenarios',
+                        help='Path to a JSON file with a list of scenarios. By '
+                        'default both glare-control options are evaluated.')
+    parser.add_argument('--output-folder',
+                        help='Path to the output folder. By default the scenarios '
+                        'folder inside the run folder.')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Only write the space and credit summaries without the '
+                        'pass/fail results.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    scenarios = load_scenarios(args.scenarios) if args.scenarios \
+        else DEFAULT_SCENARIOS
+    summaries = evaluate_scenarios(
+        args.folder, scenarios, args.output_folder, args.summary_only
+    )
+    for name, summary in summaries:
+        print('%s: %d credits, %.1f%% passing' % (
+            name, summary['credits'], summary['percentage_passing']
+        ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Create the LEED skies without parsing the weather file for every run.
+
+``honeybee-radiance sky leed-illuminance`` reads the full annual weather file to find
+the clearest days around the equinoxes and only uses four irradiance values and the
+location from it. A sky descriptor stores these values so the skies can be created
+for any north angle without the weather file::
+
+    {
+        "type": "LeedSkyDescriptor",
+        "honeybee_radiance": "1.66.0",
+        "wea_hash": "...",
+        "location": {"type": "Location", "latitude": 42.37, ...},
+        "skies": {
+            "9AM": {"month": 3, "day": 21, "hour": 9,
+                    "direct_normal_irradiance": 876.5,
+                    "diffuse_horizontal_irradiance": 82.0},
+            "3PM": {"month": 3, "day": 21, "hour": 15, ...}
+        }
+    }
+
+The sky files and sky_info.json are the same as the output of the command.
+honeybee-radiance has no public function for the selection of the clearest hours, so
+it is repeated here. The descriptor records the version of honeybee-radiance that
+created it. A descriptor from a different version raises a warning when the skies are
+written, and the local runner creates it again if the weather file is available.
+
+Usage::
+
+    python -m tools.skies weather.wea --output sky_descriptor.json
+"""
+import argparse
+import json
+import os
+import sys
+import warnings
+try:
+    from importlib.metadata import version, PackageNotFoundError
+except ImportError:  # python < 3.8
+    from importlib_metadata import version, PackageNotFoundError
+
+from ladybug.dt import DateTime
+from ladybug.location import Location
+from ladybug.wea import Wea
+from honeybee_radiance.lightsource.sky import ClimateBased
+
+from .cache import file_hash
+
+SKY_HOURS = (('9AM', 9), ('3PM', 15))
+
+
+def honeybee_radiance_version():
+    """Get the version of honeybee-radiance or an empty string if it is unknown."""
+    try:
+        return version('honeybee-radiance')
+    except PackageNotFoundError:
+        return ''
+
+
+def is_current(descriptor):
+    """Check if a sky descriptor was created with the installed honeybee-radiance."""
+    return descriptor.get('honeybee_radiance') == honeybee_radiance_version()
+
+
+def _clearest_hour(dni, month, hour):
+    """Get the hour of the year with the highest direct normal irradiance.
+
+    The hours are within 15 days of the 21st of the month at the same hour of the day.
+    """
+    hoy = DateTime(month, 21, hour).hoy
+    hoys = list(range(int(hoy - (15 * 24)), int(hoy + (15 * 24)), 24))
+    return [x for _, x in sorted(zip([dni[h] for h in hoys], hoys))][-1]
+
+
+def sky_descriptor(wea):
+    """Create a sky descriptor from an annual weather file.
+
+    Args:
+        wea: Path to an annual .wea or .epw file.
+
+    Returns:
+        A dictionary for the sky descriptor.
+    """
+    with open(wea) as inf:
+        is_wea = inf.read(5) == 'place'
+    wea_obj = Wea.from_file(wea) if is_wea else Wea.from_epw_file(wea)
+    dni = wea_obj.direct_normal_irradiance
+    dhi = wea_obj.diffuse_horizontal_irradiance
+    skies = {}
+    for name, hour in SKY_HOURS:
+        mar, sep = _clearest_hour(dni, 3, hour), _clearest_hour(dni, 9, hour)
+        skies[name] = {
+            'month': 3, 'day': 21, 'hour': hour,
+            'direct_normal_irradiance': (dni[mar] + dni[sep]) / 2,
+            'diffuse_horizontal_irradiance': (dhi[mar] + dhi[sep]) / 2
+        }
+    return {
+        'type': 'LeedSkyDescriptor',
+        'honeybee_radiance': honeybee_radiance_version(),
+        'wea_hash': file_hash(wea),
+        'location': wea_obj.location.to_dict(),
+        'skies': skies
+    }
+
+
+def write_sky_info(folder):
+    """Write the sky_info.json file for the sky files in a folder."""
+    files = [
+        {
+            'id': name, 'path': '%s.sky' % name,
+            'full_path': os.path.join(os.path.abspath(folder), '%s.sky' % name)
+        }
+        for name, _ in SKY_HOURS
+    ]
+    with open(os.path.join(folder, 'sky_info.json'), 'w') as outf:
+        outf.write(json.dumps(files))
+
+
+def write_skies(descriptor, folder, north=0):
+    """Write the 9AM and 3PM sky files and sky_info.json from a sky descriptor.
+
+    Args:
+        descriptor: A dictionary for the sky descriptor.
+        folder: Path to the output folder.
+        north: A number between -360 and 360 for the rotation from north.
+    """
+    if not is_current(descriptor):
+        warnings.warn(
+            'The sky descriptor was created with honeybee-radiance %s and the '
+            'installed version is %s. Create the descriptor again if the selection '
+            'of the LEED skies has changed.' % (
+                descriptor.get('honeybee_radiance') or 'unknown',
+                honeybee_radiance_version() or 'unknown'
+            )
+        )
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    location = Location.from_dict(descriptor['location'])
+    for name, _ in SKY_HOURS:
+        sky = descriptor['skies'][name]
+        sky_obj = ClimateBased.from_location(
+            location, sky['month'], sky['day'], sky['hour'],
+            sky['direct_normal_irradiance'], sky['diffuse_horizontal_irradiance'],
+            north
+        )
+        sky_obj.to_file(folder, '%s.sky' % name, True)
+    write_sky_info(folder)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Create a LEED sky descriptor from an annual weather file.'
+    )
+    parser.add_argument('wea', help='Path to an annual .wea or .epw file.')
+    parser.add_argument('--output', default='sky_descriptor.json',
+                        help='Path to the output JSON file.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    with open(args.output, 'w') as outf:
+        json.dump(sky_descriptor(args.wea), outf, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
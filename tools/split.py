@@ -0,0 +1,244 @@
+"""Split sensor grids into chunks that have a balanced amount of predicted work.
+
+``honeybee-radiance grid split-folder`` gives every chunk the same number of sensors.
+Sensors near complex glazing or BSDFs take much longer to trace than sensors in the
+core of a building and the chunks that collect them finish last. The functions in this
+module use a cost per sensor for each grid to balance the chunks by predicted work.
+
+The output folder uses the same ``_info.json`` and ``_redist_info.json`` files as
+``honeybee-radiance grid split-folder`` so the results can be merged back with
+``honeybee-radiance grid merge-folder``.
+"""
+import json
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .recipe import recipe_templates, template_command
+
+# the task of the recipe that traces each split sensor grid
+RAYTRACE_TASK = 'illuminance_simulation/point_in_time_grid_ray_tracing'
+
+
+def _chunk_info(index, count):
+    return {
+        'name': str(index),
+        'identifier': str(index),
+        'full_id': str(index),
+        'group': '',
+        'count': count
+    }
+
+
+def redistribute_by_cost(
+    input_folder, output_folder, grid_count, costs, min_sensor_count=1, grid_info=None
+):
+    """Create a new sensor grids folder with a balanced predicted cost in each grid.
+
+    The sensors are kept in the same order and each output grid gets a contiguous
+    range of sensors. An output grid is closed once its cumulative cost reaches
+    its share of the total cost.
+
+    Args:
+        input_folder: Input sensor grids folder.
+        output_folder: A new folder to write the newly created files.
+        grid_count: Number of output sensor grids to be created.
+        costs: A dictionary of the full_id of the input grids and their cost per
+            sensor. Grids that are not in the dictionary get the average cost.
+        min_sensor_count: Minimum number of sensors in each output grid. This value
+            takes precedence over grid_count.
+        grid_info: Optional list of dictionaries with grid information. Use this
+            instead of the expected _info.json file in the input_folder.
+
+    Returns:
+        A list of dictionaries for the output grids as written to _info.json.
+    """
+    if grid_info is None:
+        with open(os.path.join(input_folder, '_info.json')) as inf:
+            grid_info = json.load(inf)
+    total_count = sum(grid['count'] for grid in grid_info)
+    if total_count / grid_count < min_sensor_count:
+        grid_count = int(round(total_count / min_sensor_count)) or 1
+
+    known = [c for c in costs.values() if c > 0]
+    default_cost = sum(known) / len(known) if known else 1
+    grid_costs = [
+        costs.get(grid['full_id'], default_cost) or default_cost for grid in grid_info
+    ]
+    total_cost = sum(c * grid['count'] for c, grid in zip(grid_costs, grid_info))
+    target = total_cost / grid_count
+
+    if not os.path.isdir(output_folder):
+        os.makedirs(output_folder)
+
+    dist_info, out_grid_info = [], []
+    index, line_count, cumulative = 0, 0, 0
+    outf = open(os.path.join(output_folder, '%d.pts' % index), 'w')
+    for grid, cost in zip(grid_info, grid_costs):
+        info = {'identifier': grid['full_id'], 'dist_info': []}
+        dist_info.append(info)
+        segment = {'identifier': index, 'st_ln': line_count}
+        with open(os.path.join(input_folder, '%s.pts' % grid['full_id'])) as inf:
+            for line in inf:
+                if not line.strip():
+                    continue
+                outf.write(line)
+                line_count += 1
+                cumulative += cost
+                is_last = index == grid_count - 1
+                if not is_last and cumulative >= target * (index + 1) \
+                        and line_count >= min_sensor_count:
+                    # close this output grid and start a new one
+                    segment['end_ln'] = line_count - 1
+                    info['dist_info'].append(segment)
+                    out_grid_info.append(_chunk_info(index, line_count))
+                    outf.close()
+                    index += 1
+                    line_count = 0
+                    outf = open(os.path.join(output_folder, '%d.pts' % index), 'w')
+                    segment = {'identifier': index, 'st_ln': 0}
+        if line_count > segment['st_ln']:
+            segment['end_ln'] = line_count - 1
+            info['dist_info'].append(segment)
+    outf.close()
+    if line_count:
+        out_grid_info.append(_chunk_info(index, line_count))
+    else:
+        os.remove(os.path.join(output_folder, '%d.pts' % index))
+
+    with open(os.path.join(output_folder, '_redist_info.json'), 'w') as outf:
+        json.dump(dist_info, outf, indent=2)
+    with open(os.path.join(output_folder, '_info.json'), 'w') as outf:
+        json.dump(out_grid_info, outf, indent=2)
+    return out_grid_info
+
+
+def grid_costs_from_timing(timing, dist_info):
+    """Estimate the cost per sensor for each grid from the ray tracing timing.
+
+    Args:
+        timing: A list of dictionaries with the name, count and duration of each
+            ray tracing task. Durations for the same output grid are added together.
+        dist_info: The content of the _redist_info.json file for the split grids.
+
+    Returns:
+        A dictionary of grid full_id and the cost per sensor in seconds.
+    """
+    chunk_time, chunk_count = {}, {}
+    for item in timing:
+        name = str(item['name'])
+        chunk_time[name] = chunk_time.get(name, 0) + item['duration']
+        chunk_count[name] = item['count']
+    chunk_cost = {
+        name: chunk_time[name] / chunk_count[name]
+        for name in chunk_time if chunk_count[name]
+    }
+    costs = {}
+    for grid in dist_info:
+        total, count = 0, 0
+        for segment in grid['dist_info']:
+            name = str(segment['identifier'])
+            if name not in chunk_cost:
+                continue
+            sensors = segment['end_ln'] - segment['st_ln'] + 1
+            total += chunk_cost[name] * sensors
+            count += sensors
+        if count:
+            costs[grid['identifier']] = total / count
+    return costs
+
+
+def chunk_costs(dist_info, costs=None):
+    """Estimate the cost of ray tracing each split sensor grid.
+
+    Args:
+        dist_info: The content of the _redist_info.json file for the split grids.
+        costs: An optional dictionary of the full_id of the input grids and their
+            cost per sensor. Grids that are not in the dictionary get the average
+            cost. Without any costs, the cost of a split grid is its number of
+            sensors.
+
+    Returns:
+        A dictionary of the names of the split grids and their predicted cost.
+    """
+    costs = costs or {}
+    known = [c for c in costs.values() if c > 0]
+    default_cost = sum(known) / len(known) if known else 1
+    chunks = {}
+    for grid in dist_info:
+        cost = costs.get(grid['identifier'], default_cost) or default_cost
+        for segment in grid['dist_info']:
+            name = str(segment['identifier'])
+            sensors = segment['end_ln'] - segment['st_ln'] + 1
+            chunks[name] = chunks.get(name, 0) + cost * sensors
+    return chunks
+
+
+def probe_grid_costs(
+    octree, grid_folder, grid_info, sample_count=50,
+    radiance_parameters='-ab 1 -aa 0.2 -ad 256 -ar 16', workers=None
+):
+    """Estimate the cost per sensor for each grid with a quick low-precision pass.
+
+    A number of sensors from each grid is traced with the ray tracing command of the
+    recipe and low-precision parameters. The start-up time of the command is measured
+    once with a single sensor and subtracted from the timing of each grid. The grids
+    are probed in parallel.
+
+    Args:
+        octree: Path to the octree of the scene.
+        grid_folder: Folder with the sensor grids.
+        grid_info: List of dictionaries with the grid information.
+        sample_count: Number of sensors to trace for each grid.
+        radiance_parameters: Radiance parameters for the probe.
+        workers: Number of probes that run in parallel. By default the number of
+            CPUs.
+
+    Returns:
+        A dictionary of grid full_id and the relative cost per sensor.
+    """
+    template = recipe_templates()[RAYTRACE_TASK]
+
+    def _trace(lines, folder):
+        os.mkdir(folder)
+        pts = os.path.join(folder, 'probe.pts')
+        with open(pts, 'w') as outf:
+            outf.writelines(lines)
+        command = template_command(
+            template,
+            {'radiance_parameters': radiance_parameters, 'metric': 'illuminance'},
+            {'scene.oct': octree, 'grid.pts': pts,
+             'grid.res': os.path.join(folder, 'probe.res')}
+        )
+        start = time.time()
+        subprocess.run(
+            command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return time.time() - start
+
+    samples = {}
+    for grid in grid_info:
+        with open(os.path.join(grid_folder, '%s.pts' % grid['full_id'])) as inf:
+            lines = [line for line in inf if line.strip()]
+        step = max(1, len(lines) // sample_count)
+        sample = lines[::step][:sample_count]
+        if sample:
+            samples[grid['full_id']] = sample
+    if not samples:
+        return {}
+
+    with tempfile.TemporaryDirectory() as folder:
+        overhead = _trace(
+            next(iter(samples.values()))[:1], os.path.join(folder, 'overhead')
+        )
+        with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+            durations = pool.map(
+                _trace, samples.values(),
+                [os.path.join(folder, str(i)) for i in range(len(samples))]
+            )
+            return {
+                full_id: max(duration - overhead, 1e-6) / len(sample)
+                for (full_id, sample), duration in zip(samples.items(), durations)
+            }
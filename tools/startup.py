@@ -0,0 +1,92 @@
+"""Benchmark the time to import the recipe and get the compiled queenbee recipe.
+
+Each case runs in a new Python process so the imports are not shared between the
+cases. The compiled recipe is built first so the cached cases load it from the cache.
+
+* import: Import the recipe package.
+* build: Import the DSL and build the recipe from the DAGs.
+* cached_dict: Load the cached recipe as a dictionary.
+* cached_recipe: Load the cached recipe as a queenbee Recipe.
+
+Usage::
+
+    python -m tools.startup --repeat 5 --output startup.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+CASES = {
+    'import': 'import pollination.leed_daylight_option_two',
+    'build': 'from pollination_dsl.package import load; '
+             'load("pollination.leed_daylight_option_two")',
+    'cached_dict': 'from pollination.leed_daylight_option_two import recipe_dict; '
+                   'recipe_dict(%(folder)r)',
+    'cached_recipe': 'from pollination.leed_daylight_option_two import load_recipe; '
+                     'load_recipe(%(folder)r)'
+}
+_TIMER = 'import time, warnings, io, contextlib\n' \
+    'warnings.simplefilter("ignore")\n' \
+    'start = time.perf_counter()\n' \
+    'with contextlib.redirect_stdout(io.StringIO()):\n' \
+    '    %s\n' \
+    'print(time.perf_counter() - start)\n'
+
+
+def time_case(code, folder):
+    """Get the time in seconds to run a case in a new Python process."""
+    output = subprocess.check_output(
+        [sys.executable, '-c', _TIMER % (code % {'folder': folder})],
+        universal_newlines=True
+    )
+    return float(output.strip().splitlines()[-1])
+
+
+def startup_benchmark(repeat=3, folder=None):
+    """Benchmark the startup of the recipe.
+
+    Args:
+        repeat: Number of times to run each case.
+        folder: Optional path to the folder for the compiled recipes. By default a
+            temporary folder is used.
+
+    Returns:
+        A dictionary with the minimum and mean time in seconds for each case.
+    """
+    with tempfile.TemporaryDirectory() as temp_folder:
+        folder = folder or temp_folder
+        time_case(CASES['cached_dict'], folder)
+        report = {}
+        for name, code in CASES.items():
+            times = [time_case(code, folder) for _ in range(repeat)]
+            report[name] = {'min': min(times), 'mean': sum(times) / len(times)}
+    return report
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the time to import and compile the recipe.'
+    )
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of times to run each case.')
+    parser.add_argument('--folder',
+                        help='Path to the folder for the compiled recipes.')
+    parser.add_argument('--output', help='Optional path to a JSON file for the report.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    report = startup_benchmark(args.repeat, args.folder)
+    for name, times in report.items():
+        print('%-14s %8.3f s' % (name, times['min']))
+    if args.output:
+        with open(args.output, 'w') as outf:
+            json.dump(report, outf, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Submit a number of jobs of the recipe to Pollination.
+
+Each submission file has the same format as ``samples/sample_runs.json`` and is
+submitted as a job with a run for each item. The paths of the artifacts are relative
+to the submission file. The jobs are submitted with pollination-io, the same client
+that ``samples/run_jobs.py`` uses.
+
+* The artifacts are uploaded to a content-addressed path in the project,
+  ``artifacts/<sha256>/<file name>``, and the files with the same content are only
+  uploaded once. Files that the project already has from a previous submission are
+  not uploaded again.
+* The artifacts are uploaded in parallel with a bounded pool of threads, and each job
+  is created as soon as its own artifacts are uploaded.
+* The status of all the jobs is checked in one loop. The interval between the checks
+  is reset when the status of a job changes and grows up to a maximum while nothing
+  changes. Server errors and dropped connections are retried with the same backoff.
+
+Usage::
+
+    QB_POLLINATION_TOKEN=... python -m tools.submit samples/sample_runs.json \\
+        --owner ladybug-tools --project leed-daylight-option-two --tag 0.1.0
+"""
+import argparse
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from queenbee.job.job import JobStatusEnum
+
+from .cache import file_hash
+
+try:
+    from pollination_io.api.client import ApiClient
+    from pollination_io.interactors import Job, NewJob, Recipe
+except ImportError:  # only needed to submit jobs
+    ApiClient = Job = NewJob = Recipe = None
+
+DEFAULT_HOST = 'https://api.pollination.cloud'
+FINISHED = (JobStatusEnum.completed, JobStatusEnum.failed, JobStatusEnum.cancelled)
+
+
+def _check_pollination_io():
+    if ApiClient is None:
+        raise ImportError(
+            'pollination-io is required to submit jobs. Install it with '
+            '"pip install -r samples/requirements.txt".'
+        )
+
+
+def _finished(status):
+    return status is not None and status.status in FINISHED
+
+
+class Submitter(object):
+    """Upload artifacts and create jobs in a Pollination project.
+
+    Args:
+        client: A pollination-io ApiClient.
+        owner: Owner of the project.
+        project: Name of the project.
+        recipe: A pollination-io Recipe.
+        workers: Number of uploads and requests that run in parallel.
+        artifact_folder: Folder in the project for the uploaded artifacts.
+    """
+
+    def __init__(
+        self, client, owner, project, recipe, workers=8, artifact_folder='artifacts'
+    ):
+        _check_pollination_io()
+        self.client = client
+        self.owner = owner
+        self.project = project
+        self.recipe = recipe
+        self.workers = workers
+        self.artifact_folder = artifact_folder
+        self.uploaded = set()
+        self.skipped = set()
+        self._uploads = {}
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._upload_pool = ThreadPoolExecutor(workers)
+        self._pool = ThreadPoolExecutor(workers)
+
+    def close(self):
+        """Shut down the thread pools."""
+        self._upload_pool.shutdown()
+        self._pool.shutdown()
+
+    def _new_job(self, arguments=None, name=None):
+        return NewJob(
+            self.owner, self.project, self.recipe, arguments or [], name=name,
+            client=self.client
+        )
+
+    def artifact_key(self, path, sha=None):
+        """Get the content-addressed path in the project for a file."""
+        return '%s/%s/%s' % (
+            self.artifact_folder, sha or file_hash(path), os.path.basename(path)
+        )
+
+    def artifact_exists(self, key):
+        """Check if the project already has an artifact."""
+        try:
+            files = self.client.get(
+                '/projects/%s/%s/artifacts' % (self.owner, self.project),
+                params={'path': os.path.dirname(key)}
+            )
+        except requests.HTTPError as error:
+            if error.response is not None and error.response.status_code == 404:
+                return False
+            raise
+        return any(f.get('key') == key for f in files.get('resources', []))
+
+    def _upload(self, path):
+        sha = file_hash(path)
+        with self._lock:
+            if sha not in self._hashes:
+                self._hashes[sha] = (threading.Lock(), self.artifact_key(path, sha))
+            key_lock, key = self._hashes[sha]
+        # the files with the same content use the path of the first file
+        with key_lock:
+            if key in self.uploaded or key in self.skipped:
+                return key
+            if self.artifact_exists(key):
+                self.skipped.add(key)
+                return key
+            self._new_job().upload_artifact(
+                pathlib.Path(path), target_folder=os.path.dirname(key)
+            )
+            self.uploaded.add(key)
+        return key
+
+    def upload(self, path):
+        """Start uploading a file.
+
+        Returns:
+            A future for the path of the artifact in the project.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if path not in self._uploads:
+                self._uploads[path] = self._upload_pool.submit(self._upload, path)
+            return self._uploads[path]
+
+    def add_recipe(self):
+        """Add the recipe to the recipes of the project."""
+        self.recipe.add_to_project('%s/%s' % (self.owner, self.project))
+
+    def _create_job(self, name, runs, uploads):
+        arguments = []
+        for run, run_uploads in zip(runs, uploads):
+            args = dict(run['inputs'])
+            for k, future in run_uploads.items():
+                args[k] = future.result()
+            arguments.append(args)
+        return self._new_job(arguments, name).create().id
+
+    def create_jobs(self, jobs):
+        """Upload the artifacts and create a number of jobs.
+
+        Args:
+            jobs: A list of tuples with the name of each job, a list of runs in the
+                format of sample_runs.json and the folder that the paths of the
+                artifacts are relative to.
+
+        Returns:
+            A list of job ids.
+        """
+        # get the inputs of the recipe once for all the jobs
+        self.recipe.api_object
+        # start all the uploads before waiting for any of them
+        futures = []
+        for name, runs, folder in jobs:
+            uploads = [
+                {k: self.upload(os.path.join(folder, v))
+                 for k, v in run['artifacts'].items()}
+                for run in runs
+            ]
+            futures.append(self._pool.submit(self._create_job, name, runs, uploads))
+        return [future.result() for future in futures]
+
+    def job_status(self, job_id):
+        """Get the status of a job as a queenbee JobStatus."""
+        return Job(self.owner, self.project, job_id, self.client).status
+
+    def _poll(self, job_id):
+        try:
+            return self.job_status(job_id)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            return error
+        except requests.HTTPError as error:
+            if error.response is not None and error.response.status_code >= 500:
+                return error
+            raise
+
+    def wait(
+        self, job_ids, min_interval=5, max_interval=120, factor=2, max_errors=3,
+        callback=None, sleep=time.sleep
+    ):
+        """Wait for a number of jobs to finish.
+
+        Args:
+            job_ids: A list of job ids.
+            min_interval: Seconds between the checks after the status of a job
+                changes.
+            max_interval: Maximum number of seconds between the checks.
+            factor: Factor for the interval after each check without any changes.
+            max_errors: Number of failed checks in a row for a job before the error
+                is raised.
+            callback: An optional function that is called with the job id and the
+                status of a job each time that the status changes.
+            sleep: Function to wait between the checks.
+
+        Returns:
+            A dictionary of job ids and the final status of each job.
+        """
+        statuses = {job_id: None for job_id in job_ids}
+        errors = {job_id: 0 for job_id in job_ids}
+        interval = min_interval
+        while True:
+            pending = [
+                job_id for job_id, status in statuses.items() if not _finished(status)
+            ]
+            if not pending:
+                return statuses
+            changed = False
+            for job_id, status in zip(pending, self._pool.map(self._poll, pending)):
+                if isinstance(status, Exception):
+                    errors[job_id] += 1
+                    if errors[job_id] > max_errors:
+                        raise status
+                    continue
+                errors[job_id] = 0
+                if status != statuses[job_id]:
+                    changed = True
+                    statuses[job_id] = status
+                    if callback is not None:
+                        callback(job_id, status)
+            if all(_finished(statuses[job_id]) for job_id in pending):
+                continue
+            interval = min_interval if changed else min(interval * factor, max_interval)
+            sleep(interval)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Submit a number of jobs of the recipe to Pollination.'
+    )
+    parser.add_argument('submissions', nargs='+',
+                        help='Paths to JSON files in the format of sample_runs.json. '
+                        'Each file is submitted as a job.')
+    parser.add_argument('--owner', required=True, help='Owner of the project.')
+    parser.add_argument('--project', required=True, help='Name of the project.')
+    parser.add_argument('--recipe', default='pollination/leed-daylight-option-two',
+                        help='Owner and name of the recipe.')
+    parser.add_argument('--tag', default='latest', help='Tag of the recipe.')
+    parser.add_argument('--host', default=os.environ.get('HOST', DEFAULT_HOST),
+                        help='URL of the Pollination API.')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of uploads and requests that run in parallel.')
+    parser.add_argument('--no-wait', action='store_true',
+                        help='Exit after the jobs are created.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    _check_pollination_io()
+    client = ApiClient(args.host, os.environ.get('QB_POLLINATION_TOKEN'))
+    recipe_owner, recipe_name = args.recipe.split('/')
+    recipe = Recipe(recipe_owner, recipe_name, args.tag, client=client)
+    submitter = Submitter(client, args.owner, args.project, recipe, args.workers)
+    try:
+        submitter.add_recipe()
+        jobs = []
+        for submission in args.submissions:
+            with open(submission, encoding='utf-8') as inf:
+                runs = json.load(inf)
+            name = os.path.splitext(os.path.basename(submission))[0]
+            jobs.append((name, runs, os.path.dirname(os.path.abspath(submission))))
+        job_ids = submitter.create_jobs(jobs)
+        print('Uploaded %d artifacts and skipped %d that the project already has.' % (
+            len(submitter.uploaded), len(submitter.skipped)
+        ))
+        for (name, _, _), job_id in zip(jobs, job_ids):
+            print('%s: %s' % (name, job_id))
+        if args.no_wait:
+            return 0
+
+        def _print_status(job_id, status):
+            print('%s: %s (%s pending, %s running, %s failed, %s completed)' % (
+                job_id, status.status.value, status.runs_pending,
+                status.runs_running, status.runs_failed, status.runs_completed
+            ))
+
+        statuses = submitter.wait(job_ids, callback=_print_status)
+    finally:
+        submitter.close()
+    failed = [
+        job_id for job_id, status in statuses.items()
+        if status.status != JobStatusEnum.completed or status.runs_failed
+    ]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
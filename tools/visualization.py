@@ -0,0 +1,395 @@
+"""Create the VisualizationSet directly from the result folders of a run.
+
+``honeybee-display model-to-vis`` reads the grid data from the sub-folders of a single
+folder, which is why the recipe copies all the results into the visualization folder
+first. It also only reads text files. The functions in this module read the results
+in place, in either the text or the binary format, and create the same
+VisualizationSet.
+
+A run writes a ``visualization/manifest.json`` file that maps each data set to its
+result folder and metadata file. All the paths in the manifest are relative to the
+folder of the manifest::
+
+    {
+        "model": "../simulation/model.hbjson",
+        "grids_info": "../resources/grids_info.json",
+        "active_grid_data": "pass-fail-combined",
+        "grid_data": [
+            {
+                "name": "illuminance-9am",
+                "results": "../simulation/9AM/results",
+                "metadata": "illuminance-9am/vis_metadata.json"
+            }
+        ]
+    }
+
+The VisualizationSet of a run can also be created later from the run folder, for
+instance for runs with the visualization turned off::
+
+    python -m tools.visualization ./leed_run
+
+For very large models, use the room level of detail to create a VisualizationSet with
+one value for each sensor grid, drawn on the floors of its room, instead of one value
+for each sensor. The illuminance of a room is the area-weighted average of its
+sensors and the pass/fail value of a room is the fraction of its area that passes.
+The full detail can be created on demand from the same run folder::
+
+    python -m tools.visualization ./leed_run --level-of-detail room \
+        --output visualization_rooms.vsf
+"""
+import argparse
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+from honeybee.model import Model
+from honeybee_display.model import model_to_vis_set_wireframe
+from ladybug.datatype.generic import GenericType
+from ladybug_display.visualization import AnalysisGeometry, VisualizationData, \
+    VisualizationMetaData
+from ladybug_geometry.geometry3d import Point3D, Vector3D
+
+from .binary import read_results, result_file
+from .recipe import recipe_templates, template_command
+
+# grid data sets of a run and their result folders relative to the run folder
+RUN_GRID_DATA = (
+    ('illuminance-9am', 'simulation/9AM/results'),
+    ('illuminance-3pm', 'simulation/3PM/results'),
+    ('pass-fail-9am', 'results/9AM'),
+    ('pass-fail-3pm', 'results/3PM'),
+    ('pass-fail-combined', 'results/combined')
+)
+# paths of the VisualizationSets relative to the run folder as in the recipe
+RUN_VIS_SET = ('visualization.vsf',)
+RUN_COMPACT_VIS = ('compact', 'visualization.pkl')
+COMPACT_GRID_DATA = 'pass-fail-combined'
+LEVELS_OF_DETAIL = ('sensor', 'room')
+
+
+def _grid_values(folder, grids_info):
+    """Get the values of all the sensor grids in a result folder as a single list."""
+    values = []
+    for grid in grids_info:
+        values.extend(read_results(result_file(folder, grid['full_id'])))
+    return values
+
+
+def room_level_of_detail(model, grids):
+    """Get the geometry of the sensor grids for the room level of detail.
+
+    Each sensor grid is drawn with the floor faces of its room, moved to the average
+    height of its sensors. A sensor grid without a room is drawn as a point at the
+    center of its sensors.
+
+    Args:
+        model: A Honeybee Model.
+        grids: A list of SensorGrid objects.
+
+    Returns:
+        A tuple with the geometry and a list of groups. Each group has the number of
+        geometry objects of a sensor grid and the weight of each of its sensors.
+    """
+    rooms = {room.identifier: room for room in model.rooms}
+    geometry, groups = [], []
+    for grid in grids:
+        positions = list(grid.positions)
+        weights = grid.mesh.face_areas if grid.mesh is not None else [1] * len(positions)
+        center = [sum(pos[i] for pos in positions) / len(positions) for i in range(3)]
+        room = rooms.get(grid.room_identifier)
+        floors = [f.geometry for f in room.faces if str(f.type) == 'Floor'] \
+            if room is not None else []
+        if floors:
+            geometry.extend(
+                f.move(Vector3D(0, 0, center[2] - f.center.z)) for f in floors
+            )
+        else:
+            geometry.append(Point3D(*center))
+        groups.append((len(floors) or 1, weights))
+    return geometry, groups
+
+
+def grid_data_set(folder, grids_info, metadata_file=None, groups=None):
+    """Create a VisualizationData from a result folder.
+
+    Args:
+        folder: Path to a folder with a result file for each sensor grid.
+        grids_info: List of dictionaries for the sensor grids.
+        metadata_file: Optional path to a vis_metadata.json file.
+        groups: Optional list of groups from room_level_of_detail. The data set will
+            have the weighted average of the values of each sensor grid for each of
+            its geometry objects.
+    """
+    values = _grid_values(folder, grids_info)
+    if groups is not None:
+        grid_values, start = [], 0
+        for count, weights in groups:
+            end = start + len(weights)
+            average = sum(v * w for v, w in zip(values[start:end], weights)) / \
+                sum(weights)
+            grid_values.extend([average] * count)
+            start = end
+        values = grid_values
+    if metadata_file and os.path.isfile(metadata_file):
+        with io.open(metadata_file, 'r', encoding='utf-8') as mf:
+            metadata = VisualizationMetaData.from_dict(json.load(mf))
+        return VisualizationData(
+            values, metadata.legend_parameters, metadata.data_type, metadata.unit
+        )
+    return VisualizationData(values, data_type=GenericType(os.path.basename(folder), ''))
+
+
+def write_vis_set(vis_set, output_file):
+    """Write a VisualizationSet in the format of the extension of the output file.
+
+    The formats are the same as ``honeybee-display model-to-vis``: vsf, json, pkl,
+    vtkjs and html.
+    """
+    folder, name = os.path.split(os.path.abspath(output_file))
+    name, extension = os.path.splitext(name)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    if extension in ('.vsf', '.json'):
+        with open(output_file, 'w') as outf:
+            outf.write(json.dumps(vis_set.to_dict()))
+    elif extension == '.pkl':
+        with open(output_file, 'wb') as outf:
+            pickle.dump(vis_set.to_dict(), outf)
+    elif extension == '.vtkjs':
+        vis_set.to_vtkjs(output_folder=folder, file_name=name)
+    elif extension == '.html':
+        vis_set.to_html(output_folder=folder, file_name=name)
+    else:
+        raise ValueError('Unsupported visualization format: %s' % output_file)
+
+
+def model_to_vis_set(
+    model_file, grids_info, grid_data, active_grid_data=None, output_file=None,
+    compact=False, level_of_detail='sensor'
+):
+    """Create a VisualizationSet for a model with the results of a run.
+
+    The output is the same as ``honeybee-display model-to-vis`` with the default
+    options and a grid data folder.
+
+    Args:
+        model_file: Path to a HBJSON model.
+        grids_info: List of dictionaries for the sensor grids.
+        grid_data: A list of tuples with the name of each data set, the path to the
+            result folder and an optional path to a vis_metadata.json file.
+        active_grid_data: Name of the data set that is active.
+        output_file: Optional path to write the VisualizationSet. See write_vis_set
+            for the formats.
+        compact: A boolean to only include the grid data without the geometry of the
+            model and its wireframe, as in the compact visualization of the recipe.
+        level_of_detail: Either sensor or room. Room draws one value for each sensor
+            grid. See room_level_of_detail for more information.
+
+    Returns:
+        A VisualizationSet.
+    """
+    assert level_of_detail in LEVELS_OF_DETAIL, 'Invalid level of detail: %s. ' \
+        'Choose from %s' % (level_of_detail, LEVELS_OF_DETAIL)
+    model = Model.from_file(model_file)
+    vis_set = model.to_vis_set(
+        color_by=None if compact else 'type', include_wireframe=False,
+        grid_display_mode='None'
+    )
+
+    model.properties.radiance.merge_duplicate_identifier_grids()
+    grids = {g.full_identifier: g for g in model.properties.radiance.sensor_grids}
+    grid_objs = [grids[g['full_id']] for g in grids_info]
+    geometry, groups = None, None
+    if level_of_detail == 'room':
+        geometry, groups = room_level_of_detail(model, grid_objs)
+    data_sets, active = [], 0
+    for i, (name, folder, metadata_file) in enumerate(grid_data):
+        data_sets.append(grid_data_set(folder, grids_info, metadata_file, groups))
+        if name == active_grid_data:
+            active = i
+    grid_meshes = [g.mesh for g in grid_objs]
+    if geometry is not None:
+        a_geo = AnalysisGeometry('Grid_Data', geometry, data_sets)
+    elif all(m is not None for m in grid_meshes):
+        a_geo = AnalysisGeometry('Grid_Data', grid_meshes, data_sets)
+    else:
+        points = [Point3D(*pos) for gr in grid_objs for pos in gr.positions]
+        a_geo = AnalysisGeometry('Grid_Data', points, data_sets)
+    a_geo.display_name = 'Grid Data'
+    a_geo.display_mode = 'Surface'
+    a_geo.active_data = active
+    vis_set.add_geometry(a_geo)
+
+    wireframe = model_to_vis_set_wireframe(model) if not compact else None
+    if wireframe is not None:
+        vis_set.add_geometry(wireframe[0])
+
+    if output_file:
+        write_vis_set(vis_set, output_file)
+    return vis_set
+
+
+def write_manifest(
+    manifest_file, model_file, grids_info_file, grid_data, active_grid_data=None
+):
+    """Write a manifest for creating the VisualizationSet of a run.
+
+    Args:
+        manifest_file: Path to the output manifest file.
+        model_file: Path to the HBJSON model.
+        grids_info_file: Path to the grids_info.json file for the sensor grids.
+        grid_data: A list of tuples with the name of each data set, the path to the
+            result folder and an optional path to a vis_metadata.json file.
+        active_grid_data: Name of the data set that is active.
+    """
+    folder = os.path.dirname(os.path.abspath(manifest_file))
+
+    def _relative(path):
+        return os.path.relpath(path, folder).replace('\\', '/') if path else None
+
+    manifest = {
+        'model': _relative(model_file),
+        'grids_info': _relative(grids_info_file),
+        'active_grid_data': active_grid_data,
+        'grid_data': [
+            {'name': name, 'results': _relative(results), 'metadata': _relative(meta)}
+            for name, results, meta in grid_data
+        ]
+    }
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(manifest_file, 'w') as outf:
+        json.dump(manifest, outf, indent=2)
+
+
+def manifest_to_vis_set(
+    manifest_file, output_file=None, compact=False, level_of_detail='sensor'
+):
+    """Create the VisualizationSet of a run from its manifest.
+
+    Args:
+        manifest_file: Path to a manifest file. See the module docstring for the
+            format.
+        output_file: Optional path to write the VisualizationSet. See write_vis_set
+            for the formats.
+        compact: A boolean to only include the active data set without the geometry
+            of the model and its wireframe.
+        level_of_detail: Either sensor or room. See model_to_vis_set.
+
+    Returns:
+        A VisualizationSet.
+    """
+    folder = os.path.dirname(os.path.abspath(manifest_file))
+    with open(manifest_file) as inf:
+        manifest = json.load(inf)
+
+    def _absolute(path):
+        return os.path.normpath(os.path.join(folder, path)) if path else None
+
+    with open(_absolute(manifest['grids_info'])) as inf:
+        grids_info = json.load(inf)
+    grid_data = [
+        (data['name'], _absolute(data['results']), _absolute(data.get('metadata')))
+        for data in manifest['grid_data']
+    ]
+    active_grid_data = manifest.get('active_grid_data')
+    if compact:
+        grid_data = [data for data in grid_data if data[0] == active_grid_data]
+    return model_to_vis_set(
+        _absolute(manifest['model']), grids_info, grid_data, active_grid_data,
+        output_file, compact, level_of_detail
+    )
+
+
+def write_run_manifest(folder, run_command=None):
+    """Write the vis metadata and the manifest for the results of a run folder.
+
+    Args:
+        folder: Path to a run folder of tools.run_local.
+        run_command: Optional function to run the command for the vis metadata. By
+            default the command runs with subprocess.
+
+    Returns:
+        Path to the manifest file.
+    """
+    vis_folder = os.path.join(folder, 'visualization')
+    args = template_command(
+        recipe_templates()['create_visualization/create_vis_metadata'],
+        {'output_folder': vis_folder}
+    )
+    if run_command:
+        run_command(args)
+    else:
+        subprocess.check_call(args, cwd=folder)
+    # the results are read in place instead of being copied to vis_folder
+    manifest = os.path.join(vis_folder, 'manifest.json')
+    write_manifest(
+        manifest, os.path.join(folder, 'simulation', 'model.hbjson'),
+        os.path.join(folder, 'resources', 'grids_info.json'), [
+            (name, os.path.join(folder, source),
+             os.path.join(vis_folder, name, 'vis_metadata.json'))
+            for name, source in RUN_GRID_DATA
+        ], COMPACT_GRID_DATA
+    )
+    return manifest
+
+
+def run_folder_to_vis_set(
+    folder, output_file=None, compact=False, level_of_detail='sensor'
+):
+    """Create the VisualizationSet for a run folder.
+
+    The manifest of the run is used if it exists. Otherwise it is written first.
+
+    Args:
+        folder: Path to a run folder of tools.run_local. The pass/fail results must
+            be in the folder, which is not the case for summary-only runs.
+        output_file: Optional path to the output file. By default it is written to
+            visualization.vsf in the run folder, or compact/visualization.pkl for
+            the compact visualization.
+        compact: A boolean to create the compact visualization of the recipe with
+            only the combined pass/fail results.
+        level_of_detail: Either sensor or room. See model_to_vis_set.
+
+    Returns:
+        A VisualizationSet.
+    """
+    folder = os.path.abspath(folder)
+    manifest = os.path.join(folder, 'visualization', 'manifest.json')
+    if not os.path.isfile(manifest):
+        manifest = write_run_manifest(folder)
+    if output_file is None:
+        output_file = os.path.join(folder, *(RUN_COMPACT_VIS if compact else RUN_VIS_SET))
+    return manifest_to_vis_set(manifest, output_file, compact, level_of_detail)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description='Create the VisualizationSet for a run folder.'
+    )
+    parser.add_argument('folder', help='Path to the run folder.')
+    parser.add_argument('--output',
+                        help='Path to the output file. The extension sets the '
+                        'format: vsf, json, pkl, vtkjs or html. By default '
+                        'visualization.vsf in the run folder.')
+    parser.add_argument('--compact', action='store_true',
+                        help='Only include the combined pass/fail results without '
+                        'the geometry of the model.')
+    parser.add_argument('--level-of-detail', default='sensor',
+                        choices=LEVELS_OF_DETAIL,
+                        help='Draw one value for each sensor or one value for each '
+                        'room.')
+    return parser
+
+
+def main(args=None):
+    args = _parser().parse_args(args)
+    run_folder_to_vis_set(args.folder, args.output, args.compact, args.level_of_detail)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())